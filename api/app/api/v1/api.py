@@ -2,9 +2,12 @@
 
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import jdmatch
+from app.api.v1.endpoints import jdmatch, metrics
 
 api_router = APIRouter()
 
 # JD Match Router
 api_router.include_router(jdmatch.router, tags=["JD Match"], prefix="/jdmatch")
+
+# Metrics Router
+api_router.include_router(metrics.router, tags=["Metrics"], prefix="/metrics")
@@ -23,5 +23,5 @@ class ResponseEnvelope(UIDtoModel, Generic[T]):
     request_id: str = Field(default_factory=lambda: uuid4().hex)
 
     @classmethod
-    def ok(cls, data: T):
+    def ok(cls, data: T) -> "ResponseEnvelope[T]":
         return cls(success=True, data=data, error=None)
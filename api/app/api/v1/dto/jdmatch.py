@@ -18,6 +18,7 @@ class SSEEventType(str, Enum):
     CONTENT_BLOCK_STOP = "content_block_stop"
     ANALYSIS_DELTA = "analysis_delta"
     ANALYSIS_STOP = "analysis_stop"
+    BATCH_SUMMARY = "batch_summary"
     ERROR = "error"
 
 
@@ -58,13 +59,31 @@ class ResultDelta(UIDtoModel):
     missing_skills: list[str]
 
 
+class ScoreDelta(UIDtoModel):
+    """The score, ahead of the rest of a streamed result. Only sent when
+    ``ANALYSIS_MODE`` is ``single_call``; two-call analyses score in one
+    non-streamed call and send just the ``ResultDelta``."""
+
+    type: Literal["score_delta"] = "score_delta"
+    score: int
+
+
+class SkillDelta(UIDtoModel):
+    """One skill of a streamed result, as soon as the model has written it.
+    Like ``ScoreDelta``, only sent in ``single_call`` mode."""
+
+    type: Literal["skill_delta"] = "skill_delta"
+    field: str  # "matching_skills" or "missing_skills"
+    skill: str
+
+
 class TextDelta(UIDtoModel):
     type: Literal["text_delta"] = "text_delta"
     text: str
 
 
 Delta = Annotated[
-    ResultDelta | TextDelta,
+    ResultDelta | ScoreDelta | SkillDelta | TextDelta,
     Field(discriminator="type"),
 ]
 
@@ -80,12 +99,16 @@ class AnalysisStartEvent(UIDtoModel):
 class StatusUpdateEvent(UIDtoModel):
     type: Literal[SSEEventType.STATUS_UPDATE] = SSEEventType.STATUS_UPDATE
     status: JdMatchStatus
+    # Set on batch streams: which JD the status belongs to
+    jd_index: int | None = None
 
 
 class ContentBlockStartEvent(UIDtoModel):
     type: Literal[SSEEventType.CONTENT_BLOCK_START] = SSEEventType.CONTENT_BLOCK_START
     index: int
     content_block: ContentBlock
+    # Set on batch streams: which JD the block (and its deltas) belong to
+    jd_index: int | None = None
 
 
 class ContentBlockDeltaEvent(UIDtoModel):
@@ -108,9 +131,27 @@ class AnalysisStopEvent(UIDtoModel):
     type: Literal[SSEEventType.ANALYSIS_STOP] = SSEEventType.ANALYSIS_STOP
 
 
+class BatchJdResult(UIDtoModel):
+    jd_index: int
+    jd_match_id: uuid.UUID
+    status: JdMatchStatus
+    score: int | None = None
+    error: str | None = None
+
+
+class BatchSummaryEvent(UIDtoModel):
+    type: Literal[SSEEventType.BATCH_SUMMARY] = SSEEventType.BATCH_SUMMARY
+    # Best match first; failed JDs last
+    results: list[BatchJdResult]
+
+
 class ErrorEvent(UIDtoModel):
     type: Literal[SSEEventType.ERROR] = SSEEventType.ERROR
     message: str
+    # Set on batch streams when a single JD failed; the batch carries on
+    jd_index: int | None = None
+    # False when running the analysis again cannot succeed (e.g. not a JD)
+    retryable: bool = True
 
 
 SSEEvent = (
@@ -121,6 +162,7 @@ SSEEvent = (
     | ContentBlockStopEvent
     | AnalysisDeltaEvent
     | AnalysisStopEvent
+    | BatchSummaryEvent
     | ErrorEvent
 )
 
@@ -142,6 +184,12 @@ class JdMatchStatusResponse(UIDtoModel):
     status: JdMatchStatus
 
 
+class JdMatchJobResponse(UIDtoModel):
+    jd_match_id: uuid.UUID
+    job_key: str
+    enqueued: bool
+
+
 class JdMatchAnalysisResponse(UIDtoModel):
     jd_match_id: uuid.UUID
     status: str
@@ -149,3 +197,34 @@ class JdMatchAnalysisResponse(UIDtoModel):
     matching_skills: list[str] | None = None
     missing_skills: list[str] | None = None
     explanation: str | None = None
+    score_model: str | None = None
+
+
+class RankingJobResponse(UIDtoModel):
+    ranking_job_id: uuid.UUID
+    job_key: str
+    enqueued: bool
+    total: int
+
+
+class RankedResume(UIDtoModel):
+    jd_match_id: uuid.UUID
+    file_name: str | None = None
+    status: str
+    score: int | None = None
+    matching_skills: list[str] | None = None
+    missing_skills: list[str] | None = None
+    score_model: str | None = None
+
+
+class RankingResultsResponse(UIDtoModel):
+    ranking_job_id: uuid.UUID
+    status: str
+    total: int
+    completed: int
+    failed: int
+    error: str | None = None
+    page: int
+    page_size: int
+    # Highest score first; unscored resumes last
+    results: list[RankedResume]
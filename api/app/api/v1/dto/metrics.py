@@ -0,0 +1,16 @@
+from app.api.v1.dto import UIDtoModel
+from app.core.circuit_breaker import CircuitState
+
+
+class CircuitBreakerMetrics(UIDtoModel):
+    name: str
+    state: CircuitState
+    consecutive_failures: int
+    calls: int
+    failures: int
+    timeouts: int
+    rejected: int
+    # Seconds, over the breaker's recent successful calls
+    latency_p50: float | None
+    latency_p95: float | None
+    latency_p99: float | None
@@ -1,37 +1,78 @@
+import uuid
+from collections.abc import AsyncGenerator
 from typing import Annotated
 
 from browser_use_sdk import AsyncBrowserUse
-from fastapi import APIRouter, Depends, Form, Path, UploadFile, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Form,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    UploadFile,
+    status,
+)
 from fastapi.responses import StreamingResponse
 from google import genai
-from sqlmodel import Session
+from qstash.errors import SignatureError
+from qstash.receiver import Receiver
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.v1.dto import ResponseEnvelope
 from app.api.v1.dto.jdmatch import (
     JdMatchAnalysisResponse,
+    JdMatchJobResponse,
     JdMatchStatusResponse,
+    RankingJobResponse,
+    RankingResultsResponse,
     ResumeUploadResponse,
     SSEEvent,
     SSEEventType,
 )
+from app.core.config import settings
 from app.core.logging.logger import get_logger
 from app.integrations.browser_use.agent import get_browser_use_client
-from app.integrations.db.database import get_session
+from app.integrations.db.database import get_async_session
 from app.integrations.llm.gemini import get_gemini_client
+from app.integrations.queue.base import Job
+from app.integrations.upstash.qstash import get_qstash_consumer
+from app.modules.jdmatch.jobs import (
+    enqueue_jd_match_analysis,
+    enqueue_ranking_job,
+    process_jdmatch_job,
+)
+from app.modules.jdmatch.ranking import create_ranking_job, get_ranking_results
 from app.modules.jdmatch.service import (
     create_jd_match,
+    create_jd_match_batch,
     get_jd_match_analysis,
     get_jd_match_status,
     jd_match_analyze,
+    jd_match_batch_analyze,
 )
 
 router: APIRouter = APIRouter()
 
 logger = get_logger("jdmatch.api")
 
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
 
-def format_sse(event_type: SSEEventType, data: SSEEvent) -> str:
-    return f"event: {event_type.value}\ndata: {data.model_dump_json(by_alias=True)}\n\n"
+
+def format_sse(
+    event_type: SSEEventType, data: SSEEvent, event_id: str | None = None
+) -> str:
+    id_line = f"id: {event_id}\n" if event_id else ""
+    return (
+        f"{id_line}event: {event_type.value}\n"
+        f"data: {data.model_dump_json(by_alias=True)}\n\n"
+    )
 
 
 @router.post(
@@ -41,7 +82,7 @@ def format_sse(event_type: SSEEventType, data: SSEEvent) -> str:
     operation_id="createJdMatch",
 )
 async def create_jd_match_endpoint(
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
     resume_file: UploadFile | None = None,
     resume_url: Annotated[str | None, Form()] = None,
     jd_info: Annotated[str | None, Form()] = None,
@@ -60,28 +101,148 @@ async def create_jd_match_endpoint(
 async def analyze_jd_match_endpoint(
     jd_match_id: Annotated[str, Path(...)],
     gemini_client: Annotated[genai.Client, Depends(get_gemini_client)],
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
     browser_use_client: Annotated[AsyncBrowserUse, Depends(get_browser_use_client)],
+    last_event_id: Annotated[str | None, Header(alias="Last-Event-ID")] = None,
 ) -> StreamingResponse:
     logger.info(
         "starting analyze_jd_match_endpoint for {jd_match_id}", jd_match_id=jd_match_id
     )
 
-    async def event_generator():
-        async for event_type, event_data in jd_match_analyze(
-            jd_match_id, gemini_client, session, browser_use_client
+    async def event_generator() -> AsyncGenerator[str, None]:
+        async for event_type, event_data, event_id in jd_match_analyze(
+            jd_match_id, gemini_client, session, browser_use_client, last_event_id
+        ):
+            yield format_sse(event_type, event_data, event_id)
+
+    return StreamingResponse(
+        event_generator(), media_type="text/event-stream", headers=_SSE_HEADERS
+    )
+
+
+@router.post(
+    "/batch",
+    status_code=status.HTTP_200_OK,
+    operation_id="batchAnalyzeJdMatch",
+)
+async def batch_analyze_jd_match_endpoint(
+    jd_infos: Annotated[list[str], Form()],
+    gemini_client: Annotated[genai.Client, Depends(get_gemini_client)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    browser_use_client: Annotated[AsyncBrowserUse, Depends(get_browser_use_client)],
+    resume_file: UploadFile | None = None,
+    resume_url: Annotated[str | None, Form()] = None,
+) -> StreamingResponse:
+    logger.info(
+        "starting batch_analyze_jd_match_endpoint for {count} JDs", count=len(jd_infos)
+    )
+    if len(jd_infos) > settings.BATCH_MAX_JDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BATCH_MAX_JDS} JDs per batch",
+        )
+
+    # Store the resume and create the records before streaming, so upload
+    # errors still surface as regular HTTP errors
+    jd_records = await create_jd_match_batch(session, jd_infos, resume_file, resume_url)
+
+    async def event_generator() -> AsyncGenerator[str, None]:
+        async for event_type, event_data in jd_match_batch_analyze(
+            jd_records, gemini_client, browser_use_client
         ):
             yield format_sse(event_type, event_data)
 
     return StreamingResponse(
-        event_generator(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
+        event_generator(), media_type="text/event-stream", headers=_SSE_HEADERS
+    )
+
+
+@router.post(
+    "/rankings",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ResponseEnvelope[RankingJobResponse],
+    operation_id="createRankingJob",
+)
+async def create_ranking_job_endpoint(
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    jd_info: Annotated[str, Form()],
+    resume_urls: Annotated[list[str] | None, Form()] = None,
+    resumes_zip: UploadFile | None = None,
+) -> ResponseEnvelope[RankingJobResponse]:
+    logger.info("starting create_ranking_job_endpoint()")
+    ranking_job = await create_ranking_job(
+        session, jd_info, resume_urls or [], resumes_zip
+    )
+    response = await enqueue_ranking_job(ranking_job)
+    return ResponseEnvelope.ok(response)
+
+
+@router.get(
+    "/rankings/{ranking_job_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=ResponseEnvelope[RankingResultsResponse],
+    operation_id="getRankingResults",
+)
+async def get_ranking_results_endpoint(
+    ranking_job_id: uuid.UUID,
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+    page: Annotated[int, Query(ge=1)] = 1,
+    page_size: Annotated[int, Query(ge=1, le=100)] = 50,
+) -> ResponseEnvelope[RankingResultsResponse]:
+    logger.info(
+        "starting get_ranking_results_endpoint for {ranking_job_id}",
+        ranking_job_id=ranking_job_id,
+    )
+    response = await get_ranking_results(str(ranking_job_id), session, page, page_size)
+    return ResponseEnvelope.ok(response)
+
+
+@router.post(
+    "/{jd_match_id}/jobs",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ResponseEnvelope[JdMatchJobResponse],
+    operation_id="enqueueJdMatchAnalysis",
+)
+async def enqueue_jd_match_analysis_endpoint(
+    jd_match_id: Annotated[str, Path(...)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+) -> ResponseEnvelope[JdMatchJobResponse]:
+    logger.info(
+        "starting enqueue_jd_match_analysis_endpoint for {jd_match_id}",
+        jd_match_id=jd_match_id,
     )
+    response = await enqueue_jd_match_analysis(jd_match_id, session)
+    return ResponseEnvelope.ok(response)
+
+
+@router.post(
+    "/consumer",
+    status_code=status.HTTP_200_OK,
+    include_in_schema=False,
+    operation_id="consumeJdMatchJob",
+)
+async def consume_jd_match_job_endpoint(
+    request: Request,
+    receiver: Annotated[Receiver, Depends(get_qstash_consumer)],
+) -> ResponseEnvelope[None]:
+    body = (await request.body()).decode()
+    signature = request.headers.get("Upstash-Signature")
+    if not signature:
+        raise HTTPException(status_code=401, detail="Missing QStash signature")
+    try:
+        receiver.verify(
+            signature=signature, body=body, url=settings.get_job_worker_url()
+        )
+    except SignatureError as e:
+        raise HTTPException(status_code=401, detail=str(e)) from e
+
+    job = Job.model_validate_json(body)
+    retried = int(request.headers.get("Upstash-Retried", "0"))
+    logger.info("consuming job {key} (retried={retried})", key=job.key, retried=retried)
+
+    # Failures propagate as 500s so QStash retries with backoff
+    await process_jdmatch_job(job, is_final_attempt=retried >= settings.JOB_MAX_RETRIES)
+    return ResponseEnvelope.ok(None)
 
 
 @router.get(
@@ -92,7 +253,7 @@ async def analyze_jd_match_endpoint(
 )
 async def get_jd_match_analysis_endpoint(
     jd_match_id: str,
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> ResponseEnvelope[JdMatchAnalysisResponse]:
     logger.info(
         "starting get_jd_match_analysis_endpoint for {jd_match_id}",
@@ -110,7 +271,7 @@ async def get_jd_match_analysis_endpoint(
 )
 async def get_jd_match_status_endpoint(
     jd_match_id: str,
-    session: Annotated[Session, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> ResponseEnvelope[JdMatchStatusResponse]:
     logger.info(
         "starting get_jd_match_status_endpoint for {jd_match_id}",
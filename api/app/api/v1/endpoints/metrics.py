@@ -0,0 +1,26 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter, status
+
+from app.api.v1.dto import ResponseEnvelope
+from app.api.v1.dto.metrics import CircuitBreakerMetrics
+from app.integrations.resilience.breakers import get_circuit_breaker_registry
+
+router: APIRouter = APIRouter()
+
+
+@router.get(
+    "/circuit-breakers",
+    status_code=status.HTTP_200_OK,
+    response_model=ResponseEnvelope[list[CircuitBreakerMetrics]],
+    operation_id="getCircuitBreakerMetrics",
+)
+async def get_circuit_breaker_metrics_endpoint() -> (
+    ResponseEnvelope[list[CircuitBreakerMetrics]]
+):
+    """State, error counts and tail latency of this process's breakers."""
+    response = [
+        CircuitBreakerMetrics(**asdict(stats))
+        for stats in get_circuit_breaker_registry().stats()
+    ]
+    return ResponseEnvelope.ok(response)
@@ -0,0 +1,123 @@
+"""Re-score jd_match records offline through the Gemini Batch API.
+
+Cheaper than ``/analyze`` and outside the interactive quota, at the cost of
+latency: a batch can take hours. Only the structured score is written; each
+record moves QUEUED -> PROCESSING -> MATCHED/FAILED like an online analysis,
+but is left MATCHED with an empty explanation until ``/analyze`` runs on it.
+
+    jdmatch-score-offline --ranking-job-id <id>
+    jdmatch-score-offline --status FAILED --limit 500 --no-wait
+    jdmatch-score-offline --batch-name batches/<name>
+"""
+
+import argparse
+import asyncio
+
+from app.core.logging.logger import get_logger
+from app.integrations.browser_use.agent import get_browser_use_client
+from app.integrations.db.database import (
+    async_engine,
+    async_session_factory,
+    connect_to_postgres,
+)
+from app.integrations.http.client import get_http_client_registry
+from app.integrations.llm.files import get_gemini_file_manager
+from app.integrations.llm.gemini import get_gemini_client
+from app.integrations.redis.store import connect_to_redis
+from app.modules.jdmatch.constants import JdMatchStatus
+from app.modules.jdmatch.offline_scoring import (
+    collect_offline_scoring,
+    score_offline,
+    submit_offline_scoring,
+)
+from app.modules.jdmatch.repo import list_jd_matches
+
+logger = get_logger("cli.score_offline")
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="jdmatch-score-offline",
+        description="Score jd_match records through the Gemini Batch API.",
+    )
+    selection = parser.add_mutually_exclusive_group(required=True)
+    selection.add_argument(
+        "--jd-match-id",
+        action="append",
+        dest="jd_match_ids",
+        help="record to score; repeat for several",
+    )
+    selection.add_argument(
+        "--ranking-job-id", help="score every resume of a ranking job"
+    )
+    selection.add_argument(
+        "--status",
+        choices=[status.name for status in JdMatchStatus],
+        help="score every record currently in this status",
+    )
+    selection.add_argument(
+        "--batch-name", help="resume waiting on an already submitted batch"
+    )
+    parser.add_argument("--limit", type=int, help="score at most this many records")
+    parser.add_argument(
+        "--no-wait",
+        action="store_true",
+        help="submit and exit; collect later with --batch-name",
+    )
+    return parser.parse_args(argv)
+
+
+async def _run(args: argparse.Namespace) -> None:
+    gemini_client = get_gemini_client()
+
+    if args.batch_name:
+        await collect_offline_scoring(args.batch_name, gemini_client)
+        return
+
+    async with async_session_factory() as session:
+        jd_matches = await list_jd_matches(
+            session,
+            jd_match_ids=args.jd_match_ids,
+            ranking_job_id=args.ranking_job_id,
+            status=JdMatchStatus[args.status].value if args.status else None,
+            limit=args.limit,
+        )
+    logger.info("scoring {count} records offline", count=len(jd_matches))
+    if not jd_matches:
+        return
+
+    if args.no_wait:
+        batches = await submit_offline_scoring(
+            jd_matches, gemini_client, get_browser_use_client()
+        )
+        # Uploaded resumes must outlive this process until Gemini runs the batch
+        for batch in batches:
+            logger.info(
+                "submitted {batch_name}; collect it with --batch-name",
+                batch_name=batch.name,
+            )
+        return
+
+    try:
+        await score_offline(jd_matches, gemini_client, get_browser_use_client())
+    finally:
+        await get_gemini_file_manager().close(gemini_client)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    connect_to_postgres()
+    await connect_to_redis()
+    get_http_client_registry().open()
+    try:
+        await _run(args)
+    finally:
+        await get_http_client_registry().close()
+        await async_engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    asyncio.run(_main(_parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose breaker is open."""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f"{name} is unavailable, retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+@dataclass
+class CircuitBreakerStats:
+    name: str
+    state: CircuitState
+    consecutive_failures: int
+    calls: int
+    failures: int
+    timeouts: int
+    rejected: int
+    latency_p50: float | None
+    latency_p95: float | None
+    latency_p99: float | None
+
+
+class CircuitBreaker:
+    """Timeout plus circuit breaker around calls to one dependency.
+
+    Every call is bounded by ``timeout_seconds``. ``failure_threshold``
+    consecutive failures open the breaker: calls fail fast with
+    ``CircuitOpenError`` for ``reset_seconds``, then up to ``half_open_probes``
+    calls go through. A successful probe closes the breaker, a failed one
+    opens it again. Exceptions ``is_failure`` rejects (e.g. a 404) mean the
+    dependency answered and count as successes. Latencies of the last
+    ``latency_window`` successful calls are kept for percentiles.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        timeout_seconds: float,
+        failure_threshold: int,
+        reset_seconds: float,
+        half_open_probes: int = 1,
+        is_failure: Callable[[BaseException], bool] | None = None,
+        latency_window: int = 512,
+    ) -> None:
+        self.name = name
+        self.timeout_seconds = timeout_seconds
+        self._failure_threshold = failure_threshold
+        self._reset_seconds = reset_seconds
+        self._half_open_probes = half_open_probes
+        self._is_failure = is_failure or (lambda _: True)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._consecutive_failures = 0
+        self._calls = 0
+        self._failures = 0
+        self._timeouts = 0
+        self._rejected = 0
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self._reset_seconds
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        probe = self._admit()
+        started = time.monotonic()
+        try:
+            async with asyncio.timeout(self.timeout_seconds):
+                result = await fn()
+        except asyncio.CancelledError:
+            # Cancelled by the caller (e.g. a hedge that lost): no verdict
+            if probe:
+                self._probes -= 1
+            raise
+        except Exception as e:
+            if isinstance(e, TimeoutError):
+                self._timeouts += 1
+            if self._is_failure(e):
+                self.record_failure()
+            else:
+                self._record_success(probe)
+            raise
+        self._latencies.append(time.monotonic() - started)
+        self._record_success(probe)
+        return result
+
+    def record_failure(self) -> None:
+        """Count a failure seen outside ``call``, e.g. a stream that stalled."""
+        self._failures += 1
+        self._consecutive_failures += 1
+        if (
+            self._state == CircuitState.HALF_OPEN
+            or self._consecutive_failures >= self._failure_threshold
+        ):
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+    def latency_quantile(self, quantile: float, min_samples: int = 1) -> float | None:
+        if len(self._latencies) < min_samples:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(quantile * len(latencies)))]
+
+    def stats(self) -> CircuitBreakerStats:
+        return CircuitBreakerStats(
+            name=self.name,
+            state=self.state,
+            consecutive_failures=self._consecutive_failures,
+            calls=self._calls,
+            failures=self._failures,
+            timeouts=self._timeouts,
+            rejected=self._rejected,
+            latency_p50=self.latency_quantile(0.5),
+            latency_p95=self.latency_quantile(0.95),
+            latency_p99=self.latency_quantile(0.99),
+        )
+
+    def _admit(self) -> bool:
+        """Let a call through or raise; True when the call is a half-open probe."""
+        state = self.state
+        if state == CircuitState.OPEN or (
+            state == CircuitState.HALF_OPEN and self._probes >= self._half_open_probes
+        ):
+            self._rejected += 1
+            retry_after = self._opened_at + self._reset_seconds - time.monotonic()
+            raise CircuitOpenError(self.name, max(0.0, retry_after))
+        self._calls += 1
+        if state == CircuitState.HALF_OPEN:
+            self._probes += 1
+            return True
+        return False
+
+    def _record_success(self, probe: bool) -> None:
+        self._consecutive_failures = 0
+        if probe:
+            self._probes -= 1
+            self._state = CircuitState.CLOSED
+
+
+async def hedged(fn: Callable[[], Awaitable[T]], delay: float) -> T:
+    """Run ``fn`` and, if it hasn't finished after ``delay`` seconds, a second
+    copy alongside it. The first to succeed wins and the other is cancelled;
+    if both fail the first error is raised. Only for idempotent calls."""
+    tasks = [asyncio.ensure_future(fn())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            tasks.append(asyncio.ensure_future(fn()))
+        return await _first_success(tasks)
+    finally:
+        for task in tasks:
+            # A loser that already failed: retrieve its error so it isn't logged
+            if not task.cancel() and not task.cancelled():
+                task.exception()
+
+
+async def _first_success(tasks: Sequence[asyncio.Future[T]]) -> T:
+    errors: list[BaseException] = []
+    pending = set(tasks)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error is None:
+                return task.result()
+            errors.append(error)
+    raise errors[0]
@@ -1,4 +1,9 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from sqlalchemy.engine import make_url
+
+from app.integrations.llm.models import GeminiModel
 
 
 class Settings(BaseSettings):
@@ -9,32 +14,167 @@ class Settings(BaseSettings):
     PORT: int
 
     GEMINI_API_KEY: str
+    GEMINI_FILE_TTL_SECONDS: int = 3600
+    GEMINI_CONTEXT_CACHE_TTL_SECONDS: int = 3600
+    GEMINI_CONTEXT_CACHE_REFRESH_SECONDS: int = 300
+    # Gemini rejects explicit caches below this many tokens
+    GEMINI_CONTEXT_CACHE_MIN_TOKENS: int = 1024
+    # Requests per minute, shared by every worker; keyed by model name (or
+    # "files" for uploads/deletes), GEMINI_DEFAULT_RPM for anything unlisted
+    GEMINI_RPM_LIMITS: dict[str, int] = {}
+    GEMINI_DEFAULT_RPM: int = 1_000
+    GEMINI_RATE_BURST_SECONDS: float = 5.0
+    GEMINI_CONCURRENCY_INITIAL: int = 8
+    GEMINI_CONCURRENCY_MIN: int = 1
+    GEMINI_CONCURRENCY_MAX: int = 64
+    GEMINI_LATENCY_TOLERANCE: float = 2.5
+    GEMINI_CONCURRENCY_COOLDOWN_SECONDS: float = 2.0
+    GEMINI_MAX_RETRIES: int = 4
+    GEMINI_RETRY_BASE_SECONDS: float = 1.0
+    GEMINI_RETRY_MAX_SECONDS: float = 60.0
+    # Per-attempt timeout of a model call, or until a stream's first chunk
+    GEMINI_CALL_TIMEOUT_SECONDS: float = 90.0
+    GEMINI_STREAM_IDLE_TIMEOUT_SECONDS: float = 30.0
+    GEMINI_FILES_TIMEOUT_SECONDS: float = 60.0
+    # Hedge non-streaming model calls: a second copy starts once the first has
+    # run longer than the recent p95 latency (GEMINI_HEDGE_DELAY_SECONDS until
+    # there are samples), never sooner than GEMINI_HEDGE_MIN_DELAY_SECONDS
+    GEMINI_HEDGE_ENABLED: bool = False
+    GEMINI_HEDGE_QUANTILE: float = 0.95
+    GEMINI_HEDGE_DELAY_SECONDS: float = 15.0
+    GEMINI_HEDGE_MIN_DELAY_SECONDS: float = 2.0
+    # Model routing for scoring: every resume is scored by SCORE_PRESCREEN_MODEL
+    # and only scores within [SCORE_ESCALATION_MIN, SCORE_ESCALATION_MAX] are
+    # scored again, and explained, by SCORE_ESCALATION_MODEL
+    SCORE_PRESCREEN_MODEL: str = GeminiModel.flash
+    SCORE_ESCALATION_MODEL: str = GeminiModel.flash_preview
+    SCORE_ESCALATION_ENABLED: bool = True
+    SCORE_ESCALATION_MIN: int = 40
+    SCORE_ESCALATION_MAX: int = 80
+    # "two_call" scores (with model routing) and then streams an explanation;
+    # "single_call" streams score and explanation from one SINGLE_CALL_MODEL
+    # call, halving calls per analysis but skipping escalation
+    ANALYSIS_MODE: Literal["two_call", "single_call"] = "two_call"
+    # Unset: the model that explains in two-call mode, SCORE_ESCALATION_MODEL
+    SINGLE_CALL_MODEL: str | None = None
     CHROME_PATH: str
 
     API_URL: str
     DB_URI: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE_SECONDS: int = 30 * 60
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0
+
+    RESUME_MAX_BYTES: int = 10 * 1024 * 1024
+    RESUME_CHUNK_BYTES: int = 64 * 1024
+    # "text" sends locally extracted resume text to Gemini and only uploads the
+    # PDF when it has no text layer; "file" always uploads the PDF
+    RESUME_INPUT_MODE: Literal["text", "file"] = "text"
+    # Fewer extracted characters per page than this means a scanned PDF
+    RESUME_TEXT_MIN_CHARS_PER_PAGE: int = 200
+    RESUME_TEXT_MAX_CHARS: int = 20_000
+    RESUME_TEXT_CACHE_TTL_SECONDS: int = 30 * 24 * 60 * 60
+    RESUME_TEXT_CACHE_MAX_ENTRIES: int = 20_000
 
     DOC_TO_PDF_API_URL: str
+    DOC_TO_PDF_TIMEOUT_SECONDS: float = 60.0
+    # Whole conversion; DOC_TO_PDF_TIMEOUT_SECONDS only bounds each read
+    DOC_TO_PDF_TOTAL_TIMEOUT_SECONDS: float = 120.0
+    CONVERSION_CACHE_DIR: str = ".cache/conversions"
+    CONVERSION_CACHE_MAX_ENTRIES: int = 500
+
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_READ_TIMEOUT_SECONDS: float = 30.0
+    HTTP_POOL_TIMEOUT_SECONDS: float = 10.0
+    HTTP_MAX_CONNECTIONS: int = 50
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+
+    # Consecutive failures that open a dependency's circuit breaker, how long
+    # it stays open, and how many calls probe it once that time is up
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_SECONDS: float = 30.0
+    CIRCUIT_HALF_OPEN_PROBES: int = 1
 
     QSTASH_URL: str
     QSTASH_TOKEN: str
     QSTASH_CURRENT_SIGNING_KEY: str
     QSTASH_NEXT_SIGNING_KEY: str
 
+    JOB_QUEUE_BACKEND: str = "qstash"  # "qstash" or "redis" (local runs)
+    JOB_WORKER_ENABLED: bool = True
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_MAX_RETRIES: int = 3
+    JOB_RETRY_BASE_DELAY_SECONDS: float = 2.0
+    JOB_RETRY_MAX_DELAY_SECONDS: float = 120.0
+    JOB_VISIBILITY_TIMEOUT_SECONDS: int = 600
+    JOB_KEY_TTL_SECONDS: int = 24 * 60 * 60
+
     REDIS_DB: str
     REDIS_HOST: str
     REDIS_PORT: str
 
+    PROGRESS_TTL_SECONDS: int = 60 * 60
+    PROGRESS_LEASE_SECONDS: int = 5 * 60
+    PROGRESS_EVENT_LOG_MAX_LEN: int = 2_000
+    PROGRESS_POLL_INTERVAL_MS: int = 5_000
+
+    RESULT_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    RESULT_CACHE_MAX_ENTRIES: int = 10_000
+
+    JD_EXTRACTION_CACHE_TTL_SECONDS: int = 3 * 24 * 60 * 60
+    JD_EXTRACTION_CACHE_MAX_ENTRIES: int = 5_000
+    JD_EXTRACTION_LOCK_TIMEOUT_SECONDS: int = 3 * 60
+
+    JD_VERDICT_CACHE_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    JD_VERDICT_CACHE_MAX_ENTRIES: int = 10_000
+
+    BATCH_MAX_JDS: int = 50
+    BATCH_MAX_CONCURRENCY: int = 5
+
+    RANKING_MAX_RESUMES: int = 500
+    RANKING_MAX_ZIP_BYTES: int = 200 * 1024 * 1024
+    RANKING_CONCURRENCY: int = 8
+
+    OFFLINE_BATCH_MAX_REQUESTS: int = 1_000
+    OFFLINE_BATCH_POLL_SECONDS: float = 30.0
+    # Polls of a batch that may fail in a row (after the governor's own
+    # retries) before waiting for it is given up
+    OFFLINE_BATCH_MAX_POLL_FAILURES: int = 10
+    OFFLINE_BATCH_PREPARE_CONCURRENCY: int = 8
+
     BROWSER_USE_API_KEY: str
+    # Below JD_EXTRACTION_LOCK_TIMEOUT_SECONDS so the lock outlives the task
+    BROWSER_USE_TIMEOUT_SECONDS: float = 150.0
 
     SUPABASE_URL: str
     SUPABASE_KEY: str
     SUPABASE_BUCKET: str
+    SUPABASE_TIMEOUT_SECONDS: float = 60.0
 
     OPENAPI_URL: str
 
     def get_redis_url(self) -> str:
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
 
+    def get_async_db_uri(self) -> str:
+        url = make_url(self.DB_URI).set(drivername="postgresql+asyncpg")
+        # asyncpg takes ``ssl`` where libpq/psycopg take ``sslmode``
+        if "sslmode" in url.query:
+            sslmode = url.query["sslmode"]
+            # A repeated parameter comes back as a tuple; the last one wins
+            url = url.difference_update_query(["sslmode"]).update_query_dict(
+                {"ssl": sslmode if isinstance(sslmode, str) else sslmode[-1]}
+            )
+        return url.render_as_string(hide_password=False)
+
+    def get_single_call_model(self) -> str:
+        return self.SINGLE_CALL_MODEL or self.SCORE_ESCALATION_MODEL
+
+    def get_job_worker_url(self) -> str:
+        return f"{self.API_URL.rstrip('/')}/api/v1/jdmatch/consumer"
+
 
 settings = Settings()
@@ -0,0 +1,43 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Flight(Generic[T]):
+    task: asyncio.Task[T]
+    waiters: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """Coalesce concurrent calls per key: the first caller starts ``fn``, and
+    every caller (the first included) awaits its result or exception instead
+    of repeating the work.
+
+    ``fn`` runs in its own task, so a caller being cancelled only cancels that
+    caller; the work is cancelled once no caller is left waiting for it.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[str, _Flight[T]] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        flight = self._in_flight.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._in_flight[key] = flight
+            flight.task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        flight.waiters += 1
+        try:
+            # shield: one caller being cancelled must not cancel the others
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1:
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
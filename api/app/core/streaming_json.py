@@ -0,0 +1,206 @@
+import json
+import re
+from collections.abc import Collection
+from dataclasses import dataclass
+from typing import Any
+
+_WHITESPACE = " \t\r\n"
+# An escape cut off at the end of a chunk: a lone backslash, a partial \uXXXX,
+# or a high surrogate whose low half hasn't arrived
+_INCOMPLETE_ESCAPE = re.compile(
+    r"(?<!\\)(?:\\\\)*"
+    r"(\\u[dD][89abAB][0-9a-fA-F]{2}(?:\\u?[0-9a-fA-F]{0,3})?|\\u[0-9a-fA-F]{0,3}|\\)$"
+)
+
+
+@dataclass(frozen=True)
+class JsonFieldEvent:
+    """A top-level field whose value is complete."""
+
+    key: str
+    value: Any
+
+
+@dataclass(frozen=True)
+class JsonItemEvent:
+    """One complete item of a top-level array, before the array closes."""
+
+    key: str
+    index: int
+    value: Any
+
+
+@dataclass(frozen=True)
+class JsonTextEvent:
+    """More text of a top-level string field that streams as text."""
+
+    key: str
+    text: str
+
+
+JsonStreamEvent = JsonFieldEvent | JsonItemEvent | JsonTextEvent
+
+
+class _ValueScanner:
+    """Collects one JSON value a character at a time."""
+
+    def __init__(self) -> None:
+        self.raw: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def is_string(self) -> bool:
+        return bool(self.raw) and self.raw[0] == '"'
+
+    def feed(self, char: str) -> bool | None:
+        """True once ``char`` completes the value; None when ``char`` ends a
+        scalar (number, true, false, null) without being part of it."""
+        if self._in_string:
+            self.raw.append(char)
+            if self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+                return self._depth == 0
+            return False
+        if self._depth == 0 and self.raw and (char in _WHITESPACE or char in ",}]"):
+            return None
+        self.raw.append(char)
+        if char == '"':
+            self._in_string = True
+        elif char in "[{":
+            self._depth += 1
+        elif char in "]}":
+            self._depth -= 1
+            return self._depth == 0
+        return False
+
+    def value(self) -> Any:
+        return json.loads("".join(self.raw))
+
+
+class StreamingJsonParser:
+    """Incremental parser for a JSON object streamed in arbitrary chunks.
+
+    ``feed`` returns events as soon as they are certain: a ``JsonFieldEvent``
+    when a top-level field's value closes, a ``JsonItemEvent`` for each item
+    of a top-level array, and ``JsonTextEvent``s with the decoded text so far
+    of string fields listed in ``text_fields``. Each character is looked at
+    once, so a long stream costs no more than parsing it whole.
+    """
+
+    def __init__(self, text_fields: Collection[str] = ()) -> None:
+        self.fields: dict[str, Any] = {}
+        self._text_fields = text_fields
+        self._state = "object"
+        self._key = ""
+        self._scanner = _ValueScanner()
+        self._items: list[Any] = []
+        self._text_from = 1
+        self._events: list[JsonStreamEvent] = []
+
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
+
+    def feed(self, text: str) -> list[JsonStreamEvent]:
+        i = 0
+        while i < len(text):
+            if self._step(text[i]):
+                i += 1
+        if self._state == "value" and self._streams_text():
+            self._flush_text(final=False)
+        events, self._events = self._events, []
+        return events
+
+    def close(self) -> dict[str, Any]:
+        """All fields, once the stream has ended; raises if it was cut short."""
+        if not self.done:
+            raise ValueError("Streamed JSON ended before the object was complete")
+        return self.fields
+
+    def _step(self, char: str) -> bool:  # noqa: PLR0912
+        """Advance by one character; False when ``char`` must be seen again
+        in the new state (it ended a scalar without belonging to it)."""
+        state = self._state
+        if state in ("value", "item"):
+            completed = self._scanner.feed(char)
+            if completed is not False:
+                self._complete(state)
+            return completed is not None
+        if char in _WHITESPACE:
+            return True
+
+        if state == "object" and char == "{":
+            self._state = "key"
+        elif state == "key" and char == '"':
+            self._scanner = _ValueScanner()
+            self._scanner.feed(char)
+            self._state = "key_name"
+        elif state == "key_name":
+            if self._scanner.feed(char):
+                self._key = self._scanner.value()
+                self._state = "colon"
+        elif state == "colon" and char == ":":
+            self._state = "field"
+        elif state == "field" and char == "[":
+            self._items = []
+            self._state = "items"
+        elif state in ("field", "items"):
+            if state == "items" and char == "]":
+                self._close_array()
+                return True
+            self._scanner = _ValueScanner()
+            self._text_from = 1
+            self._state = "value" if state == "field" else "item"
+            return self._step(char)
+        elif state == "item_end" and char == ",":
+            self._state = "items"
+        elif state == "item_end" and char == "]":
+            self._close_array()
+        elif state == "field_end" and char == ",":
+            self._state = "key"
+        elif state in ("field_end", "key") and char == "}":
+            self._state = "done"
+        elif state != "done":
+            raise ValueError(f"Unexpected {char!r} in streamed JSON ({state})")
+        return True
+
+    def _complete(self, state: str) -> None:
+        value = self._scanner.value()
+        if state == "item":
+            self._events.append(JsonItemEvent(self._key, len(self._items), value))
+            self._items.append(value)
+            self._state = "item_end"
+            return
+        if self._streams_text():
+            self._flush_text(final=True)
+        self._add_field(value)
+
+    def _close_array(self) -> None:
+        self._add_field(self._items)
+        self._items = []
+
+    def _add_field(self, value: Any) -> None:
+        self.fields[self._key] = value
+        self._events.append(JsonFieldEvent(self._key, value))
+        self._state = "field_end"
+
+    def _streams_text(self) -> bool:
+        return self._key in self._text_fields and self._scanner.is_string
+
+    def _flush_text(self, *, final: bool) -> None:
+        raw = "".join(self._scanner.raw[self._text_from :])
+        if final:
+            raw = raw[:-1]  # the closing quote
+        else:
+            incomplete = _INCOMPLETE_ESCAPE.search(raw)
+            if incomplete:
+                raw = raw[: incomplete.start(1)]
+        if raw:
+            self._text_from += len(raw)
+            self._events.append(JsonTextEvent(self._key, json.loads(f'"{raw}"')))
@@ -1,12 +1,29 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator
 from functools import lru_cache
+from typing import Any
 
-from app.core.config import settings
-from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.config import settings
 from app.core.logging.logger import get_logger
 
-engine = create_engine(settings.DB_URI)
+_pool_options: dict[str, Any] = {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+}
+
+# The sync engine is only used for schema bootstrapping; request and worker
+# code goes through the asyncpg engine so DB latency never blocks the loop
+engine = create_engine(settings.DB_URI, **_pool_options)
+async_engine = create_async_engine(settings.get_async_db_uri(), **_pool_options)
+async_session_factory = async_sessionmaker(
+    async_engine, class_=AsyncSession, expire_on_commit=False
+)
 
 logger = get_logger("db.database")
 
@@ -18,6 +35,6 @@ def connect_to_postgres() -> None:
     logger.success("Database initialization completed")
 
 
-def get_session() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    async with async_session_factory() as session:
         yield session
@@ -7,15 +7,47 @@ from sqlmodel import Field, SQLModel
 from app.modules.jdmatch.constants import JdMatchStatus
 
 
+class Resume(SQLModel, table=True):
+    """Content-addressed resume: one row per distinct uploaded file."""
+
+    id: str = Field(primary_key=True)  # SHA-256 of the bytes as uploaded
+    file_name: str
+    supabase_url: str  # the file as uploaded
+    pdf_url: str  # the PDF we analyze; same as supabase_url for PDF uploads
+    created_at: datetime = Field(default_factory=datetime.now)
+
+
+class RankingJob(SQLModel, table=True):
+    """One JD ranked against many resumes; each resume is a JDMatchDtl row."""
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    jd_info: str  # as submitted: JD text or link
+    jd: str | None = None  # validated/extracted JD, resolved once per job
+    status: str = Field(default=JdMatchStatus.QUEUED.value)
+    source_zip: str | None = None  # Supabase path of the uploaded zip, if any
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    error: str | None = None
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+
 class JDMatchDtl(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    file_id: str = Field(index=True, unique=True)
+    file_id: str = Field(index=True)
+    resume_id: str | None = Field(default=None, foreign_key="resume.id", index=True)
+    ranking_job_id: uuid.UUID | None = Field(
+        default=None, foreign_key="rankingjob.id", index=True
+    )
     jd: str | None = None
     status: str = Field(default=JdMatchStatus.QUEUED.value)
     score: int | None = None
     missing_skills: list[str] | None = Field(default=None, sa_column=Column(JSON))
     matching_skills: list[str] | None = Field(default=None, sa_column=Column(JSON))
     explanation: str | None = None
+    # Gemini model that produced the final score and explanation
+    score_model: str | None = None
     file_name: str | None = None
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
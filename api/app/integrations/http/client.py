@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from importlib.util import find_spec
+
+import httpx
+
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+
+logger = get_logger("http.client")
+
+# HTTP/2 needs the optional `h2` package (httpx[http2]); fall back to 1.1
+_HTTP2_AVAILABLE = find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class HttpUpstream:
+    resume_download = "resume_download"  # Drive, Dropbox and arbitrary resume URLs
+    doc_to_pdf = "doc_to_pdf"  # Gotenberg
+
+
+def _build_client(upstream: str) -> httpx.AsyncClient:
+    read_timeout = (
+        settings.DOC_TO_PDF_TIMEOUT_SECONDS
+        if upstream == HttpUpstream.doc_to_pdf
+        else settings.HTTP_READ_TIMEOUT_SECONDS
+    )
+    return httpx.AsyncClient(
+        http2=_HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            read_timeout,
+            connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+            pool=settings.HTTP_POOL_TIMEOUT_SECONDS,
+        ),
+    )
+
+
+class HttpClientRegistry:
+    """One pooled, keep-alive ``httpx.AsyncClient`` per upstream.
+
+    Separate clients give every upstream its own connection limits, so a slow
+    resume host cannot starve conversions. Clients are opened in the app
+    lifespan and closed on shutdown; ``get`` also opens them lazily for code
+    running outside the app (job workers, scripts).
+    """
+
+    def __init__(self) -> None:
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def open(self) -> None:
+        for upstream in (HttpUpstream.resume_download, HttpUpstream.doc_to_pdf):
+            self.get(upstream)
+        logger.info("HTTP clients opened (http2={http2})", http2=_HTTP2_AVAILABLE)
+
+    def get(self, upstream: str) -> httpx.AsyncClient:
+        client = self._clients.get(upstream)
+        if client is None or client.is_closed:
+            client = self._clients[upstream] = _build_client(upstream)
+        return client
+
+    async def close(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+@lru_cache(maxsize=1)
+def get_http_client_registry() -> HttpClientRegistry:
+    return HttpClientRegistry()
+
+
+def get_http_client(upstream: str) -> httpx.AsyncClient:
+    return get_http_client_registry().get(upstream)
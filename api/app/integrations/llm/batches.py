@@ -0,0 +1,108 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import httpx
+from google import genai
+from google.genai import errors, types
+
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.integrations.llm.limiter import BATCHES_SCOPE, get_gemini_governor
+from app.integrations.resilience.breakers import is_dependency_failure
+
+logger = get_logger("llm.batches")
+
+TERMINAL_BATCH_STATES = frozenset(
+    {
+        types.JobState.JOB_STATE_SUCCEEDED,
+        types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+        types.JobState.JOB_STATE_FAILED,
+        types.JobState.JOB_STATE_CANCELLED,
+        types.JobState.JOB_STATE_EXPIRED,
+    }
+)
+
+_TOO_MANY_REQUESTS = 429
+
+
+async def create_batch(
+    gemini_client: genai.Client,
+    model: str,
+    requests: list[types.InlinedRequest],
+    display_name: str,
+) -> types.BatchJob:
+    batch_job = await gemini_client.aio.batches.create(
+        model=model,
+        src=requests,
+        config=types.CreateBatchJobConfig(display_name=display_name),
+    )
+    logger.info(
+        "Created Gemini batch {batch_name} with {count} requests",
+        batch_name=batch_job.name,
+        count=len(requests),
+    )
+    return batch_job
+
+
+async def wait_for_batch(
+    gemini_client: genai.Client,
+    name: str,
+    poll_interval_seconds: float,
+    on_update: Callable[[types.BatchJob], Awaitable[None]] | None = None,
+) -> types.BatchJob:
+    """Poll a batch job until it reaches a terminal state. ``on_update`` is
+    awaited whenever the job's state changes.
+
+    Each poll goes through the Gemini governor. A poll that still fails with a
+    transient error (timeout, transport error, 429/5xx, open circuit) is
+    logged and tried again on the next interval, since the batch keeps running
+    on Gemini's side; ``OFFLINE_BATCH_MAX_POLL_FAILURES`` in a row, or any
+    other error, is raised.
+    """
+    state = None
+    failures = 0
+    while True:
+        try:
+            batch_job = await get_gemini_governor().call(
+                BATCHES_SCOPE, lambda: gemini_client.aio.batches.get(name=name)
+            )
+        except (
+            errors.APIError,
+            CircuitOpenError,
+            TimeoutError,
+            httpx.TransportError,
+        ) as e:
+            failures += 1
+            if (
+                not _is_transient(e)
+                or failures >= settings.OFFLINE_BATCH_MAX_POLL_FAILURES
+            ):
+                raise
+            logger.warning(
+                "Polling Gemini batch {batch_name} failed ({failures} in a row): "
+                "{error}",
+                batch_name=name,
+                failures=failures,
+                error=str(e),
+            )
+        else:
+            failures = 0
+            if batch_job.state != state:
+                state = batch_job.state
+                logger.info(
+                    "Gemini batch {batch_name} is {state}",
+                    batch_name=name,
+                    state=state,
+                )
+                if on_update:
+                    await on_update(batch_job)
+            if state in TERMINAL_BATCH_STATES:
+                return batch_job
+        await asyncio.sleep(poll_interval_seconds)
+
+
+def _is_transient(error: Exception) -> bool:
+    if isinstance(error, errors.APIError):
+        return error.code == _TOO_MANY_REQUESTS or is_dependency_failure(error)
+    return True
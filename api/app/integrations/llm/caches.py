@@ -0,0 +1,197 @@
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+import httpx
+from google import genai
+from google.genai import errors, types
+
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.integrations.llm.limiter import CACHES_SCOPE, get_gemini_governor
+from app.integrations.resilience.breakers import is_dependency_failure
+
+logger = get_logger("llm.caches")
+
+# Rough chars-per-token ratio, only used to skip prefixes that are obviously
+# below Gemini's minimum cacheable size without a count_tokens round trip
+_CHARS_PER_TOKEN = 4
+# Prefixes Gemini refused to cache, remembered so they aren't retried per call
+_MAX_UNCACHEABLE = 1024
+_TOO_MANY_REQUESTS = 429
+# Failures a call still raises after the governor's retries
+_CACHE_ERRORS = (errors.APIError, CircuitOpenError, TimeoutError, httpx.TransportError)
+
+
+@dataclass
+class _CacheHandle:
+    name: str
+    expires_at: float
+
+
+class GeminiContextCacheManager:
+    """Keeps one Gemini cached-content entry per shared prompt prefix.
+
+    A prefix is a model, its system instruction and the context every call
+    shares (e.g. the JD), so bulk scoring sends the JD once and each call only
+    adds the resume. Entries live for ``ttl_seconds``; one handed out within
+    ``refresh_seconds`` of expiring gets its TTL extended first, so a call
+    never starts on an entry about to vanish. Prefixes shorter than
+    ``min_tokens`` (Gemini's minimum) or that fail to cache return ``None``
+    and callers send them inline instead.
+
+    Every caches.* call goes through the Gemini governor (rate limit, retries,
+    circuit breaker) under its own scope. Only a prefix Gemini rejects is
+    remembered as uncacheable; one that failed on an outage is tried again.
+    """
+
+    def __init__(self, ttl_seconds: int, refresh_seconds: int, min_tokens: int) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._refresh_seconds = refresh_seconds
+        self._min_tokens = min_tokens
+        self._handles: dict[str, _CacheHandle] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._uncacheable: dict[str, None] = {}
+
+    async def acquire(
+        self,
+        gemini_client: genai.Client,
+        model: str,
+        system_instruction: str,
+        context: str,
+    ) -> str | None:
+        """Name of the cached-content entry for this prefix, or ``None``."""
+        if len(system_instruction) + len(context) < self._min_tokens * _CHARS_PER_TOKEN:
+            return None
+        key = _prefix_key(model, system_instruction, context)
+        if key in self._uncacheable:
+            return None
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            handle = self._handles.get(key)
+            now = time.monotonic()
+            if handle and handle.expires_at > now:
+                if handle.expires_at - now > self._refresh_seconds:
+                    return handle.name
+                if await self._extend(gemini_client, handle):
+                    return handle.name
+            self._handles.pop(key, None)
+            return await self._create(
+                gemini_client, key, model, system_instruction, context
+            )
+
+    async def close(self, gemini_client: genai.Client) -> None:
+        now = time.monotonic()
+        for key, handle in list(self._handles.items()):
+            self._handles.pop(key, None)
+            self._locks.pop(key, None)
+            if handle.expires_at > now:
+                await self._delete(gemini_client, handle.name)
+
+    async def _create(
+        self,
+        gemini_client: genai.Client,
+        key: str,
+        model: str,
+        system_instruction: str,
+        context: str,
+    ) -> str | None:
+        try:
+            cached_content = await get_gemini_governor().call(
+                CACHES_SCOPE,
+                lambda: gemini_client.aio.caches.create(
+                    model=model,
+                    config=types.CreateCachedContentConfig(
+                        system_instruction=system_instruction,
+                        contents=[context],
+                        ttl=f"{self._ttl_seconds}s",
+                    ),
+                ),
+            )
+        except _CACHE_ERRORS as e:
+            logger.warning(
+                "Caching prompt prefix for {model} failed, sending it inline: {error}",
+                model=model,
+                error=str(e),
+            )
+            if _is_rejection(e):
+                self._uncacheable[key] = None
+                if len(self._uncacheable) > _MAX_UNCACHEABLE:
+                    self._uncacheable.pop(next(iter(self._uncacheable)))
+            return None
+
+        if not cached_content.name:
+            return None
+        self._handles[key] = _CacheHandle(
+            name=cached_content.name,
+            expires_at=time.monotonic() + self._ttl_seconds,
+        )
+        logger.info(
+            "Cached prompt prefix for {model} as {name}",
+            model=model,
+            name=cached_content.name,
+        )
+        return cached_content.name
+
+    async def _extend(self, gemini_client: genai.Client, handle: _CacheHandle) -> bool:
+        try:
+            await get_gemini_governor().call(
+                CACHES_SCOPE,
+                lambda: gemini_client.aio.caches.update(
+                    name=handle.name,
+                    config=types.UpdateCachedContentConfig(ttl=f"{self._ttl_seconds}s"),
+                ),
+            )
+        except _CACHE_ERRORS as e:
+            logger.warning(
+                "Failed to extend Gemini cache {name}: {error}",
+                name=handle.name,
+                error=str(e),
+            )
+            return False
+        handle.expires_at = time.monotonic() + self._ttl_seconds
+        return True
+
+    async def _delete(self, gemini_client: genai.Client, name: str) -> None:
+        try:
+            await get_gemini_governor().call(
+                CACHES_SCOPE, lambda: gemini_client.aio.caches.delete(name=name)
+            )
+        except Exception as e:
+            # Gemini expires caches on its own, so a failed delete is not fatal
+            logger.warning(
+                "Failed to delete Gemini cache {name}: {error}",
+                name=name,
+                error=str(e),
+            )
+
+
+def _is_rejection(error: Exception) -> bool:
+    """Gemini answered and refused (e.g. a prefix below the minimum size),
+    rather than being unavailable."""
+    return (
+        isinstance(error, errors.APIError)
+        and error.code != _TOO_MANY_REQUESTS
+        and not is_dependency_failure(error)
+    )
+
+
+def _prefix_key(model: str, system_instruction: str, context: str) -> str:
+    digest = hashlib.sha256()
+    for part in (model, system_instruction, context):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def get_gemini_context_cache_manager() -> GeminiContextCacheManager:
+    return GeminiContextCacheManager(
+        ttl_seconds=settings.GEMINI_CONTEXT_CACHE_TTL_SECONDS,
+        refresh_seconds=settings.GEMINI_CONTEXT_CACHE_REFRESH_SECONDS,
+        min_tokens=settings.GEMINI_CONTEXT_CACHE_MIN_TOKENS,
+    )
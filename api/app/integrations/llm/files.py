@@ -0,0 +1,140 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+from google import genai
+from google.genai import types
+
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.integrations.llm.limiter import FILES_SCOPE, get_gemini_governor
+
+logger = get_logger("llm.files")
+
+# Gemini deletes uploads 48h after they are made; stop handing one out a
+# little before that
+_MAX_REUSE_SECONDS = 46 * 3600
+
+
+@dataclass
+class _FileHandle:
+    file: types.File
+    content_hash: str
+    uploaded_at: float
+    expires_at: float = 0.0
+    refs: int = 0
+
+
+class GeminiFileManager:
+    """Uploads each resume to Gemini once and shares the handle by content hash.
+
+    Every ``acquire`` takes a reference, given back with ``release`` once the
+    caller's Gemini calls are done, and pushes the handle's expiry out to
+    ``ttl_seconds`` from now. So the structured-score phase, the explanation
+    phase, concurrent analyses of the same resume and retries all reuse one
+    upload. A file is deleted lazily on a later acquire, once nothing holds it
+    and it has expired. Uploads older than ``_MAX_REUSE_SECONDS`` are not handed
+    out again, since Gemini drops files 48h after upload.
+    """
+
+    def __init__(self, ttl_seconds: int) -> None:
+        self._ttl_seconds = ttl_seconds
+        # By Gemini file name; ``_current`` points each hash at its latest upload
+        self._handles: dict[str, _FileHandle] = {}
+        self._current: dict[str, str] = {}
+        # Per hash, dropped once no acquire is holding or waiting on it
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._lock_users: dict[str, int] = {}
+
+    async def acquire(
+        self, gemini_client: genai.Client, content_hash: str, path: str
+    ) -> types.File:
+        await self.purge_expired(gemini_client)
+
+        lock = self._locks.setdefault(content_hash, asyncio.Lock())
+        self._lock_users[content_hash] = self._lock_users.get(content_hash, 0) + 1
+        try:
+            async with lock:
+                handle = self._handles.get(self._current.get(content_hash, ""))
+                if (
+                    handle
+                    and time.monotonic() - handle.uploaded_at < _MAX_REUSE_SECONDS
+                ):
+                    logger.info("Reusing Gemini file for {hash}", hash=content_hash)
+                else:
+                    handle = await self._upload(gemini_client, content_hash, path)
+                handle.refs += 1
+                handle.expires_at = time.monotonic() + self._ttl_seconds
+                return handle.file
+        finally:
+            self._lock_users[content_hash] -= 1
+            if not self._lock_users[content_hash]:
+                del self._lock_users[content_hash]
+                del self._locks[content_hash]
+
+    def release(self, file: types.File) -> None:
+        """Give back a reference taken by ``acquire``."""
+        handle = self._handles.get(file.name or "")
+        if handle and handle.refs > 0:
+            handle.refs -= 1
+
+    async def purge_expired(self, gemini_client: genai.Client) -> None:
+        now = time.monotonic()
+        for name in list(self._handles):
+            # Checked again per file: an acquire may have taken one of them
+            # while an earlier delete was awaited
+            handle = self._handles.get(name)
+            if handle and handle.refs == 0 and handle.expires_at <= now:
+                self._forget(handle)
+                await self._delete(gemini_client, name)
+
+    async def close(self, gemini_client: genai.Client) -> None:
+        for handle in list(self._handles.values()):
+            self._forget(handle)
+            await self._delete(gemini_client, handle.file.name or "")
+
+    async def _upload(
+        self, gemini_client: genai.Client, content_hash: str, path: str
+    ) -> _FileHandle:
+        file = await get_gemini_governor().call(
+            FILES_SCOPE, lambda: gemini_client.aio.files.upload(file=path)
+        )
+        if not file.name:
+            raise ValueError("Gemini returned an uploaded file without a name")
+        handle = _FileHandle(
+            file=file, content_hash=content_hash, uploaded_at=time.monotonic()
+        )
+        self._handles[file.name] = handle
+        self._current[content_hash] = file.name
+        logger.info(
+            "Uploaded {name} to Gemini for {hash}",
+            name=file.name,
+            hash=content_hash,
+        )
+        return handle
+
+    def _forget(self, handle: _FileHandle) -> None:
+        """Stop handing ``handle`` out; done before its delete is awaited."""
+        name = handle.file.name or ""
+        self._handles.pop(name, None)
+        if self._current.get(handle.content_hash) == name:
+            self._current.pop(handle.content_hash, None)
+
+    async def _delete(self, gemini_client: genai.Client, name: str) -> None:
+        try:
+            await get_gemini_governor().call(
+                FILES_SCOPE, lambda: gemini_client.aio.files.delete(name=name)
+            )
+        except Exception as e:
+            # Gemini expires files on its own, so a failed delete is not fatal
+            logger.warning(
+                "Failed to delete Gemini file {name}: {error}",
+                name=name,
+                error=str(e),
+            )
+
+
+@lru_cache(maxsize=1)
+def get_gemini_file_manager() -> GeminiFileManager:
+    return GeminiFileManager(ttl_seconds=settings.GEMINI_FILE_TTL_SECONDS)
@@ -1,4 +1,3 @@
-from dataclasses import dataclass
 from functools import lru_cache
 
 from google import genai
@@ -12,11 +11,3 @@ _gemini_client = genai.Client(api_key=settings.GEMINI_API_KEY)
 @lru_cache(maxsize=1)
 def get_gemini_client() -> genai.Client:
     return _gemini_client
-
-
-@dataclass(frozen=True)
-class GeminiModel:
-    flash = "gemini-flash-lite-latest"
-    flash_preview = "gemini-3-flash-preview"
-    pro = "gemini-3-pro-preview"
-    computer_use = "gemini-2.5-computer-use-preview-10-2025"
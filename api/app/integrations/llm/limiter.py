@@ -0,0 +1,360 @@
+import asyncio
+import random
+import re
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from google.genai import errors
+from redis import asyncio as aioredis
+from redis.commands.core import AsyncScript
+
+from app.core.circuit_breaker import CircuitBreaker, hedged
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.integrations.redis.store import get_redis_store
+from app.integrations.resilience.breakers import Dependency, get_circuit_breaker
+
+logger = get_logger("llm.limiter")
+
+T = TypeVar("T")
+
+# Gemini scopes for files.*, caches.* and batches.* calls; model calls are
+# scoped by model name
+FILES_SCOPE = "files"
+CACHES_SCOPE = "caches"
+BATCHES_SCOPE = "batches"
+
+# Latency samples a scope needs before its own tail sets the hedge delay
+_HEDGE_MIN_SAMPLES = 20
+
+_RETRYABLE_CODES = frozenset({429, 500, 502, 503, 504})
+_RETRY_DELAY_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)s$")
+
+# Refill by elapsed server time, then take one token or report how long until
+# one is available. Runs atomically, so every worker shares one bucket.
+_BUCKET_LUA = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+
+class RedisTokenBucket:
+    """Token bucket per scope, shared by every worker through Redis.
+
+    Redis errors are logged and the call goes through unthrottled: the
+    adaptive limiter and retries still protect against a quota burst.
+    """
+
+    def __init__(
+        self, namespace: str, redis: "aioredis.Redis[str] | None" = None
+    ) -> None:
+        self.namespace = namespace
+        self._redis = redis
+        self._script: AsyncScript | None = None
+
+    @property
+    def redis(self) -> "aioredis.Redis[str]":
+        return self._redis or get_redis_store()
+
+    async def acquire(
+        self, scope: str, rate_per_second: float, capacity: float
+    ) -> None:
+        if not self._script:
+            self._script = self.redis.register_script(_BUCKET_LUA)
+        while True:
+            try:
+                wait = float(
+                    await self._script(
+                        keys=[f"{self.namespace}:{scope}"],
+                        args=[rate_per_second, capacity],
+                    )
+                )
+            except Exception as e:
+                logger.warning(
+                    "Rate limit check failed for {scope}: {error}",
+                    scope=scope,
+                    error=str(e),
+                )
+                return
+            if wait <= 0:
+                return
+            # Jitter keeps waiting workers from retrying in lockstep
+            await asyncio.sleep(wait * random.uniform(1.0, 1.2))  # noqa: S311
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD cap on calls in flight.
+
+    Each success adds ``1 / limit`` (about +1 per round of calls); a 429, or a
+    latency above ``latency_tolerance`` times the running average, cuts the
+    limit (by half, or by 10% for latency). Cuts are at most one per
+    ``cooldown_seconds`` so a burst of errors from the same round counts once.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        latency_tolerance: float,
+        cooldown_seconds: float,
+    ) -> None:
+        self._limit = float(initial)
+        self._minimum = minimum
+        self._maximum = maximum
+        self._latency_tolerance = latency_tolerance
+        self._cooldown_seconds = cooldown_seconds
+        self._in_flight = 0
+        self._latency: float | None = None
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return max(self._minimum, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        average = self._latency
+        self._latency = latency if average is None else 0.9 * average + 0.1 * latency
+        if average is not None and latency > average * self._latency_tolerance:
+            self._decrease(0.9)
+        else:
+            self._limit = min(self._maximum, self._limit + 1 / self._limit)
+
+    def on_overload(self) -> None:
+        self._decrease(0.5)
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self._cooldown_seconds:
+            return
+        self._last_decrease = now
+        self._limit = max(self._minimum, self._limit * factor)
+
+
+class GeminiRateGovernor:
+    """Rate limit, adaptive concurrency, retries and a circuit breaker around
+    Gemini calls.
+
+    Every call takes a token from its scope's Redis bucket (``GEMINI_RPM_LIMITS``
+    per model, ``GEMINI_DEFAULT_RPM`` otherwise) and a slot from the scope's
+    AIMD limiter. 429s and 5xx are retried with full-jitter backoff, waiting
+    at least as long as Gemini's Retry-After / RetryInfo asks. Each attempt
+    goes through the scope's breaker, which times it out and fails fast with
+    ``CircuitOpenError`` while the scope is down.
+    """
+
+    def __init__(self, bucket: RedisTokenBucket) -> None:
+        self._bucket = bucket
+        self._limiters: dict[str, AdaptiveConcurrencyLimiter] = {}
+
+    async def call(
+        self, scope: str, request: Callable[[], Awaitable[T]], *, hedge: bool = False
+    ) -> T:
+        """``hedge`` (for idempotent requests, with ``GEMINI_HEDGE_ENABLED``)
+        starts a second copy when the first runs past the scope's tail
+        latency and keeps whichever finishes first."""
+        if hedge and settings.GEMINI_HEDGE_ENABLED:
+            return await hedged(
+                lambda: self._call(scope, request),
+                self._hedge_delay(self._breaker(scope)),
+            )
+        return await self._call(scope, request)
+
+    async def _call(self, scope: str, request: Callable[[], Awaitable[T]]) -> T:
+        limiter = self._limiter(scope)
+        breaker = self._breaker(scope)
+        attempt = 0
+        while True:
+            await self._take_token(scope)
+            async with limiter.slot():
+                started = time.monotonic()
+                try:
+                    result = await breaker.call(request)
+                except errors.APIError as e:
+                    delay = self._retry_delay(scope, limiter, e, attempt)
+                else:
+                    limiter.on_success(time.monotonic() - started)
+                    return result
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def stream(
+        self, scope: str, open_stream: Callable[[], Awaitable[AsyncIterator[T]]]
+    ) -> AsyncIterator[T]:
+        """Like ``call`` for streaming requests. Only opening the stream (up
+        to its first chunk) is retried; the slot is held until it ends, and a
+        stream silent for ``GEMINI_STREAM_IDLE_TIMEOUT_SECONDS`` is abandoned."""
+        limiter = self._limiter(scope)
+        breaker = self._breaker(scope)
+
+        async def open_first() -> tuple[AsyncIterator[T], T | None]:
+            chunks = aiter(await open_stream())
+            return chunks, await anext(chunks, None)
+
+        attempt = 0
+        while True:
+            await self._take_token(scope)
+            async with limiter.slot():
+                started = time.monotonic()
+                try:
+                    chunks, chunk = await breaker.call(open_first)
+                except errors.APIError as e:
+                    delay = self._retry_delay(scope, limiter, e, attempt)
+                else:
+                    limiter.on_success(time.monotonic() - started)
+                    while chunk is not None:
+                        yield chunk
+                        chunk = await _next_chunk(chunks, breaker)
+                    return
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _take_token(self, scope: str) -> None:
+        rpm = settings.GEMINI_RPM_LIMITS.get(scope, settings.GEMINI_DEFAULT_RPM)
+        rate = rpm / 60
+        await self._bucket.acquire(
+            scope, rate, max(1.0, rate * settings.GEMINI_RATE_BURST_SECONDS)
+        )
+
+    def _breaker(self, scope: str) -> CircuitBreaker:
+        return get_circuit_breaker(
+            Dependency.gemini,
+            scope,
+            timeout_seconds=(
+                settings.GEMINI_FILES_TIMEOUT_SECONDS if scope == FILES_SCOPE else None
+            ),
+        )
+
+    def _hedge_delay(self, breaker: CircuitBreaker) -> float:
+        tail = breaker.latency_quantile(
+            settings.GEMINI_HEDGE_QUANTILE, min_samples=_HEDGE_MIN_SAMPLES
+        )
+        return max(
+            settings.GEMINI_HEDGE_MIN_DELAY_SECONDS,
+            settings.GEMINI_HEDGE_DELAY_SECONDS if tail is None else tail,
+        )
+
+    def _limiter(self, scope: str) -> AdaptiveConcurrencyLimiter:
+        limiter = self._limiters.get(scope)
+        if not limiter:
+            limiter = self._limiters[scope] = AdaptiveConcurrencyLimiter(
+                initial=settings.GEMINI_CONCURRENCY_INITIAL,
+                minimum=settings.GEMINI_CONCURRENCY_MIN,
+                maximum=settings.GEMINI_CONCURRENCY_MAX,
+                latency_tolerance=settings.GEMINI_LATENCY_TOLERANCE,
+                cooldown_seconds=settings.GEMINI_CONCURRENCY_COOLDOWN_SECONDS,
+            )
+        return limiter
+
+    def _retry_delay(
+        self,
+        scope: str,
+        limiter: AdaptiveConcurrencyLimiter,
+        error: errors.APIError,
+        attempt: int,
+    ) -> float:
+        """How long to wait before retrying; re-raises when giving up."""
+        if error.code == 429:  # noqa: PLR2004
+            limiter.on_overload()
+        if error.code not in _RETRYABLE_CODES or attempt >= settings.GEMINI_MAX_RETRIES:
+            raise error
+        delay = retry_delay(
+            error,
+            attempt,
+            settings.GEMINI_RETRY_BASE_SECONDS,
+            settings.GEMINI_RETRY_MAX_SECONDS,
+        )
+        logger.warning(
+            "Gemini {scope} returned {code}; retry {attempt} in {delay:.1f}s "
+            "(concurrency limit {limit})",
+            scope=scope,
+            code=error.code,
+            attempt=attempt + 1,
+            delay=delay,
+            limit=limiter.limit,
+        )
+        return delay
+
+
+async def _next_chunk(chunks: AsyncIterator[T], breaker: CircuitBreaker) -> T | None:
+    try:
+        async with asyncio.timeout(settings.GEMINI_STREAM_IDLE_TIMEOUT_SECONDS):
+            return await anext(chunks, None)
+    except TimeoutError:
+        breaker.record_failure()
+        raise
+
+
+def retry_delay(
+    error: errors.APIError, attempt: int, base_seconds: float, max_seconds: float
+) -> float:
+    """Full-jitter exponential backoff, but never sooner than the server asked."""
+    backoff = random.uniform(0, min(max_seconds, base_seconds * 2**attempt))  # noqa: S311
+    retry_after = retry_after_seconds(error)
+    if retry_after is None:
+        return backoff
+    return retry_after + random.uniform(0, base_seconds)  # noqa: S311
+
+
+def retry_after_seconds(error: errors.APIError) -> float | None:
+    """Delay from a Retry-After header or a google.rpc.RetryInfo detail."""
+    headers = getattr(error.response, "headers", None)
+    header = headers.get("retry-after") if headers else None
+    if header:
+        try:
+            return max(0.0, float(header))
+        except ValueError:
+            pass
+
+    details: Any = error.details
+    if isinstance(details, dict):
+        details = details.get("error", details).get("details")
+    for detail in details if isinstance(details, list) else []:
+        match = (
+            _RETRY_DELAY_PATTERN.match(str(detail.get("retryDelay", "")))
+            if isinstance(detail, dict)
+            else None
+        )
+        if match:
+            return float(match.group(1))
+    return None
+
+
+@lru_cache(maxsize=1)
+def get_gemini_governor() -> GeminiRateGovernor:
+    return GeminiRateGovernor(RedisTokenBucket(namespace="gemini:ratelimit"))
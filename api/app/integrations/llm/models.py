@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class GeminiModel:
+    flash = "gemini-flash-lite-latest"
+    flash_preview = "gemini-3-flash-preview"
+    pro = "gemini-3-pro-preview"
+    computer_use = "gemini-2.5-computer-use-preview-10-2025"
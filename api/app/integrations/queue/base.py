@@ -0,0 +1,41 @@
+import random
+from collections.abc import Awaitable, Callable
+from enum import Enum
+from typing import Any, Protocol
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+
+
+class Job(BaseModel):
+    kind: str
+    key: str  # idempotency key, one live job per key
+    payload: dict[str, Any]
+    attempt: int = 0
+
+
+class JobState(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+
+
+class PermanentJobError(Exception):
+    """A failure that retrying cannot fix; the job is dropped, not retried."""
+
+
+JobHandler = Callable[[Job], Awaitable[None]]
+
+
+class JobBackend(Protocol):
+    async def publish(self, job: Job) -> None: ...
+
+
+def retry_delay_seconds(attempt: int) -> float:
+    """Exponential backoff with full jitter for the given (0-based) attempt."""
+    ceiling = min(
+        settings.JOB_RETRY_MAX_DELAY_SECONDS,
+        settings.JOB_RETRY_BASE_DELAY_SECONDS * (2**attempt),
+    )
+    return random.uniform(0, ceiling)  # noqa: S311
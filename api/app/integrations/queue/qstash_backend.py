@@ -0,0 +1,41 @@
+from qstash.asyncio.client import AsyncQStash
+
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.integrations.queue.base import Job
+
+logger = get_logger("queue.qstash")
+
+# QStash evaluates this per retry; `retried` starts at 0 (milliseconds)
+_RETRY_DELAY_EXPRESSION = (
+    f"min({int(settings.JOB_RETRY_MAX_DELAY_SECONDS * 1000)}, "
+    f"pow(2, retried) * {int(settings.JOB_RETRY_BASE_DELAY_SECONDS * 1000)})"
+)
+
+
+class QStashJobBackend:
+    """Publishes jobs to QStash, which delivers them to the signed worker
+    endpoint and owns retries/backoff.
+
+    Deduplication is left to the queue's Redis state key: a QStash dedup id
+    would drop the re-publish of a key freed after a failed run.
+    """
+
+    def __init__(self, client: AsyncQStash, worker_url: str) -> None:
+        self._client = client
+        self._worker_url = worker_url
+
+    async def publish(self, job: Job) -> None:
+        response = await self._client.message.publish_json(
+            url=self._worker_url,
+            body=job.model_dump(mode="json"),
+            retries=settings.JOB_MAX_RETRIES,
+            retry_delay=_RETRY_DELAY_EXPRESSION,
+            flow_control={
+                "key": job.kind,
+                "parallelism": settings.JOB_WORKER_CONCURRENCY,
+            },
+        )
+        logger.info(
+            "Published job {key} to QStash: {response}", key=job.key, response=response
+        )
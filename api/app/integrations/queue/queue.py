@@ -0,0 +1,138 @@
+import asyncio
+import socket
+import uuid
+from functools import lru_cache
+
+from redis import asyncio as aioredis
+
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.integrations.queue.base import (
+    Job,
+    JobBackend,
+    JobHandler,
+    JobState,
+    PermanentJobError,
+)
+from app.integrations.queue.qstash_backend import QStashJobBackend
+from app.integrations.queue.redis_backend import RedisStreamJobBackend
+from app.integrations.redis.store import get_redis_store
+from app.integrations.upstash.qstash import get_async_qstash_client
+
+logger = get_logger("queue")
+
+
+class JobQueue:
+    """Backend-agnostic job queue with idempotent keys and bounded concurrency.
+
+    ``jobs:state:{key}`` makes enqueueing idempotent (one live job per key) and
+    ``jobs:lease:{key}`` guarantees a single worker runs a job at a time, which
+    covers QStash at-least-once delivery and reclaimed Redis stream entries.
+    """
+
+    def __init__(
+        self, backend: JobBackend, redis: "aioredis.Redis[str]", concurrency: int
+    ) -> None:
+        self.backend = backend
+        self._redis = redis
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def enqueue(self, job: Job) -> bool:
+        """Publish ``job`` unless a job with the same key is queued, running
+        or already done. Returns whether it was published."""
+        claimed = await self._redis.set(
+            self._state_key(job.key),
+            JobState.QUEUED.value,
+            nx=True,
+            ex=settings.JOB_KEY_TTL_SECONDS,
+        )
+        if not claimed:
+            logger.info("Job {key} already enqueued, skipping", key=job.key)
+            return False
+
+        try:
+            await self.backend.publish(job)
+        except Exception:
+            await self._redis.delete(self._state_key(job.key))
+            raise
+        return True
+
+    async def get_state(self, key: str) -> JobState | None:
+        state = await self._redis.get(self._state_key(key))
+        return JobState(state) if state else None
+
+    async def process(
+        self, job: Job, handler: JobHandler, is_final_attempt: bool
+    ) -> None:
+        """Run ``handler`` for one delivery of ``job``. Raises on failure so the
+        backend can retry; a final or permanent failure frees the key for
+        re-enqueueing."""
+        if await self.get_state(job.key) == JobState.DONE:
+            logger.info("Job {key} already done, skipping", key=job.key)
+            return
+
+        async with self._semaphore:
+            leased = await self._redis.set(
+                self._lease_key(job.key),
+                "1",
+                nx=True,
+                ex=settings.JOB_VISIBILITY_TIMEOUT_SECONDS,
+            )
+            if not leased:
+                logger.info("Job {key} is running elsewhere, skipping", key=job.key)
+                return
+
+            try:
+                await self._set_state(job.key, JobState.RUNNING)
+                await handler(job)
+            except PermanentJobError as e:
+                logger.warning(
+                    "Job {key} failed permanently, not retrying: {error}",
+                    key=job.key,
+                    error=str(e),
+                )
+                await self._redis.delete(self._state_key(job.key))
+            except Exception:
+                if is_final_attempt:
+                    await self._redis.delete(self._state_key(job.key))
+                else:
+                    await self._set_state(job.key, JobState.QUEUED)
+                raise
+            else:
+                await self._set_state(job.key, JobState.DONE)
+            finally:
+                await self._redis.delete(self._lease_key(job.key))
+
+    async def renew_lease(self, key: str) -> None:
+        """Extend a running job's lease; long handlers call this periodically so
+        the job is not picked up again while still running."""
+        await self._redis.expire(
+            self._lease_key(key), settings.JOB_VISIBILITY_TIMEOUT_SECONDS
+        )
+
+    async def _set_state(self, key: str, state: JobState) -> None:
+        await self._redis.set(
+            self._state_key(key), state.value, ex=settings.JOB_KEY_TTL_SECONDS
+        )
+
+    @staticmethod
+    def _state_key(key: str) -> str:
+        return f"jobs:state:{key}"
+
+    @staticmethod
+    def _lease_key(key: str) -> str:
+        return f"jobs:lease:{key}"
+
+
+@lru_cache(maxsize=1)
+def get_job_queue() -> JobQueue:
+    redis = get_redis_store()
+    backend: JobBackend
+    if settings.JOB_QUEUE_BACKEND == "redis":
+        consumer = f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+        backend = RedisStreamJobBackend(redis, consumer=consumer)
+    else:
+        backend = QStashJobBackend(
+            get_async_qstash_client(), worker_url=settings.get_job_worker_url()
+        )
+    return JobQueue(backend, redis, concurrency=settings.JOB_WORKER_CONCURRENCY)
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import cast
+
+from redis import asyncio as aioredis
+from redis.exceptions import ResponseError
+
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.integrations.queue.base import Job, retry_delay_seconds
+
+logger = get_logger("queue.redis")
+
+JobProcessor = Callable[[Job, bool], Awaitable[None]]
+
+
+class RedisStreamJobBackend:
+    """Local stand-in for QStash built on a Redis stream + consumer group.
+
+    Failed jobs are parked in a sorted set until their backoff elapses and then
+    re-added to the stream; jobs left pending by a crashed worker are reclaimed
+    after ``JOB_VISIBILITY_TIMEOUT_SECONDS``. Exhausted jobs go to ``jobs:dead``.
+    """
+
+    stream = "jobs:stream"
+    delayed = "jobs:delayed"
+    dead = "jobs:dead"
+    group = "workers"
+
+    def __init__(self, redis: "aioredis.Redis[str]", consumer: str) -> None:
+        self._redis = redis
+        self._consumer = consumer
+
+    async def publish(self, job: Job) -> None:
+        await self._redis.xadd(self.stream, {"job": job.model_dump_json()})
+
+    async def run_worker(self, process: JobProcessor, concurrency: int) -> None:
+        await self._ensure_group()
+        logger.info(
+            "Redis job worker {consumer} started (concurrency={concurrency})",
+            consumer=self._consumer,
+            concurrency=concurrency,
+        )
+        in_flight: set[asyncio.Task[None]] = set()
+        try:
+            while True:
+                await self._promote_due_retries()
+
+                in_flight = {task for task in in_flight if not task.done()}
+                free = concurrency - len(in_flight)
+                if free <= 0:
+                    await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                for message_id, fields in await self._next_messages(free):
+                    in_flight.add(
+                        asyncio.create_task(self._handle(message_id, fields, process))
+                    )
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    async def _ensure_group(self) -> None:
+        try:
+            await self._redis.xgroup_create(
+                self.stream, self.group, id="0", mkstream=True
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _next_messages(self, count: int) -> list[tuple[str, dict[str, str]]]:
+        # Reclaim work abandoned by crashed workers before taking new work
+        reclaimed = await self._redis.xautoclaim(
+            self.stream,
+            self.group,
+            self._consumer,
+            min_idle_time=settings.JOB_VISIBILITY_TIMEOUT_SECONDS * 1000,
+            count=count,
+        )
+        claimed: list[tuple[str, dict[str, str]]] = reclaimed[1]
+        if claimed:
+            return claimed
+
+        response = await self._redis.xreadgroup(
+            self.group, self._consumer, {self.stream: ">"}, count=count, block=1000
+        )
+        return [message for _, messages in response for message in messages]
+
+    async def _handle(
+        self, message_id: str, fields: dict[str, str], process: JobProcessor
+    ) -> None:
+        job = Job.model_validate_json(fields["job"])
+        is_final_attempt = job.attempt >= settings.JOB_MAX_RETRIES
+        try:
+            await process(job, is_final_attempt)
+        except Exception:
+            if is_final_attempt:
+                logger.exception("Job {key} exhausted its retries", key=job.key)
+                await self._redis.xadd(self.dead, {"job": job.model_dump_json()})
+            else:
+                delay = retry_delay_seconds(job.attempt)
+                logger.warning(
+                    "Job {key} failed, retrying in {delay:.1f}s",
+                    key=job.key,
+                    delay=delay,
+                )
+                retry = job.model_copy(update={"attempt": job.attempt + 1})
+                await self._redis.zadd(
+                    self.delayed, {retry.model_dump_json(): time.time() + delay}
+                )
+        finally:
+            await self._ack(message_id)
+
+    async def _ack(self, message_id: str) -> None:
+        # types-redis leaves xack untyped
+        xack = cast(Callable[[str, str, str], Awaitable[int]], self._redis.xack)
+        await xack(self.stream, self.group, message_id)
+
+    async def _promote_due_retries(self) -> None:
+        due = await self._redis.zrangebyscore(self.delayed, "-inf", time.time())
+        for raw_job in due:
+            # Only the worker that wins the ZREM re-publishes the job
+            if await self._redis.zrem(self.delayed, raw_job):
+                await self._redis.xadd(self.stream, {"job": raw_job})
@@ -0,0 +1,92 @@
+import json
+import time
+from typing import Any
+
+from redis import asyncio as aioredis
+
+from app.core.logging.logger import get_logger
+from app.integrations.redis.store import get_redis_store
+
+logger = get_logger("redis.cache")
+
+
+class RedisLRUCache:
+    """Best-effort JSON cache with a per-entry TTL and LRU eviction.
+
+    Entries live under ``{namespace}:{key}``; a sorted set ``{namespace}:lru``
+    scored by last access time keeps the namespace bounded to ``max_entries``
+    independently of the server's ``maxmemory-policy``. Redis errors are logged
+    and treated as a miss so callers never fail because the cache is down.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: int,
+        max_entries: int,
+        redis: "aioredis.Redis[str] | None" = None,
+    ) -> None:
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._redis = redis
+
+    @property
+    def redis(self) -> "aioredis.Redis[str]":
+        return self._redis or get_redis_store()
+
+    @property
+    def _index(self) -> str:
+        return f"{self.namespace}:lru"
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Any | None:
+        try:
+            raw = await self.redis.getex(self._key(key), ex=self.ttl_seconds)
+            if raw is None:
+                await self.redis.zrem(self._index, key)
+                return None
+            await self.redis.zadd(self._index, {key: time.time()})
+            return json.loads(raw)
+        except Exception as e:
+            logger.warning(
+                "Cache get failed for {key}: {error}", key=self._key(key), error=str(e)
+            )
+            return None
+
+    async def set(self, key: str, value: Any) -> None:
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.set(self._key(key), json.dumps(value), ex=self.ttl_seconds)
+            pipe.zadd(self._index, {key: time.time()})
+            pipe.zcard(self._index)
+            *_, size = await pipe.execute()
+            if size > self.max_entries:
+                await self._evict(size - self.max_entries)
+        except Exception as e:
+            logger.warning(
+                "Cache set failed for {key}: {error}", key=self._key(key), error=str(e)
+            )
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self.redis.delete(self._key(key))
+            await self.redis.zrem(self._index, key)
+        except Exception as e:
+            logger.warning(
+                "Cache delete failed for {key}: {error}",
+                key=self._key(key),
+                error=str(e),
+            )
+
+    async def _evict(self, count: int) -> None:
+        victims = await self.redis.zpopmin(self._index, count)
+        if victims:
+            await self.redis.delete(*(self._key(member) for member, _ in victims))
+            logger.info(
+                "Evicted {count} entries from {namespace}",
+                count=len(victims),
+                namespace=self.namespace,
+            )
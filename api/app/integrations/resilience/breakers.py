@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitBreakerStats
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class Dependency:
+    gemini = "gemini"
+    doc_to_pdf = "doc_to_pdf"  # Gotenberg
+    supabase = "supabase"
+    browser_use = "browser_use"
+
+
+_REQUEST_TIMEOUT = 408
+
+
+def _timeout_seconds(dependency: str) -> float:
+    return {
+        Dependency.gemini: settings.GEMINI_CALL_TIMEOUT_SECONDS,
+        Dependency.doc_to_pdf: settings.DOC_TO_PDF_TOTAL_TIMEOUT_SECONDS,
+        Dependency.supabase: settings.SUPABASE_TIMEOUT_SECONDS,
+        Dependency.browser_use: settings.BROWSER_USE_TIMEOUT_SECONDS,
+    }[dependency]
+
+
+def is_dependency_failure(error: BaseException) -> bool:
+    """Timeouts, transport errors and 5xx count against a dependency; any other
+    4xx (a missing object, a bad document, a 429 the caller retries) means it
+    answered, so it doesn't."""
+    response = getattr(error, "response", None)
+    candidates = (
+        getattr(error, "status_code", None),
+        getattr(error, "code", None),
+        getattr(error, "status", None),
+        getattr(response, "status_code", None),
+    )
+    status = next((c for c in candidates if c is not None), None)
+    try:
+        status = int(status) if status is not None else None
+    except (TypeError, ValueError):
+        status = None
+    if status is None:
+        return True
+    return not 400 <= status < 500 or status == _REQUEST_TIMEOUT  # noqa: PLR2004
+
+
+class CircuitBreakerRegistry:
+    """One breaker per dependency, or per dependency scope (a Gemini model).
+
+    Breakers are per process: each worker decides on its own what it sees.
+    """
+
+    def __init__(self) -> None:
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(
+        self,
+        dependency: str,
+        scope: str | None = None,
+        *,
+        timeout_seconds: float | None = None,
+    ) -> CircuitBreaker:
+        """The breaker for ``dependency`` (and ``scope``), created on first use
+        with ``timeout_seconds`` or the dependency's configured timeout."""
+        name = f"{dependency}:{scope}" if scope else dependency
+        breaker = self._breakers.get(name)
+        if not breaker:
+            breaker = self._breakers[name] = CircuitBreaker(
+                name,
+                timeout_seconds=timeout_seconds or _timeout_seconds(dependency),
+                failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+                reset_seconds=settings.CIRCUIT_RESET_SECONDS,
+                half_open_probes=settings.CIRCUIT_HALF_OPEN_PROBES,
+                is_failure=is_dependency_failure,
+            )
+        return breaker
+
+    def stats(self) -> list[CircuitBreakerStats]:
+        return [breaker.stats() for breaker in self._breakers.values()]
+
+
+@lru_cache(maxsize=1)
+def get_circuit_breaker_registry() -> CircuitBreakerRegistry:
+    return CircuitBreakerRegistry()
+
+
+def get_circuit_breaker(
+    dependency: str, scope: str | None = None, *, timeout_seconds: float | None = None
+) -> CircuitBreaker:
+    return get_circuit_breaker_registry().get(
+        dependency, scope, timeout_seconds=timeout_seconds
+    )
@@ -1,14 +1,37 @@
 import mimetypes
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import Path
+from typing import TypeVar
 
 from app.core.config import settings
+from app.integrations.http.client import HttpUpstream, get_http_client
+from app.integrations.resilience.breakers import Dependency, get_circuit_breaker
 from supabase import AsyncClient, create_async_client
 
+T = TypeVar("T")
+
 
 async def get_supabase_client() -> AsyncClient:
     return await create_async_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
 
 
-async def upload_file_to_supabase(file_content: bytes, file_name: str) -> str:
+async def upload_file_to_supabase(file_path: str, file_name: str) -> str:
+    return await get_circuit_breaker(Dependency.supabase).call(
+        lambda: _upload(file_path, file_name)
+    )
+
+
+async def stream_file_from_supabase(
+    file_name: str, consume: Callable[[AsyncIterator[bytes]], Awaitable[T]]
+) -> T:
+    """Hand the object's bytes to ``consume`` as they arrive instead of
+    buffering them. Raises ``httpx.HTTPStatusError`` when it does not exist."""
+    return await get_circuit_breaker(Dependency.supabase).call(
+        lambda: _stream(file_name, consume)
+    )
+
+
+async def _upload(file_path: str, file_name: str) -> str:
     supabase = await get_supabase_client()
     bucket_name = settings.SUPABASE_BUCKET
 
@@ -17,10 +40,14 @@ async def upload_file_to_supabase(file_content: bytes, file_name: str) -> str:
     if not content_type:
         content_type = "application/octet-stream"
 
-    # Upload file
-    await supabase.storage.from_(bucket_name).upload(
-        path=file_name, file=file_content, file_options={"content-type": content_type}
-    )
+    # Upload file (streamed from disk rather than buffered in memory)
+    with Path(file_path).open("rb") as file:  # noqa: ASYNC230 - local temp file
+        await supabase.storage.from_(bucket_name).upload(
+            path=file_name,
+            file=file,
+            # Paths are content-addressed, so overwriting is always safe
+            file_options={"content-type": content_type, "upsert": "true"},
+        )
 
     return await supabase.storage.from_(bucket_name).get_public_url(file_name)
 
@@ -30,3 +57,17 @@ async def upload_file_to_supabase(file_content: bytes, file_name: str) -> str:
     # )
 
     # return sign_url_res["signedUrl"]
+
+
+async def _stream(
+    file_name: str, consume: Callable[[AsyncIterator[bytes]], Awaitable[T]]
+) -> T:
+    supabase = await get_supabase_client()
+    url = await supabase.storage.from_(settings.SUPABASE_BUCKET).get_public_url(
+        file_name
+    )
+    # The storage client only downloads whole objects; the public URL streams
+    client = get_http_client(HttpUpstream.resume_download)
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()
+        return await consume(response.aiter_bytes(settings.RESUME_CHUNK_BYTES))
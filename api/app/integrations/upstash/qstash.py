@@ -1,6 +1,7 @@
 from collections.abc import Generator
 from functools import lru_cache
 
+from qstash.asyncio.client import AsyncQStash
 from qstash.client import QStash
 from qstash.receiver import Receiver
 
@@ -20,6 +21,14 @@ def get_qstash_client() -> Generator[QStash, None, None]:
     yield client
 
 
+@lru_cache
+def get_async_qstash_client() -> AsyncQStash:
+    """
+    Shared non-blocking QStash client used by the job queue.
+    """
+    return AsyncQStash(settings.QSTASH_TOKEN)
+
+
 @lru_cache
 def _get_consumer() -> Receiver:
     return Receiver(
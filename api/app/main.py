@@ -1,5 +1,7 @@
+import asyncio
+import math
 from collections.abc import AsyncGenerator, Callable
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from typing import Any
 
 from fastapi import FastAPI, Request, Response
@@ -8,18 +10,39 @@ from scalar_fastapi import get_scalar_api_reference
 
 from app.api.v1.api import api_router
 from app.api.v1.dto import ResponseEnvelope
+from app.core.circuit_breaker import CircuitOpenError
 from app.core.config import settings
 from app.core.logging.middleware import request_id_middleware
-from app.integrations.db.database import connect_to_postgres
+from app.integrations.db.database import async_engine, connect_to_postgres
+from app.integrations.http.client import get_http_client_registry
+from app.integrations.llm.caches import get_gemini_context_cache_manager
+from app.integrations.llm.files import get_gemini_file_manager
+from app.integrations.llm.gemini import get_gemini_client
 from app.integrations.redis.store import connect_to_redis
+from app.modules.jdmatch.jobs import run_jdmatch_worker
 
 
 @asynccontextmanager
 async def server_lifespan(app: FastAPI) -> AsyncGenerator[None, None]:  # noqa: ARG001
     connect_to_postgres()
     await connect_to_redis()
+    get_http_client_registry().open()
+
+    worker = None
+    if settings.JOB_QUEUE_BACKEND == "redis" and settings.JOB_WORKER_ENABLED:
+        worker = asyncio.create_task(run_jdmatch_worker())
+
     yield
 
+    if worker:
+        worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await worker
+    await get_gemini_file_manager().close(get_gemini_client())
+    await get_gemini_context_cache_manager().close(get_gemini_client())
+    await get_http_client_registry().close()
+    await async_engine.dispose()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -46,6 +69,19 @@ async def middleware(request: Request, call_next: Callable[[Request], Any]) -> R
 app.include_router(api_router, prefix="/api/v1")
 
 
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(_: Request, exc: CircuitOpenError) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+        content=ResponseEnvelope(
+            success=False,
+            data=None,
+            error=[str(exc)],
+        ).model_dump(),
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(_: Request, exc: Exception):
     return JSONResponse(
@@ -3,7 +3,8 @@ import json
 from google import genai
 from google.genai import types
 
-from app.integrations.llm.gemini import GeminiModel
+from app.integrations.llm.limiter import get_gemini_governor
+from app.integrations.llm.models import GeminiModel
 from app.modules.jdmatch.schemas import AgentResponseJDVerification
 
 _ai_so_type = genai.types.Schema(
@@ -64,9 +65,9 @@ def _prompt(text: str) -> str:
     """
 
 
-def agent_analyze_jd_text_structure(
+async def agent_analyze_jd_text_structure(
     text: str, gemini_client: genai.Client | None = None
-) -> str:
+) -> AgentResponseJDVerification:
     if not gemini_client:
         raise ValueError("Gemini client is not available")
 
@@ -88,16 +89,15 @@ def agent_analyze_jd_text_structure(
         safety_settings=_safety_settings,
     )
 
-    response = gemini_client.models.generate_content(
-        model=GeminiModel.flash,
-        contents=contents,
-        config=generate_content_config,
+    response = await get_gemini_governor().call(
+        GeminiModel.flash,
+        lambda: gemini_client.aio.models.generate_content(
+            model=GeminiModel.flash,
+            contents=contents,
+            config=generate_content_config,
+        ),
+        hedge=True,
     )
 
     data = json.loads(response.text)
-    agent_response = AgentResponseJDVerification(**data)
-
-    if not agent_response.is_jd:
-        raise ValueError(agent_response.reason)
-
-    return text
+    return AgentResponseJDVerification(**data)
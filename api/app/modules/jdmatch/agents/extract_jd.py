@@ -1,9 +1,11 @@
 import json
+from typing import Any
 
 from browser_use_sdk import AsyncBrowserUse
 
 from app.core.logging.logger import get_logger
-from app.integrations.llm.gemini import GeminiModel
+from app.integrations.llm.models import GeminiModel
+from app.integrations.resilience.breakers import Dependency, get_circuit_breaker
 
 logger = get_logger("extract_jd.agent")
 
@@ -42,13 +44,14 @@ async def agent_extract_jd(browser_use_client: AsyncBrowserUse, jd_url: str) ->
 
     logger.info("Navigating to {jd_url}", jd_url=jd_url)
 
-    task = await browser_use_client.tasks.create_task(
-        task=_browsing_prompt(jd_url),
-        llm=GeminiModel.pro,  # Default model
-    )
+    async def run_task() -> Any:
+        task = await browser_use_client.tasks.create_task(
+            task=_browsing_prompt(jd_url),
+            llm=GeminiModel.pro,  # Default model
+        )
+        return await task.complete()
 
-    # Run the blocking task completion in a separate thread
-    result = await task.complete()
+    result = await get_circuit_breaker(Dependency.browser_use).call(run_task)
 
     extracted = result.output
 
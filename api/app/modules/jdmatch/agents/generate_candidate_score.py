@@ -1,39 +1,25 @@
-from collections.abc import AsyncGenerator, Generator
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
 
 from google import genai
 from google.genai import types
 
+from app.core.config import settings
 from app.core.logging.logger import get_logger
-from app.integrations.llm.gemini import GeminiModel
-from app.modules.jdmatch.schemas import (
-    AgentResponseCandidateScore,
-    AgentResponseStructuredScore,
+from app.core.streaming_json import (
+    JsonFieldEvent,
+    JsonItemEvent,
+    JsonTextEvent,
+    StreamingJsonParser,
 )
+from app.integrations.llm.caches import get_gemini_context_cache_manager
+from app.integrations.llm.limiter import get_gemini_governor
+from app.integrations.llm.models import GeminiModel
+from app.modules.jdmatch.schemas import AgentResponseStructuredScore
 
 logger = get_logger("generate_candidate_score.agent")
 
 
-_ai_so_type = genai.types.Schema(
-    type=genai.types.Type.OBJECT,
-    required=["score", "matching_skills", "missing_skills", "explanation"],
-    properties={
-        "score": genai.types.Schema(
-            type=genai.types.Type.INTEGER,
-        ),
-        "matching_skills": genai.types.Schema(
-            type=genai.types.Type.ARRAY,
-            items=genai.types.Schema(type=genai.types.Type.STRING),
-        ),
-        "missing_skills": genai.types.Schema(
-            type=genai.types.Type.ARRAY,
-            items=genai.types.Schema(type=genai.types.Type.STRING),
-        ),
-        "explanation": genai.types.Schema(
-            type=genai.types.Type.STRING,
-        ),
-    },
-)
-
 _safety_settings = [
     types.SafetySetting(
         category=types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
@@ -54,86 +40,6 @@ _safety_settings = [
 ]
 
 
-def _prompt(jd: str) -> str:
-    return f"""
-      You are an ATS machine that judges candidates based on JDs provided to you.
-      Below is the JD of the job.
-
-      {jd}
-
-      Do these following tasks taking reference from the above JD and file input:
-
-      > Analyze the candidate resume given as an input
-      > Check if the candidate is fit for the job or not.
-      > Rate the candidate based on the below structure.
-
-      Note: assess the score logic in this manner -> score < 40 = POOR, score > 40 && score < 70 = AVERAGE, score > 70 && score < 90 = GOOD, score > 90 = GREAT
-
-      IMPORTANT: YOUR RESPONSE MUST BE A VALID JSON OBJECT MATCHING THE SCHEMA.
-      DO NOT INCLUDE ANY MARKDOWN FORMATTING (like ```json).
-    """
-
-
-def agent_generate_candidate_score(
-    jd: str, resume_path: str, gemini_client: genai.Client | None = None
-) -> AgentResponseCandidateScore:
-    if not gemini_client:
-        raise ValueError("Gemini client is not available")
-
-    # Upload file to Gemini
-    file = gemini_client.files.upload(file=resume_path)
-
-    generate_content_config = types.GenerateContentConfig(
-        response_mime_type="application/json",
-        response_schema=_ai_so_type,
-        safety_settings=_safety_settings,
-    )
-
-    response = gemini_client.models.generate_content(
-        model=GeminiModel.flash,
-        contents=[file, _prompt(jd)],
-        config=generate_content_config,
-    )
-
-    # Clean up uploaded file from Gemini (optional but recommended)
-    gemini_client.files.delete(name=file.name)
-
-    _llm_response = response.text
-    _candidate_score = AgentResponseCandidateScore.model_validate_json(_llm_response)
-    logger.success("Response from Gemini: %s", _candidate_score)
-    return _candidate_score
-
-
-async def agent_stream_candidate_score(
-    jd: str, resume_path: str, gemini_client: genai.Client | None = None
-) -> AsyncGenerator[str, None]:
-    if not gemini_client:
-        raise ValueError("Gemini client is not available")
-
-    # Upload file to Gemini
-    file = gemini_client.files.upload(file=resume_path)
-
-    generate_content_config = types.GenerateContentConfig(
-        response_mime_type="application/json",
-        response_schema=_ai_so_type,
-        safety_settings=_safety_settings,
-    )
-
-    stream = gemini_client.models.generate_content_stream(
-        model=GeminiModel.flash,
-        contents=[file, _prompt(jd)],
-        config=generate_content_config,
-    )
-
-    for chunk in stream:
-        if chunk.text:
-            logger.info("Chunk from Gemini: %s", chunk.text)
-            yield chunk.text
-
-    # Clean up uploaded file from Gemini
-    gemini_client.files.delete(name=file.name)
-
-
 _ai_structured_score_type = genai.types.Schema(
     type=genai.types.Type.OBJECT,
     required=["score", "matching_skills", "missing_skills"],
@@ -151,14 +57,12 @@ _ai_structured_score_type = genai.types.Schema(
 )
 
 
-def _structured_prompt(jd: str) -> str:
-    return f"""
+_STRUCTURED_SYSTEM_INSTRUCTION = """
       You are an ATS machine that judges candidates based on JDs provided to you.
-      Below is the JD of the job.
+      The JD of the job comes first, followed by the candidate resume (as a file or as
+      its extracted text).
 
-      {jd}
-
-      Do these following tasks taking reference from the above JD and file input:
+      Do these following tasks taking reference from the JD and the resume:
 
       > Analyze the candidate resume given as an input
       > Check if the candidate is fit for the job or not.
@@ -172,89 +76,341 @@ def _structured_prompt(jd: str) -> str:
       DO NOT INCLUDE ANY MARKDOWN FORMATTING (like ```json).
     """
 
+_EXPLANATION_SYSTEM_INSTRUCTION = """
+      You are an ATS machine that judges candidates based on JDs provided to you.
+      The JD of the job comes first, followed by the candidate resume (as a file or as
+      its extracted text) and the score you already gave it.
 
-def _explanation_prompt(
-    jd: str, score: int, matching_skills: list[str], missing_skills: list[str]
-) -> str:
+      Write a detailed explanation of why the candidate received this score.
+      Cover their strengths, weaknesses, and areas for improvement relative to the JD.
+      Write in plain text paragraphs, NOT JSON.
+    """
+
+# The Gemini upload of a resume PDF, or its locally extracted text
+ResumeInput = types.File | str
+
+_STRUCTURED_PROMPT = "Score the candidate resume above against the JD."
+
+
+def _jd_context(jd: str) -> str:
     return f"""
-      You are an ATS machine that judges candidates based on JDs provided to you.
       Below is the JD of the job.
 
       {jd}
+    """
 
+
+def _resume_part(resume: ResumeInput) -> types.File | str:
+    if isinstance(resume, str):
+        return f"""
+      Below is the candidate resume, extracted from the PDF.
+
+      {resume}
+    """
+    return resume
+
+
+def _explanation_prompt(
+    score: int, matching_skills: list[str], missing_skills: list[str]
+) -> str:
+    return f"""
       You have already scored this candidate's resume:
       - Score: {score}
       - Matching Skills: {", ".join(matching_skills)}
       - Missing Skills: {", ".join(missing_skills)}
 
-      Now write a detailed explanation of why the candidate received this score.
-      Cover their strengths, weaknesses, and areas for improvement relative to the JD.
-      Write in plain text paragraphs, NOT JSON.
+      Now explain the score.
     """
 
 
-def agent_generate_structured_score(
-    jd: str, resume_path: str, gemini_client: genai.Client | None = None
-) -> AgentResponseStructuredScore:
-    if not gemini_client:
-        raise ValueError("Gemini client is not available")
+def _inline_prefix(
+    system_instruction: str,
+    jd: str,
+    contents: list[types.File | str],
+    config: types.GenerateContentConfig,
+) -> tuple[list[types.File | str], types.GenerateContentConfig]:
+    return [_jd_context(jd), *contents], config.model_copy(
+        update={"system_instruction": system_instruction}
+    )
+
+
+async def _with_prefix(
+    gemini_client: genai.Client,
+    model: str,
+    system_instruction: str,
+    jd: str,
+    contents: list[types.File | str],
+    config: types.GenerateContentConfig,
+) -> tuple[list[types.File | str], types.GenerateContentConfig]:
+    """Put the system instruction and JD in front of ``contents``: through a
+    Gemini context cache when the prefix is big enough, inline otherwise."""
+    cached_content = await get_gemini_context_cache_manager().acquire(
+        gemini_client, model, system_instruction, _jd_context(jd)
+    )
+    if not cached_content:
+        return _inline_prefix(system_instruction, jd, contents, config)
+    return contents, config.model_copy(update={"cached_content": cached_content})
 
-    file = gemini_client.files.upload(file=resume_path)
 
-    generate_content_config = types.GenerateContentConfig(
+def _structured_score_config() -> types.GenerateContentConfig:
+    return types.GenerateContentConfig(
         response_mime_type="application/json",
         response_schema=_ai_structured_score_type,
         safety_settings=_safety_settings,
     )
 
-    response = gemini_client.models.generate_content(
-        model=GeminiModel.flash,
-        contents=[file, _structured_prompt(jd)],
-        config=generate_content_config,
+
+def parse_structured_score(response_text: str | None) -> AgentResponseStructuredScore:
+    if not response_text:
+        raise ValueError("Empty structured score response from Gemini")
+    return AgentResponseStructuredScore.model_validate_json(response_text)
+
+
+async def agent_generate_structured_score(
+    jd: str,
+    resume: ResumeInput,
+    gemini_client: genai.Client | None = None,
+    model: str = GeminiModel.flash,
+) -> AgentResponseStructuredScore:
+    if not gemini_client:
+        raise ValueError("Gemini client is not available")
+
+    contents, config = await _with_prefix(
+        gemini_client,
+        model,
+        _STRUCTURED_SYSTEM_INSTRUCTION,
+        jd,
+        [_resume_part(resume), _STRUCTURED_PROMPT],
+        _structured_score_config(),
+    )
+    response = await get_gemini_governor().call(
+        model,
+        lambda: gemini_client.aio.models.generate_content(
+            model=model,
+            contents=contents,
+            config=config,
+        ),
+        hedge=True,
     )
 
-    _llm_response = response.text
-    result = AgentResponseStructuredScore.model_validate_json(_llm_response)
+    result = parse_structured_score(response.text)
     logger.success("Structured score from Gemini: %s", result)
 
-    # Keep the uploaded file for explanation streaming (caller cleans up)
-    gemini_client.files.delete(name=file.name)
-
+    # An uploaded file is shared with explanation streaming (GeminiFileManager)
     return result
 
 
-def agent_stream_explanation(
+@dataclass
+class RoutedScore:
+    structured_score: AgentResponseStructuredScore
+    # The model whose score this is; it also writes the explanation
+    model: str
+
+
+def needs_escalation(score: int) -> bool:
+    """Borderline scores, where a stronger model is worth the cost."""
+    return (
+        settings.SCORE_ESCALATION_ENABLED
+        and settings.SCORE_ESCALATION_MIN <= score <= settings.SCORE_ESCALATION_MAX
+    )
+
+
+async def agent_route_structured_score(
+    jd: str, resume: ResumeInput, gemini_client: genai.Client | None = None
+) -> RoutedScore:
+    """Pre-screen with ``SCORE_PRESCREEN_MODEL``; a borderline score is thrown
+    away and the resume scored again by ``SCORE_ESCALATION_MODEL``."""
+    model = settings.SCORE_PRESCREEN_MODEL
+    result = await agent_generate_structured_score(jd, resume, gemini_client, model)
+    if needs_escalation(result.score):
+        logger.info(
+            "Escalating borderline score {score} from {prescreen} to {model}",
+            score=result.score,
+            prescreen=model,
+            model=settings.SCORE_ESCALATION_MODEL,
+        )
+        model = settings.SCORE_ESCALATION_MODEL
+        result = await agent_generate_structured_score(jd, resume, gemini_client, model)
+    return RoutedScore(structured_score=result, model=model)
+
+
+def build_structured_score_request(
+    jd: str, resume: ResumeInput, metadata: dict[str, str]
+) -> types.InlinedRequest:
+    """The same request as ``agent_generate_structured_score``, packed for the
+    Gemini Batch API; ``metadata`` comes back on the matching response.
+
+    The JD goes inline: a batch may run after a context cache has expired.
+    """
+    contents, config = _inline_prefix(
+        _STRUCTURED_SYSTEM_INSTRUCTION,
+        jd,
+        [_resume_part(resume), _STRUCTURED_PROMPT],
+        _structured_score_config(),
+    )
+    return types.InlinedRequest(
+        model=settings.SCORE_PRESCREEN_MODEL,
+        contents=contents,
+        config=config,
+        metadata=metadata,
+    )
+
+
+async def agent_stream_explanation(
     jd: str,
-    resume_path: str,
+    resume: ResumeInput,
     structured_result: AgentResponseStructuredScore,
     gemini_client: genai.Client | None = None,
-) -> Generator[str, None, None]:
+    model: str = GeminiModel.flash,
+) -> AsyncGenerator[str, None]:
     if not gemini_client:
         raise ValueError("Gemini client is not available")
 
-    file = gemini_client.files.upload(file=resume_path)
-
-    generate_content_config = types.GenerateContentConfig(
-        response_mime_type="text/plain",
-        safety_settings=_safety_settings,
-    )
-
     prompt = _explanation_prompt(
-        jd,
         structured_result.score,
         structured_result.matching_skills,
         structured_result.missing_skills,
     )
+    contents, config = await _with_prefix(
+        gemini_client,
+        model,
+        _EXPLANATION_SYSTEM_INSTRUCTION,
+        jd,
+        [_resume_part(resume), prompt],
+        types.GenerateContentConfig(
+            response_mime_type="text/plain",
+            safety_settings=_safety_settings,
+        ),
+    )
 
-    stream = gemini_client.models.generate_content_stream(
-        model=GeminiModel.flash,
-        contents=[file, prompt],
-        config=generate_content_config,
+    stream = get_gemini_governor().stream(
+        model,
+        lambda: gemini_client.aio.models.generate_content_stream(
+            model=model,
+            contents=contents,
+            config=config,
+        ),
     )
 
-    for chunk in stream:
+    async for chunk in stream:
         if chunk.text:
             logger.info("Explanation chunk from Gemini: %s", chunk.text)
             yield chunk.text
 
-    gemini_client.files.delete(name=file.name)
+
+_ai_scored_explanation_type = genai.types.Schema(
+    type=genai.types.Type.OBJECT,
+    required=["score", "matching_skills", "missing_skills", "explanation"],
+    # The structured fields must come first so they can be used before the
+    # explanation has finished streaming
+    property_ordering=["score", "matching_skills", "missing_skills", "explanation"],
+    properties={
+        "score": genai.types.Schema(type=genai.types.Type.INTEGER),
+        "matching_skills": genai.types.Schema(
+            type=genai.types.Type.ARRAY,
+            items=genai.types.Schema(type=genai.types.Type.STRING),
+        ),
+        "missing_skills": genai.types.Schema(
+            type=genai.types.Type.ARRAY,
+            items=genai.types.Schema(type=genai.types.Type.STRING),
+        ),
+        "explanation": genai.types.Schema(type=genai.types.Type.STRING),
+    },
+)
+
+_SCORED_EXPLANATION_SYSTEM_INSTRUCTION = """
+      You are an ATS machine that judges candidates based on JDs provided to you.
+      The JD of the job comes first, followed by the candidate resume (as a file or as
+      its extracted text).
+
+      Do these following tasks taking reference from the JD and the resume:
+
+      > Analyze the candidate resume given as an input
+      > Check if the candidate is fit for the job or not.
+      > Rate the candidate based on the below structure.
+
+      Note: assess the score logic in this manner -> score < 40 = POOR, score > 40 && score < 70 = AVERAGE, score > 70 && score < 90 = GOOD, score > 90 = GREAT
+
+      Return the score, matching_skills and missing_skills, then an explanation:
+      a detailed explanation of why the candidate received this score, covering
+      their strengths, weaknesses, and areas for improvement relative to the JD,
+      written in plain text paragraphs.
+      IMPORTANT: YOUR RESPONSE MUST BE A VALID JSON OBJECT MATCHING THE SCHEMA.
+      DO NOT INCLUDE ANY MARKDOWN FORMATTING (like ```json).
+    """
+
+_SCORED_EXPLANATION_PROMPT = (
+    "Score the candidate resume above against the JD and explain the score."
+)
+
+_STRUCTURED_FIELDS = ("score", "matching_skills", "missing_skills")
+
+# What the single-call stream yields: each score field and skill as it closes,
+# the whole structured score, then explanation text
+ScoredExplanationPart = (
+    JsonFieldEvent | JsonItemEvent | AgentResponseStructuredScore | str
+)
+
+
+async def agent_stream_scored_explanation(
+    jd: str,
+    resume: ResumeInput,
+    gemini_client: genai.Client | None = None,
+    model: str = GeminiModel.flash,
+) -> AsyncGenerator[ScoredExplanationPart, None]:
+    """Score and explain in one streaming call: yields the parse events of the
+    score fields (every skill as it arrives), the structured score once its
+    fields are complete, then the explanation text as it streams."""
+    if not gemini_client:
+        raise ValueError("Gemini client is not available")
+
+    contents, config = await _with_prefix(
+        gemini_client,
+        model,
+        _SCORED_EXPLANATION_SYSTEM_INSTRUCTION,
+        jd,
+        [_resume_part(resume), _SCORED_EXPLANATION_PROMPT],
+        types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=_ai_scored_explanation_type,
+            safety_settings=_safety_settings,
+        ),
+    )
+
+    stream = get_gemini_governor().stream(
+        model,
+        lambda: gemini_client.aio.models.generate_content_stream(
+            model=model,
+            contents=contents,
+            config=config,
+        ),
+    )
+
+    parser = StreamingJsonParser(text_fields={"explanation"})
+    structured_score: AgentResponseStructuredScore | None = None
+    pending: list[str] = []
+    async for chunk in stream:
+        if not chunk.text:
+            continue
+        for event in parser.feed(chunk.text):
+            if isinstance(event, JsonTextEvent):
+                pending.append(event.text)
+            elif event.key in _STRUCTURED_FIELDS:
+                yield event
+        if structured_score is None and all(
+            field in parser.fields for field in _STRUCTURED_FIELDS
+        ):
+            structured_score = AgentResponseStructuredScore.model_validate(
+                parser.fields
+            )
+            logger.success("Structured score from Gemini: %s", structured_score)
+            yield structured_score
+        if structured_score is not None and pending:
+            yield "".join(pending)
+            pending.clear()
+
+    fields = parser.close()
+    if structured_score is None:
+        yield AgentResponseStructuredScore.model_validate(fields)
+        if pending:
+            yield "".join(pending)
@@ -0,0 +1,123 @@
+import asyncio
+import os
+import shutil
+import tempfile
+from collections.abc import AsyncIterator
+from functools import lru_cache
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.core.single_flight import SingleFlight
+from app.integrations.supabase.storage import (
+    stream_file_from_supabase,
+    upload_file_to_supabase,
+)
+from app.modules.jdmatch.schemas import SpooledResume
+from app.modules.jdmatch.utils.cleanup_file import cleanup_file
+from app.modules.jdmatch.utils.doc_to_pdf import doc_to_pdf
+from app.modules.jdmatch.utils.spool_resume import spool_resume
+
+logger = get_logger("jdmatch.cache.conversion_cache")
+
+
+class ConversionCache:
+    """DOC/DOCX -> PDF conversions keyed by the source document's SHA-256.
+
+    Lookups go local disk (LRU by mtime, ``max_entries`` files) -> Supabase
+    (``conversions/{hash}.pdf``) -> Gotenberg. Concurrent requests for the
+    same document share one fill through ``SingleFlight``.
+    """
+
+    def __init__(self, directory: str, max_entries: int) -> None:
+        self._directory = Path(directory)
+        self._max_entries = max_entries
+        self._flight: SingleFlight[None] = SingleFlight()
+
+    async def get_or_convert(self, source: SpooledResume) -> SpooledResume:
+        """Return the converted PDF as a fresh spool file owned by the caller."""
+        key = source.content_hash
+        cached_path = self._local_path(key)
+        if cached_path.exists():
+            logger.info("Conversion cache hit (disk) for {hash}", hash=key)
+            cached_path.touch()
+        else:
+            await self._flight.do(key, lambda: self._fill(source))
+
+        # Hand out a copy so LRU eviction never pulls a file from under a caller
+        return await spool_resume(
+            _iter_file(cached_path), f"{Path(source.filename).stem}.pdf"
+        )
+
+    async def _fill(self, source: SpooledResume) -> None:
+        key = source.content_hash
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+        if await self._fill_from_remote(key):
+            logger.info("Conversion cache hit (supabase) for {hash}", hash=key)
+        else:
+            converted = await doc_to_pdf(source.path)
+            await asyncio.to_thread(self._install, key, converted.path)
+            try:
+                await upload_file_to_supabase(
+                    str(self._local_path(key)), _remote_name(key)
+                )
+            except Exception as e:
+                logger.warning(
+                    "Failed to store conversion {hash} in Supabase: {error}",
+                    hash=key,
+                    error=str(e),
+                )
+        await asyncio.to_thread(self._evict)
+
+    async def _fill_from_remote(self, key: str) -> bool:
+        try:
+            # Spooled like any download, so memory stays flat whatever the size
+            converted = await stream_file_from_supabase(
+                _remote_name(key), lambda chunks: spool_resume(chunks, f"{key}.pdf")
+            )
+        except Exception:
+            return False
+
+        await asyncio.to_thread(self._install, key, converted.path)
+        return True
+
+    def _install(self, key: str, path: str) -> None:
+        # Move-then-rename inside the cache dir so readers (possibly other
+        # workers sharing the dir) never see a partially written file
+        fd, staging_path = tempfile.mkstemp(dir=self._directory, suffix=".part")
+        os.close(fd)
+        shutil.move(path, staging_path)
+        Path(staging_path).replace(self._local_path(key))
+
+    def _evict(self) -> None:
+        entries = sorted(
+            self._directory.glob("*.pdf"), key=lambda path: path.stat().st_mtime
+        )
+        for path in entries[: max(0, len(entries) - self._max_entries)]:
+            cleanup_file(str(path))
+
+    def _local_path(self, key: str) -> Path:
+        return self._directory / f"{key}.pdf"
+
+
+def _remote_name(key: str) -> str:
+    return f"conversions/{key}.pdf"
+
+
+async def _iter_file(path: Path) -> AsyncIterator[bytes]:
+    # Reads go to a thread so a slow disk never blocks the event loop
+    file = await asyncio.to_thread(path.open, "rb")
+    try:
+        while chunk := await asyncio.to_thread(file.read, settings.RESUME_CHUNK_BYTES):
+            yield chunk
+    finally:
+        file.close()
+
+
+@lru_cache(maxsize=1)
+def get_conversion_cache() -> ConversionCache:
+    return ConversionCache(
+        settings.CONVERSION_CACHE_DIR,
+        max_entries=settings.CONVERSION_CACHE_MAX_ENTRIES,
+    )
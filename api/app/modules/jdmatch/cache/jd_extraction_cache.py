@@ -0,0 +1,57 @@
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.integrations.redis.cache import RedisLRUCache
+from app.integrations.redis.store import get_redis_store
+from app.modules.jdmatch.utils.canonicalize_jd_url import canonicalize_jd_url
+
+logger = get_logger("jdmatch.cache.jd_extraction_cache")
+
+_jd_extraction_cache = RedisLRUCache(
+    namespace="jdmatch:jd_extract",
+    ttl_seconds=settings.JD_EXTRACTION_CACHE_TTL_SECONDS,
+    max_entries=settings.JD_EXTRACTION_CACHE_MAX_ENTRIES,
+)
+
+
+async def get_cached_jd_extraction(jd_url: str) -> str | None:
+    cached = await _jd_extraction_cache.get(canonicalize_jd_url(jd_url))
+    if cached:
+        logger.info("JD extraction cache hit for {jd_url}", jd_url=jd_url)
+    return cached
+
+
+async def extract_jd_once(jd_url: str, extract: Callable[[], Awaitable[str]]) -> str:
+    """Run ``extract`` under a Redis lock per canonical URL, so concurrent
+    requests across workers share one browser task; waiters then read the
+    cached text. If the lock cannot be taken (timeout, Redis down) we extract
+    anyway rather than fail the analysis."""
+    key = canonicalize_jd_url(jd_url)
+    lock = get_redis_store().lock(
+        f"{_jd_extraction_cache.namespace}:lock:{key}",
+        timeout=settings.JD_EXTRACTION_LOCK_TIMEOUT_SECONDS,
+        blocking_timeout=settings.JD_EXTRACTION_LOCK_TIMEOUT_SECONDS,
+    )
+    try:
+        acquired = await lock.acquire()
+    except Exception as e:
+        logger.warning("JD extraction lock failed for {key}: {error}", key=key, error=e)
+        acquired = False
+
+    try:
+        if acquired:
+            cached: str | None = await _jd_extraction_cache.get(key)
+            if cached:
+                logger.info("JD extracted by another worker for {key}", key=key)
+                return cached
+
+        jd = await extract()
+        await _jd_extraction_cache.set(key, jd)
+        return jd
+    finally:
+        if acquired:
+            # The lock may have expired under a very slow extraction
+            with suppress(Exception):
+                await lock.release()
@@ -0,0 +1,29 @@
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.integrations.redis.cache import RedisLRUCache
+from app.modules.jdmatch.schemas import AgentResponseJDVerification
+from app.modules.jdmatch.utils.compute_jd_fingerprint import compute_jd_fingerprint
+
+logger = get_logger("jdmatch.cache.jd_verdict_cache")
+
+_jd_verdict_cache = RedisLRUCache(
+    namespace="jdmatch:jd_verdict",
+    ttl_seconds=settings.JD_VERDICT_CACHE_TTL_SECONDS,
+    max_entries=settings.JD_VERDICT_CACHE_MAX_ENTRIES,
+)
+
+
+async def get_cached_jd_verdict(jd_text: str) -> AgentResponseJDVerification | None:
+    cached = await _jd_verdict_cache.get(compute_jd_fingerprint(jd_text))
+    if not cached:
+        return None
+    logger.info("JD verdict cache hit")
+    return AgentResponseJDVerification.model_validate(cached)
+
+
+async def set_cached_jd_verdict(
+    jd_text: str, verdict: AgentResponseJDVerification
+) -> None:
+    await _jd_verdict_cache.set(
+        compute_jd_fingerprint(jd_text), verdict.model_dump(mode="json")
+    )
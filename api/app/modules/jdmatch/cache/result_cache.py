@@ -0,0 +1,55 @@
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.integrations.redis.cache import RedisLRUCache
+from app.modules.jdmatch.constants import SCORE_PROMPT_VERSION
+from app.modules.jdmatch.schemas import CachedJdMatchResult
+from app.modules.jdmatch.utils.compute_jd_fingerprint import compute_jd_fingerprint
+
+logger = get_logger("jdmatch.cache.result_cache")
+
+_result_cache = RedisLRUCache(
+    namespace="jdmatch:result",
+    ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+    max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+)
+
+
+def _routing_policy() -> str:
+    """Which models can produce a result; changing the routing invalidates it."""
+    if settings.ANALYSIS_MODE == "single_call":
+        return settings.get_single_call_model()
+    if not settings.SCORE_ESCALATION_ENABLED:
+        return settings.SCORE_PRESCREEN_MODEL
+    return (
+        f"{settings.SCORE_PRESCREEN_MODEL}>{settings.SCORE_ESCALATION_MODEL}"
+        f"@{settings.SCORE_ESCALATION_MIN}-{settings.SCORE_ESCALATION_MAX}"
+    )
+
+
+def _result_cache_key(resume_hash: str, jd_info: str) -> str:
+    return ":".join(
+        (
+            resume_hash,
+            compute_jd_fingerprint(jd_info),
+            _routing_policy(),
+            SCORE_PROMPT_VERSION,
+        )
+    )
+
+
+async def get_cached_result(
+    resume_hash: str, jd_info: str
+) -> CachedJdMatchResult | None:
+    cached = await _result_cache.get(_result_cache_key(resume_hash, jd_info))
+    if not cached:
+        return None
+    logger.info("Result cache hit for resume {hash}", hash=resume_hash)
+    return CachedJdMatchResult.model_validate(cached)
+
+
+async def set_cached_result(
+    resume_hash: str, jd_info: str, result: CachedJdMatchResult
+) -> None:
+    await _result_cache.set(
+        _result_cache_key(resume_hash, jd_info), result.model_dump(mode="json")
+    )
@@ -0,0 +1,32 @@
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.integrations.redis.cache import RedisLRUCache
+from app.modules.jdmatch.constants import RESUME_TEXT_VERSION
+from app.modules.jdmatch.schemas import ParsedResume
+
+logger = get_logger("jdmatch.cache.resume_text_cache")
+
+_resume_text_cache = RedisLRUCache(
+    namespace="jdmatch:resume_text",
+    ttl_seconds=settings.RESUME_TEXT_CACHE_TTL_SECONDS,
+    max_entries=settings.RESUME_TEXT_CACHE_MAX_ENTRIES,
+)
+
+
+def _resume_text_cache_key(resume_hash: str) -> str:
+    return f"{resume_hash}:{RESUME_TEXT_VERSION}"
+
+
+async def get_cached_resume_text(resume_hash: str) -> ParsedResume | None:
+    cached = await _resume_text_cache.get(_resume_text_cache_key(resume_hash))
+    if not cached:
+        return None
+    logger.info("Resume text cache hit for {hash}", hash=resume_hash)
+    return ParsedResume.model_validate(cached)
+
+
+async def set_cached_resume_text(resume_hash: str, parsed: ParsedResume) -> None:
+    # Scanned PDFs are cached too, so they aren't re-parsed on every analysis
+    await _resume_text_cache.set(
+        _resume_text_cache_key(resume_hash), parsed.model_dump(mode="json")
+    )
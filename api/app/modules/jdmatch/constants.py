@@ -14,6 +14,97 @@ SUPPORTED_TYPES = [
 
 DEFAULT_FILENAME = "downloaded_resume.pdf"
 
+# Query params that never change which job posting a URL points at
+JD_URL_TRACKING_PARAMS = frozenset(
+    {
+        "fbclid",
+        "gclid",
+        "gh_src",
+        "lever-origin",
+        "lever-source",
+        "lipi",
+        "mc_cid",
+        "mc_eid",
+        "msclkid",
+        "ref",
+        "refid",
+        "source",
+        "src",
+        "trackingid",
+        "trk",
+        "trkinfo",
+    }
+)
+LINKEDIN_JOB_ID_PATTERN = r"/jobs/view/(?:[^/]*?-)?(\d+)/?$"
+GREENHOUSE_JOB_PATTERN = r"^/([^/]+)/jobs/(\d+)"
+
+# Section headings (lowercased, without a trailing colon) that show up in
+# nearly every job posting; the local pre-classifier only counts them when they
+# stand on a line of their own, so prose that merely mentions them (e.g. a
+# resume listing "responsibilities") does not skip the Gemini verification
+JD_SECTION_HEADINGS = frozenset(
+    {
+        "about the role",
+        "about the job",
+        "about you",
+        "benefits",
+        "job description",
+        "job type",
+        "nice to have",
+        "preferred qualifications",
+        "qualifications",
+        "requirements",
+        "responsibilities",
+        "salary",
+        "what we offer",
+        "what you'll do",
+        "what you will do",
+    }
+)
+JD_CONFIDENT_MIN_WORDS = 80
+JD_CONFIDENT_MIN_HEADINGS = 3
+
+# Bump whenever the scoring/explanation prompts change so cached results for
+# the old prompts are no longer served.
+SCORE_PROMPT_VERSION = "v2"
+
+ANALYZE_JOB = "jdmatch_analyze"
+RANK_JOB = "jdmatch_rank"
+
+RANKING_ZIP_RESUME_SUFFIXES = (".pdf", ".doc", ".docx")
+
+# Resume section headings (lowercased, without a trailing colon) mapped to the
+# name they get in the compact text sent to Gemini
+RESUME_SECTION_HEADINGS = {
+    "summary": "Summary",
+    "profile": "Summary",
+    "professional summary": "Summary",
+    "about me": "Summary",
+    "objective": "Summary",
+    "experience": "Experience",
+    "work experience": "Experience",
+    "professional experience": "Experience",
+    "employment history": "Experience",
+    "work history": "Experience",
+    "education": "Education",
+    "skills": "Skills",
+    "technical skills": "Skills",
+    "core competencies": "Skills",
+    "projects": "Projects",
+    "personal projects": "Projects",
+    "certifications": "Certifications",
+    "certificates": "Certifications",
+    "awards": "Awards",
+    "achievements": "Awards",
+    "publications": "Publications",
+    "languages": "Languages",
+    "volunteering": "Volunteering",
+    "volunteer experience": "Volunteering",
+    "interests": "Interests",
+}
+# Bump whenever extraction changes so cached resume text is re-parsed
+RESUME_TEXT_VERSION = "v1"
+
 
 class JdMatchStatus(Enum):
     PARSING = "warming_up"  # was PARSING
@@ -22,5 +113,7 @@ class JdMatchStatus(Enum):
     EXTRACTING = "combing"  # was EXTRACTING
     ANALYZING = "pondering"  # was ANALYZING
     THINKING = "cooking"  # was THINKING
+    # Scored. Offline and ranking runs leave ``explanation`` empty; /analyze
+    # fills it in
     MATCHED = "locked_in"  # was MATCHED
     FAILED = "fumbled"  # was FAILED
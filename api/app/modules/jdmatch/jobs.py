@@ -0,0 +1,146 @@
+from contextlib import aclosing
+from functools import partial
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.v1.dto.jdmatch import (
+    ErrorEvent,
+    JdMatchJobResponse,
+    RankingJobResponse,
+)
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.integrations.browser_use.agent import get_browser_use_client
+from app.integrations.db.database import async_session_factory
+from app.integrations.db.models import RankingJob
+from app.integrations.llm.gemini import get_gemini_client
+from app.integrations.queue.base import Job, PermanentJobError
+from app.integrations.queue.queue import get_job_queue
+from app.integrations.queue.redis_backend import RedisStreamJobBackend
+from app.modules.jdmatch.constants import ANALYZE_JOB, RANK_JOB, JdMatchStatus
+from app.modules.jdmatch.progress import (
+    analyze_job_key,
+    reset_analysis_events,
+    set_analysis_status,
+)
+from app.modules.jdmatch.ranking import run_ranking_job
+from app.modules.jdmatch.repo import get_jd_match_by_jd_match_id
+from app.modules.jdmatch.service import run_jd_match_analysis
+
+logger = get_logger("jdmatch.jobs")
+
+
+async def enqueue_jd_match_analysis(
+    jd_match_id: str, _db_session: AsyncSession
+) -> JdMatchJobResponse:
+    logger.info("enqueueing analysis for {jd_match_id}", jd_match_id=jd_match_id)
+
+    jd_record = await get_jd_match_by_jd_match_id(_db_session, jd_match_id)
+    if not jd_record:
+        raise ValueError(f"No record found for jd_match_id: {jd_match_id}")
+
+    job = Job(
+        kind=ANALYZE_JOB,
+        key=analyze_job_key(jd_match_id),
+        payload={"jd_match_id": jd_match_id},
+    )
+    enqueued = await get_job_queue().enqueue(job)
+    if enqueued:
+        await set_analysis_status(jd_match_id, JdMatchStatus.QUEUED)
+
+    return JdMatchJobResponse(
+        jd_match_id=jd_record.id, job_key=job.key, enqueued=enqueued
+    )
+
+
+async def enqueue_ranking_job(ranking_job: RankingJob) -> RankingJobResponse:
+    logger.info(
+        "enqueueing ranking job {ranking_job_id}", ranking_job_id=ranking_job.id
+    )
+    job = Job(
+        kind=RANK_JOB,
+        key=f"{RANK_JOB}:{ranking_job.id}",
+        payload={"ranking_job_id": str(ranking_job.id)},
+    )
+    enqueued = await get_job_queue().enqueue(job)
+    return RankingJobResponse(
+        ranking_job_id=ranking_job.id,
+        job_key=job.key,
+        enqueued=enqueued,
+        total=ranking_job.total,
+    )
+
+
+async def process_jdmatch_job(job: Job, is_final_attempt: bool) -> None:
+    handler = partial(_handle_jdmatch_job, is_final_attempt=is_final_attempt)
+    await get_job_queue().process(job, handler, is_final_attempt)
+
+
+async def run_jdmatch_worker() -> None:
+    """Consume jobs in-process when running on the Redis-streams backend.
+    With QStash, jobs arrive through the signed /jdmatch/consumer endpoint."""
+    backend = get_job_queue().backend
+    if not isinstance(backend, RedisStreamJobBackend):
+        return
+    await backend.run_worker(
+        process_jdmatch_job, concurrency=settings.JOB_WORKER_CONCURRENCY
+    )
+
+
+async def _handle_jdmatch_job(job: Job, is_final_attempt: bool) -> None:
+    if job.kind == ANALYZE_JOB:
+        await _handle_analyze_job(job, is_final_attempt)
+    elif job.kind == RANK_JOB:
+        await _handle_rank_job(job)
+    else:
+        raise ValueError(f"Unknown job kind: {job.kind}")
+
+
+async def _handle_analyze_job(job: Job, is_final_attempt: bool) -> None:
+    jd_match_id = job.payload["jd_match_id"]
+    logger.info(
+        "running analysis job for {jd_match_id} (attempt {attempt})",
+        jd_match_id=jd_match_id,
+        attempt=job.attempt,
+    )
+    # Closed explicitly so the analysis lease is released before a retry runs
+    async with (
+        async_session_factory() as session,
+        aclosing(
+            run_jd_match_analysis(
+                jd_match_id, get_gemini_client(), session, get_browser_use_client()
+            )
+        ) as events,
+    ):
+        # run_jd_match_analysis reports failures as events (followed by the
+        # stop events, which attached clients need to see)
+        error: ErrorEvent | None = None
+        async for _, event_data, _ in events:
+            if isinstance(event_data, ErrorEvent):
+                error = event_data
+
+    # Surface the failure so the queue backend retries the job, unless a retry
+    # can't help
+    if not error:
+        return
+    if not error.retryable:
+        raise PermanentJobError(error.message)
+    if not is_final_attempt:
+        await reset_analysis_events(jd_match_id)
+        await set_analysis_status(jd_match_id, JdMatchStatus.QUEUED)
+    raise ValueError(error.message)
+
+
+async def _handle_rank_job(job: Job) -> None:
+    ranking_job_id = job.payload["ranking_job_id"]
+    logger.info(
+        "running ranking job {ranking_job_id} (attempt {attempt})",
+        ranking_job_id=ranking_job_id,
+        attempt=job.attempt,
+    )
+    await run_ranking_job(
+        ranking_job_id,
+        get_gemini_client(),
+        get_browser_use_client(),
+        heartbeat=lambda: get_job_queue().renew_lease(job.key),
+    )
@@ -0,0 +1,359 @@
+import asyncio
+import uuid
+from dataclasses import dataclass
+
+from browser_use_sdk import AsyncBrowserUse
+from google import genai
+from google.genai import types
+
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.integrations.db.database import async_session_factory
+from app.integrations.db.models import JDMatchDtl
+from app.integrations.llm.batches import create_batch, wait_for_batch
+from app.modules.jdmatch.agents.generate_candidate_score import (
+    build_structured_score_request,
+    parse_structured_score,
+)
+from app.modules.jdmatch.cache.result_cache import get_cached_result
+from app.modules.jdmatch.constants import JdMatchStatus
+from app.modules.jdmatch.progress import set_analysis_status
+from app.modules.jdmatch.repo import (
+    get_jd_match_by_jd_match_id,
+    save_jd_match_info,
+    update_jd_info,
+    update_jd_match_status,
+    update_jd_match_statuses,
+)
+from app.modules.jdmatch.schemas import AgentResponseStructuredScore
+from app.modules.jdmatch.service import acquire_resume_input, resolve_jd
+from app.modules.jdmatch.utils.cleanup_file import cleanup_file
+from app.modules.jdmatch.utils.download_resume import download_resume
+from app.modules.jdmatch.utils.is_jd_link_or_description import (
+    is_jd_link_or_description,
+)
+
+logger = get_logger("jdmatch.offline_scoring")
+
+_RUNNING_BATCH_STATES = frozenset(
+    {types.JobState.JOB_STATE_PENDING, types.JobState.JOB_STATE_RUNNING}
+)
+
+
+@dataclass
+class _BatchItem:
+    jd_match_id: str
+    request: types.InlinedRequest
+
+
+@dataclass
+class OfflineBatch:
+    name: str
+    jd_match_ids: list[str]
+
+
+async def submit_offline_scoring(
+    jd_matches: list[JDMatchDtl],
+    gemini_client: genai.Client,
+    browser_use_client: AsyncBrowserUse | None = None,
+) -> list[OfflineBatch]:
+    """Pack the structured-score request of every record into Gemini batch
+    jobs, at most ``OFFLINE_BATCH_MAX_REQUESTS`` per job.
+
+    Each distinct JD is resolved once. Records whose JD is invalid or whose
+    resume can't be fetched fail straight away; records with a cached result
+    are saved without going through the batch. Everything submitted is left
+    QUEUED until ``collect_offline_scoring`` picks the results up.
+    """
+    jds = await _resolve_offline_jds(jd_matches, gemini_client, browser_use_client)
+    semaphore = asyncio.Semaphore(settings.OFFLINE_BATCH_PREPARE_CONCURRENCY)
+
+    async def prepare(jd_match: JDMatchDtl) -> _BatchItem | None:
+        jd_info = jd_match.jd or ""
+        jd = jds.get(jd_info)
+        if not jd:
+            return None
+        async with semaphore:
+            return await _prepare_batch_item(jd_match, jd_info, jd, gemini_client)
+
+    prepared = await asyncio.gather(*(prepare(item) for item in jd_matches))
+    batch_items = [item for item in prepared if item]
+
+    batches = []
+    chunk_size = settings.OFFLINE_BATCH_MAX_REQUESTS
+    for start in range(0, len(batch_items), chunk_size):
+        chunk = batch_items[start : start + chunk_size]
+        batch_job = await create_batch(
+            gemini_client,
+            settings.SCORE_PRESCREEN_MODEL,
+            [item.request for item in chunk],
+            display_name=f"jdmatch-score-{uuid.uuid4().hex[:8]}",
+        )
+        if not batch_job.name:
+            raise ValueError("Gemini batch job was created without a name")
+        batches.append(
+            OfflineBatch(
+                name=batch_job.name,
+                jd_match_ids=[item.jd_match_id for item in chunk],
+            )
+        )
+
+    logger.info(
+        "submitted {count} of {total} records in {batches} Gemini batches",
+        count=len(batch_items),
+        total=len(jd_matches),
+        batches=len(batches),
+    )
+    return batches
+
+
+async def collect_offline_scoring(
+    batch_name: str,
+    gemini_client: genai.Client,
+    jd_match_ids: list[str] | None = None,
+) -> None:
+    """Wait for a batch job, then save each response onto its record.
+
+    Records move to PROCESSING once Gemini starts the job and end up MATCHED
+    (score only, ``explanation`` left empty) or FAILED. ``jd_match_ids`` defaults to the ids in the batch's request
+    metadata, so a run can be resumed by batch name from another process.
+    """
+
+    async def on_update(batch_job: types.BatchJob) -> None:
+        if batch_job.state in _RUNNING_BATCH_STATES:
+            await _set_statuses(
+                jd_match_ids or _batch_jd_match_ids(batch_job),
+                JdMatchStatus.PROCESSING,
+            )
+
+    batch_job = await wait_for_batch(
+        gemini_client, batch_name, settings.OFFLINE_BATCH_POLL_SECONDS, on_update
+    )
+    responses = (
+        batch_job.dest.inlined_responses
+        if batch_job.dest and batch_job.dest.inlined_responses
+        else []
+    )
+    if not responses:
+        logger.error(
+            "Gemini batch {batch_name} ended as {state} without responses: {error}",
+            batch_name=batch_name,
+            state=batch_job.state,
+            error=batch_job.error,
+        )
+        await _set_statuses(
+            jd_match_ids or _batch_jd_match_ids(batch_job), JdMatchStatus.FAILED
+        )
+        return
+
+    counts = {JdMatchStatus.MATCHED: 0, JdMatchStatus.FAILED: 0}
+    for response in responses:
+        jd_match_id = (response.metadata or {}).get("jd_match_id")
+        if not jd_match_id:
+            logger.warning(
+                "Gemini batch {batch_name} returned an unlabelled response",
+                batch_name=batch_name,
+            )
+            continue
+        status = await _save_batch_response(jd_match_id, response)
+        counts[status] += 1
+
+    logger.info(
+        "Gemini batch {batch_name} collected: {matched} matched, {failed} failed",
+        batch_name=batch_name,
+        matched=counts[JdMatchStatus.MATCHED],
+        failed=counts[JdMatchStatus.FAILED],
+    )
+
+
+async def score_offline(
+    jd_matches: list[JDMatchDtl],
+    gemini_client: genai.Client,
+    browser_use_client: AsyncBrowserUse | None = None,
+) -> list[OfflineBatch]:
+    """Submit every record and wait for all batches to finish. A batch that
+    can't be collected fails its own records without stopping the others."""
+    batches = await submit_offline_scoring(
+        jd_matches, gemini_client, browser_use_client
+    )
+    await asyncio.gather(*(_collect_batch(batch, gemini_client) for batch in batches))
+    return batches
+
+
+async def _collect_batch(batch: OfflineBatch, gemini_client: genai.Client) -> None:
+    try:
+        await collect_offline_scoring(batch.name, gemini_client, batch.jd_match_ids)
+    except Exception:
+        logger.exception(
+            "Error collecting Gemini batch {batch_name}", batch_name=batch.name
+        )
+        await _set_statuses(batch.jd_match_ids, JdMatchStatus.FAILED)
+
+
+async def _resolve_offline_jds(
+    jd_matches: list[JDMatchDtl],
+    gemini_client: genai.Client,
+    browser_use_client: AsyncBrowserUse | None,
+) -> dict[str, str]:
+    """Resolve each distinct ``jd`` once; records with an invalid JD fail."""
+    by_jd_info: dict[str, list[str]] = {}
+    for jd_match in jd_matches:
+        by_jd_info.setdefault(jd_match.jd or "", []).append(str(jd_match.id))
+
+    jds: dict[str, str] = {}
+    failed_ids: list[str] = []
+    for jd_info, jd_match_ids in by_jd_info.items():
+        if not jd_info:
+            failed_ids += jd_match_ids
+            continue
+        try:
+            jds[jd_info] = await resolve_jd(
+                jd_info,
+                is_jd_link_or_description(jd_info),
+                gemini_client,
+                browser_use_client,
+            )
+        except ValueError as e:
+            logger.warning(
+                "skipping {count} records with an invalid JD: {error}",
+                count=len(jd_match_ids),
+                error=str(e),
+            )
+            failed_ids += jd_match_ids
+
+    await _set_statuses(failed_ids, JdMatchStatus.FAILED)
+    return jds
+
+
+async def _prepare_batch_item(
+    jd_match: JDMatchDtl, jd_info: str, jd: str, gemini_client: genai.Client
+) -> _BatchItem | None:
+    jd_match_id = str(jd_match.id)
+    if not jd_match.resume_url:
+        logger.warning("{jd_match_id} has no resume URL", jd_match_id=jd_match_id)
+        await _set_statuses([jd_match_id], JdMatchStatus.FAILED)
+        return None
+
+    resume = None
+    try:
+        resume, _ = await download_resume(jd_match.resume_url)
+
+        # Keyed on the JD as entered, like an online analysis of this record
+        cached_result = await get_cached_result(resume.content_hash, jd_info)
+        if cached_result:
+            await _save_score(
+                jd_match_id,
+                jd,
+                cached_result.structured_score,
+                cached_result.explanation,
+                cached_result.model,
+            )
+            return None
+
+        # The batch reads the upload long after this returns, so the reference
+        # is kept until the file manager is closed at the end of the run
+        resume_input = await acquire_resume_input(resume, gemini_client)
+        async with async_session_factory() as session:
+            await update_jd_info(
+                session, jd_match_id, jd, returning=False, commit=False
+            )
+            await update_jd_match_status(
+                session, jd_match_id, JdMatchStatus.QUEUED.value, returning=False
+            )
+        await set_analysis_status(jd_match_id, JdMatchStatus.QUEUED)
+        return _BatchItem(
+            jd_match_id=jd_match_id,
+            request=build_structured_score_request(
+                jd, resume_input, {"jd_match_id": jd_match_id}
+            ),
+        )
+    except Exception:
+        logger.exception(
+            "Error preparing {jd_match_id} for offline scoring",
+            jd_match_id=jd_match_id,
+        )
+        await _set_statuses([jd_match_id], JdMatchStatus.FAILED)
+        return None
+    finally:
+        if resume:
+            cleanup_file(resume.path)
+
+
+async def _save_batch_response(
+    jd_match_id: str, response: types.InlinedResponse
+) -> JdMatchStatus:
+    if response.error:
+        logger.error(
+            "Gemini batch request for {jd_match_id} failed: {error}",
+            jd_match_id=jd_match_id,
+            error=response.error,
+        )
+        await _set_statuses([jd_match_id], JdMatchStatus.FAILED)
+        return JdMatchStatus.FAILED
+
+    try:
+        structured_result = parse_structured_score(
+            response.response.text if response.response else None
+        )
+        async with async_session_factory() as session:
+            jd_match = await get_jd_match_by_jd_match_id(session, jd_match_id)
+        # Offline scoring only produces the pre-screen score; explanations (and
+        # escalation of borderline scores) come from /analyze
+        await _save_score(
+            jd_match_id,
+            jd_match.jd if jd_match else None,
+            structured_result,
+            None,
+            settings.SCORE_PRESCREEN_MODEL,
+        )
+    except Exception:
+        logger.exception(
+            "Error saving batch result for {jd_match_id}", jd_match_id=jd_match_id
+        )
+        await _set_statuses([jd_match_id], JdMatchStatus.FAILED)
+        return JdMatchStatus.FAILED
+    return JdMatchStatus.MATCHED
+
+
+async def _save_score(
+    jd_match_id: str,
+    jd: str | None,
+    structured_result: AgentResponseStructuredScore,
+    explanation: str | None,
+    model: str | None,
+) -> None:
+    if not jd:
+        raise ValueError(f"No JD found for jd_match_id: {jd_match_id}")
+    async with async_session_factory() as session:
+        await save_jd_match_info(
+            session,
+            jd_match_id=jd_match_id,
+            jd=jd,
+            score_data={
+                "score": structured_result.score,
+                "matching_skills": structured_result.matching_skills,
+                "missing_skills": structured_result.missing_skills,
+                "explanation": explanation,
+                "model": model,
+            },
+        )
+    await set_analysis_status(jd_match_id, JdMatchStatus.MATCHED)
+
+
+async def _set_statuses(jd_match_ids: list[str], status: JdMatchStatus) -> None:
+    if not jd_match_ids:
+        return
+    async with async_session_factory() as session:
+        await update_jd_match_statuses(session, jd_match_ids, status.value)
+    for jd_match_id in jd_match_ids:
+        await set_analysis_status(jd_match_id, status)
+
+
+def _batch_jd_match_ids(batch_job: types.BatchJob) -> list[str]:
+    """Record ids a batch was created for, read from its request metadata."""
+    requests = batch_job.src.inlined_requests if batch_job.src else None
+    return [
+        request.metadata["jd_match_id"]
+        for request in requests or []
+        if request.metadata and "jd_match_id" in request.metadata
+    ]
@@ -0,0 +1,199 @@
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from datetime import UTC, datetime
+
+from app.api.v1.dto.jdmatch import (
+    AnalysisDeltaEvent,
+    AnalysisStartEvent,
+    AnalysisStopEvent,
+    ContentBlockDeltaEvent,
+    ContentBlockStartEvent,
+    ContentBlockStopEvent,
+    ErrorEvent,
+    SSEEvent,
+    SSEEventType,
+    StatusUpdateEvent,
+)
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.integrations.queue.base import JobState
+from app.integrations.queue.queue import get_job_queue
+from app.integrations.redis.store import get_redis_store
+from app.modules.jdmatch.constants import ANALYZE_JOB, JdMatchStatus
+
+logger = get_logger("jdmatch.progress")
+
+_EVENT_MODELS: dict[SSEEventType, type[SSEEvent]] = {
+    SSEEventType.ANALYSIS_START: AnalysisStartEvent,
+    SSEEventType.STATUS_UPDATE: StatusUpdateEvent,
+    SSEEventType.CONTENT_BLOCK_START: ContentBlockStartEvent,
+    SSEEventType.CONTENT_BLOCK_DELTA: ContentBlockDeltaEvent,
+    SSEEventType.CONTENT_BLOCK_STOP: ContentBlockStopEvent,
+    SSEEventType.ANALYSIS_DELTA: AnalysisDeltaEvent,
+    SSEEventType.ANALYSIS_STOP: AnalysisStopEvent,
+    SSEEventType.ERROR: ErrorEvent,
+}
+
+
+def _state_key(jd_match_id: str) -> str:
+    return f"jdmatch:{jd_match_id}:state"
+
+
+def _events_key(jd_match_id: str) -> str:
+    return f"jdmatch:{jd_match_id}:events"
+
+
+def _lease_key(jd_match_id: str) -> str:
+    return f"jdmatch:{jd_match_id}:lease"
+
+
+async def set_analysis_status(jd_match_id: str, status: JdMatchStatus) -> None:
+    redis = get_redis_store()
+    await redis.hset(
+        _state_key(jd_match_id),
+        mapping={"status": status.value, "updated_at": datetime.now(UTC).isoformat()},
+    )
+    await redis.expire(_state_key(jd_match_id), settings.PROGRESS_TTL_SECONDS)
+
+
+async def get_analysis_status(jd_match_id: str) -> JdMatchStatus | None:
+    status = await get_redis_store().hget(_state_key(jd_match_id), "status")
+    return JdMatchStatus(status) if status else None
+
+
+def analyze_job_key(jd_match_id: str) -> str:
+    return f"{ANALYZE_JOB}:{jd_match_id}"
+
+
+async def acquire_analysis_lease(jd_match_id: str) -> bool:
+    """Claim the right to run the analysis; exactly one runner per jd_match_id."""
+    acquired = await get_redis_store().set(
+        _lease_key(jd_match_id), "1", nx=True, ex=settings.PROGRESS_LEASE_SECONDS
+    )
+    if acquired:
+        # A fresh run starts a fresh event log
+        await get_redis_store().delete(_events_key(jd_match_id))
+    return bool(acquired)
+
+
+async def reset_analysis_events(jd_match_id: str) -> None:
+    """Drop a failed attempt's event log once its retry is scheduled, so clients
+    attaching during the backoff wait for the next attempt instead of
+    replaying the failure."""
+    await get_redis_store().delete(_events_key(jd_match_id))
+
+
+async def release_analysis_lease(jd_match_id: str) -> None:
+    await get_redis_store().delete(_lease_key(jd_match_id))
+
+
+@asynccontextmanager
+async def analysis_lease_heartbeat(jd_match_id: str) -> AsyncIterator[None]:
+    """Keep the runner's lease alive for as long as the run is. Events renew it
+    too, but a run can go quiet for longer than a lease (Gemini backoff,
+    retries) and a second runner would then reset the event log."""
+
+    async def beat() -> None:
+        while True:
+            await asyncio.sleep(settings.PROGRESS_LEASE_SECONDS / 3)
+            try:
+                await get_redis_store().expire(
+                    _lease_key(jd_match_id), settings.PROGRESS_LEASE_SECONDS
+                )
+            except Exception as e:
+                logger.warning(
+                    "Failed to renew the lease of {jd_match_id}: {error}",
+                    jd_match_id=jd_match_id,
+                    error=str(e),
+                )
+
+    task = asyncio.create_task(beat())
+    try:
+        yield
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+
+async def is_analysis_running(jd_match_id: str) -> bool:
+    return bool(await get_redis_store().exists(_lease_key(jd_match_id)))
+
+
+async def is_analysis_in_flight(jd_match_id: str) -> bool:
+    """Running somewhere, or queued/picked up by a background worker."""
+    if await is_analysis_running(jd_match_id):
+        return True
+    job_state = await get_job_queue().get_state(analyze_job_key(jd_match_id))
+    return job_state in (JobState.QUEUED, JobState.RUNNING)
+
+
+async def has_analysis_events(jd_match_id: str) -> bool:
+    return bool(await get_redis_store().exists(_events_key(jd_match_id)))
+
+
+async def publish_analysis_event(
+    jd_match_id: str, event_type: SSEEventType, event_data: SSEEvent
+) -> str:
+    """Append an event to the analysis' bounded event log.
+
+    Returns the stream entry id, which is monotonic per analysis and doubles
+    as the SSE ``id`` clients send back as ``Last-Event-ID``.
+    """
+    redis = get_redis_store()
+    pipe = redis.pipeline(transaction=False)
+    pipe.xadd(
+        _events_key(jd_match_id),
+        {"type": event_type.value, "data": event_data.model_dump_json()},
+        maxlen=settings.PROGRESS_EVENT_LOG_MAX_LEN,
+        approximate=True,
+    )
+    pipe.expire(_events_key(jd_match_id), settings.PROGRESS_TTL_SECONDS)
+    # Every event doubles as a heartbeat for the runner's lease
+    pipe.expire(_lease_key(jd_match_id), settings.PROGRESS_LEASE_SECONDS)
+    event_id: str
+    event_id, *_ = await pipe.execute()
+
+    if isinstance(event_data, StatusUpdateEvent):
+        await set_analysis_status(jd_match_id, event_data.status)
+    return event_id
+
+
+async def follow_analysis_events(
+    jd_match_id: str, last_event_id: str | None = None
+) -> AsyncGenerator[tuple[SSEEventType, SSEEvent, str], None]:
+    """Replay the event log after ``last_event_id`` (from the start if unset),
+    then keep tailing it while the analysis is in flight.
+
+    Ends at ``analysis_stop`` or once the runner is gone and the log is drained.
+    """
+    redis = get_redis_store()
+    last_id = last_event_id or "0-0"
+
+    while True:
+        in_flight = await is_analysis_in_flight(jd_match_id)
+        response = await redis.xread(
+            {_events_key(jd_match_id): last_id},
+            block=settings.PROGRESS_POLL_INTERVAL_MS if in_flight else None,
+        )
+        if not response:
+            if not in_flight:
+                logger.info(
+                    "Analysis {jd_match_id} is no longer in flight",
+                    jd_match_id=jd_match_id,
+                )
+                return
+            continue
+
+        for _, messages in response:
+            for message_id, fields in messages:
+                last_id = message_id
+                event_type = SSEEventType(fields["type"])
+                yield (
+                    event_type,
+                    _EVENT_MODELS[event_type].model_validate_json(fields["data"]),
+                    message_id,
+                )
+                if event_type == SSEEventType.ANALYSIS_STOP:
+                    return
@@ -0,0 +1,402 @@
+import asyncio
+import os
+import tempfile
+import uuid
+import zipfile
+from collections.abc import AsyncIterator, Awaitable, Callable
+from pathlib import PurePosixPath
+
+from browser_use_sdk import AsyncBrowserUse
+from fastapi import HTTPException, UploadFile
+from google import genai
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.v1.dto.jdmatch import RankedResume, RankingResultsResponse
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.integrations.db.database import async_session_factory
+from app.integrations.db.models import JDMatchDtl, RankingJob
+from app.integrations.http.client import HttpUpstream, get_http_client
+from app.integrations.supabase.storage import upload_file_to_supabase
+from app.modules.jdmatch.agents.generate_candidate_score import (
+    agent_route_structured_score,
+)
+from app.modules.jdmatch.cache.result_cache import get_cached_result
+from app.modules.jdmatch.constants import JdMatchStatus
+from app.modules.jdmatch.repo import (
+    create_ranking_job_record,
+    get_pending_ranking_items,
+    get_ranked_results,
+    get_ranking_job,
+    record_ranking_progress,
+    save_jd_match_info,
+    update_jd_match_resume,
+    update_jd_match_status,
+    update_jd_match_statuses,
+    update_ranking_job,
+)
+from app.modules.jdmatch.schemas import RankingSource, SpooledResume
+from app.modules.jdmatch.service import (
+    acquire_resume_input,
+    release_resume_input,
+    resolve_jd,
+    store_spooled_resume_keeping_pdf,
+)
+from app.modules.jdmatch.utils.cleanup_file import cleanup_file
+from app.modules.jdmatch.utils.download_resume import download_resume
+from app.modules.jdmatch.utils.init_file_identity import init_file_identity
+from app.modules.jdmatch.utils.is_jd_link_or_description import (
+    is_jd_link_or_description,
+)
+from app.modules.jdmatch.utils.list_zip_resumes import list_zip_resumes
+from app.modules.jdmatch.utils.spool_resume import spool_resume
+
+logger = get_logger("jdmatch.ranking")
+
+
+async def create_ranking_job(
+    _db_session: AsyncSession,
+    jd_info: str,
+    resume_urls: list[str],
+    resumes_zip: UploadFile | None = None,
+) -> RankingJob:
+    """Register a ranking job with one pending record per resume.
+
+    URLs are fetched by the worker; a zip is stored once in Supabase and its
+    members are read by the worker, so the request only spools and lists it.
+    """
+    logger.info("starting create_ranking_job()")
+
+    ranking_job_id = uuid.uuid4()
+    sources = [
+        RankingSource(file_id=init_file_identity(url), resume_url=url)
+        for url in resume_urls
+    ]
+    source_zip = None
+    if resumes_zip:
+        zip_path = await _spool_zip(resumes_zip)
+        try:
+            sources += [
+                RankingSource(file_id=str(uuid.uuid4()), file_name=name)
+                for name in list_zip_resumes(zip_path)
+            ]
+            _check_resume_count(len(sources))
+            source_zip = await upload_file_to_supabase(
+                zip_path, f"rankings/{ranking_job_id}.zip"
+            )
+        finally:
+            cleanup_file(zip_path)
+
+    _check_resume_count(len(sources))
+    ranking_job = await create_ranking_job_record(
+        _db_session, ranking_job_id, jd_info, sources, source_zip=source_zip
+    )
+    logger.info(
+        "ending create_ranking_job() with {total} resumes", total=ranking_job.total
+    )
+    return ranking_job
+
+
+async def run_ranking_job(
+    ranking_job_id: str,
+    gemini_client: genai.Client,
+    browser_use_client: AsyncBrowserUse | None = None,
+    heartbeat: Callable[[], Awaitable[None]] | None = None,
+) -> None:
+    """Validate the JD once, then score every pending resume with at most
+    ``RANKING_CONCURRENCY`` in flight, persisting each result as it lands.
+
+    Resumes already scored (or failed) by a previous attempt are skipped, so
+    a retried job picks up where it stopped. ``heartbeat`` is awaited after
+    every resume to keep the job's lease alive on long runs.
+    """
+    async with async_session_factory() as session:
+        ranking_job = await get_ranking_job(session, ranking_job_id)
+        if not ranking_job:
+            raise ValueError(f"No ranking job found for id: {ranking_job_id}")
+        pending = await get_pending_ranking_items(session, ranking_job_id)
+        await update_ranking_job(
+            session, ranking_job_id, {"status": JdMatchStatus.PROCESSING.value}
+        )
+
+    logger.info(
+        "ranking {count} pending resumes for {ranking_job_id}",
+        count=len(pending),
+        ranking_job_id=ranking_job_id,
+    )
+    jd = ranking_job.jd or await _resolve_ranking_jd(
+        ranking_job, pending, gemini_client, browser_use_client
+    )
+    if not jd:
+        return
+
+    zip_path = (
+        await _download_zip(ranking_job.source_zip)
+        if ranking_job.source_zip and any(not item.resume_url for item in pending)
+        else None
+    )
+    archive = zipfile.ZipFile(zip_path) if zip_path else None
+    items: asyncio.Queue[JDMatchDtl] = asyncio.Queue()
+    for item in pending:
+        items.put_nowait(item)
+
+    async def worker() -> None:
+        while not items.empty():
+            item = items.get_nowait()
+            await _rank_resume(item, ranking_job, jd, archive, gemini_client)
+            if heartbeat:
+                await heartbeat()
+
+    try:
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(min(settings.RANKING_CONCURRENCY, len(pending))):
+                tg.create_task(worker())
+    finally:
+        if archive:
+            archive.close()
+        if zip_path:
+            cleanup_file(zip_path)
+
+    async with async_session_factory() as session:
+        await update_ranking_job(
+            session, ranking_job_id, {"status": JdMatchStatus.MATCHED.value}
+        )
+    logger.info("ranking job {ranking_job_id} done", ranking_job_id=ranking_job_id)
+
+
+async def get_ranking_results(
+    ranking_job_id: str,
+    _db_session: AsyncSession,
+    page: int,
+    page_size: int,
+) -> RankingResultsResponse:
+    ranking_job = await get_ranking_job(_db_session, ranking_job_id)
+    if not ranking_job:
+        raise ValueError(f"No ranking job found for id: {ranking_job_id}")
+
+    items = await get_ranked_results(
+        _db_session,
+        ranking_job_id,
+        offset=(page - 1) * page_size,
+        limit=page_size,
+    )
+    return RankingResultsResponse(
+        ranking_job_id=ranking_job.id,
+        status=ranking_job.status,
+        total=ranking_job.total,
+        completed=ranking_job.completed,
+        failed=ranking_job.failed,
+        error=ranking_job.error,
+        page=page,
+        page_size=page_size,
+        results=[
+            RankedResume(
+                jd_match_id=item.id,
+                file_name=item.file_name,
+                status=item.status,
+                score=item.score,
+                matching_skills=item.matching_skills,
+                missing_skills=item.missing_skills,
+                score_model=item.score_model,
+            )
+            for item in items
+        ],
+    )
+
+
+async def _resolve_ranking_jd(
+    ranking_job: RankingJob,
+    pending: list[JDMatchDtl],
+    gemini_client: genai.Client,
+    browser_use_client: AsyncBrowserUse | None,
+) -> str | None:
+    ranking_job_id = str(ranking_job.id)
+    try:
+        jd = await resolve_jd(
+            ranking_job.jd_info,
+            is_jd_link_or_description(ranking_job.jd_info),
+            gemini_client,
+            browser_use_client,
+        )
+    except ValueError as e:
+        # Not a JD: retrying won't change that, and no resume can be scored
+        logger.warning(
+            "ranking job {ranking_job_id} has an invalid JD: {error}",
+            ranking_job_id=ranking_job_id,
+            error=str(e),
+        )
+        async with async_session_factory() as session:
+            await update_jd_match_statuses(
+                session,
+                [str(item.id) for item in pending],
+                JdMatchStatus.FAILED.value,
+                commit=False,
+            )
+            await update_ranking_job(
+                session,
+                ranking_job_id,
+                {
+                    "status": JdMatchStatus.FAILED.value,
+                    "error": str(e) or "Invalid job description",
+                    "failed": ranking_job.failed + len(pending),
+                },
+            )
+        return None
+
+    async with async_session_factory() as session:
+        await update_ranking_job(session, ranking_job_id, {"jd": jd})
+    return jd
+
+
+async def _rank_resume(
+    item: JDMatchDtl,
+    ranking_job: RankingJob,
+    jd: str,
+    archive: zipfile.ZipFile | None,
+    gemini_client: genai.Client,
+) -> None:
+    jd_match_id = str(item.id)
+    ranking_job_id = str(ranking_job.id)
+    resume: SpooledResume | None = None
+    try:
+        if item.resume_id and item.resume_url:
+            # Retry: the record already points at its stored PDF
+            resume, _ = await download_resume(item.resume_url)
+        else:
+            # First attempt: store the source under its content hash, so the
+            # record points at a PDF like any other jd_match, and score the
+            # local PDF rather than downloading the stored copy
+            spooled = await _spool_source(item, archive)
+            async with async_session_factory() as session:
+                stored, resume = await store_spooled_resume_keeping_pdf(
+                    session, spooled
+                )
+                await update_jd_match_resume(session, jd_match_id, stored)
+            if not resume:
+                resume, _ = await download_resume(stored.pdf_url)
+
+        # Same key as an online analysis of this record: the hash of the PDF
+        # it points at and the JD as entered
+        cached_result = await get_cached_result(
+            resume.content_hash, ranking_job.jd_info
+        )
+        if cached_result:
+            structured_result = cached_result.structured_score
+            explanation = cached_result.explanation
+            model = cached_result.model
+        else:
+            resume_input = await acquire_resume_input(resume, gemini_client)
+            try:
+                # Ranking only needs the score; explanations come from /analyze
+                routed = await agent_route_structured_score(
+                    jd, resume_input, gemini_client
+                )
+            finally:
+                release_resume_input(resume_input)
+            structured_result, model = routed.structured_score, routed.model
+            explanation = None
+
+        async with async_session_factory() as session:
+            await save_jd_match_info(
+                session,
+                jd_match_id=jd_match_id,
+                jd=jd,
+                score_data={
+                    "score": structured_result.score,
+                    "matching_skills": structured_result.matching_skills,
+                    "missing_skills": structured_result.missing_skills,
+                    "explanation": explanation,
+                    "model": model,
+                },
+                commit=False,
+            )
+            await record_ranking_progress(session, ranking_job_id, failed=False)
+
+    except Exception:
+        logger.exception(
+            "Error ranking {jd_match_id} in {ranking_job_id}",
+            jd_match_id=jd_match_id,
+            ranking_job_id=ranking_job_id,
+        )
+        async with async_session_factory() as session:
+            await update_jd_match_status(
+                session,
+                jd_match_id,
+                JdMatchStatus.FAILED.value,
+                returning=False,
+                commit=False,
+            )
+            await record_ranking_progress(session, ranking_job_id, failed=True)
+    finally:
+        if resume:
+            cleanup_file(resume.path)
+
+
+async def _spool_source(
+    item: JDMatchDtl, archive: zipfile.ZipFile | None
+) -> SpooledResume:
+    if item.resume_url:
+        spooled, _ = await download_resume(item.resume_url)
+        return spooled
+    if not archive or not item.file_name:
+        raise ValueError(f"No resume source for jd_match_id: {item.id}")
+    return await spool_resume(
+        _iter_zip_member(archive, item.file_name), PurePosixPath(item.file_name).name
+    )
+
+
+async def _iter_zip_member(archive: zipfile.ZipFile, name: str) -> AsyncIterator[bytes]:
+    with archive.open(name) as member:
+        while chunk := member.read(settings.RESUME_CHUNK_BYTES):
+            yield chunk
+
+
+async def _spool_zip(upload: UploadFile) -> str:
+    fd, zip_path = tempfile.mkstemp(prefix="ranking-", suffix=".zip")
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            while chunk := await upload.read(settings.RESUME_CHUNK_BYTES):
+                size += len(chunk)
+                _check_zip_size(size)
+                spool.write(chunk)
+    except BaseException:
+        cleanup_file(zip_path)
+        raise
+    return zip_path
+
+
+async def _download_zip(zip_url: str) -> str:
+    client = get_http_client(HttpUpstream.resume_download)
+    fd, zip_path = tempfile.mkstemp(prefix="ranking-", suffix=".zip")
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            async with client.stream("GET", zip_url) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(settings.RESUME_CHUNK_BYTES):
+                    spool.write(chunk)
+    except BaseException:
+        cleanup_file(zip_path)
+        raise
+    return zip_path
+
+
+def _check_zip_size(size: int) -> None:
+    if size > settings.RANKING_MAX_ZIP_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=(
+                f"Zip is larger than "
+                f"{settings.RANKING_MAX_ZIP_BYTES // 1024 // 1024} MB"
+            ),
+        )
+
+
+def _check_resume_count(count: int) -> None:
+    if not count:
+        raise HTTPException(status_code=400, detail="No resumes to rank")
+    if count > settings.RANKING_MAX_RESUMES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.RANKING_MAX_RESUMES} resumes per ranking job",
+        )
@@ -1,104 +1,380 @@
+import uuid
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, cast
 
-from sqlmodel import Session, select
+from sqlalchemy import CursorResult
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import col, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.integrations.db.models import JDMatchDtl
+from app.integrations.db.models import JDMatchDtl, RankingJob, Resume
 from app.modules.jdmatch.constants import JdMatchStatus
+from app.modules.jdmatch.schemas import RankingSource
+
+
+def _utcnow() -> datetime:
+    # The timestamp columns are naive DateTime(); asyncpg rejects aware values
+    return datetime.now(UTC).replace(tzinfo=None)
 
 
 async def create_jd_match_record(
-    _db_session: Session,
+    _db_session: AsyncSession,
     file_id: str,
     file_name: str,
     resume_url: str,
     jd_info: str | None = None,
+    resume_id: str | None = None,
 ) -> JDMatchDtl:
     jd_match_dtl = JDMatchDtl(
         file_id=file_id,
         file_name=file_name,
         resume_url=resume_url,
         jd=jd_info,
+        resume_id=resume_id,
     )
     _db_session.add(jd_match_dtl)
-    _db_session.commit()
-    _db_session.refresh(jd_match_dtl)
+    await _db_session.commit()
+    await _db_session.refresh(jd_match_dtl)
     return jd_match_dtl
 
 
+async def create_jd_match_records(
+    _db_session: AsyncSession,
+    file_id: str,
+    file_name: str,
+    resume_url: str,
+    jd_infos: list[str],
+    resume_id: str | None = None,
+) -> list[JDMatchDtl]:
+    """One record per JD for the same resume, inserted in a single commit."""
+    jd_match_dtls = [
+        JDMatchDtl(
+            file_id=file_id,
+            file_name=file_name,
+            resume_url=resume_url,
+            jd=jd_info,
+            resume_id=resume_id,
+        )
+        for jd_info in jd_infos
+    ]
+    _db_session.add_all(jd_match_dtls)
+    await _db_session.commit()
+    return jd_match_dtls
+
+
+async def get_resume_by_id(
+    _db_session: AsyncSession,
+    resume_id: str,
+) -> Resume | None:
+    return await _db_session.get(Resume, resume_id)
+
+
+async def create_resume_record(
+    _db_session: AsyncSession,
+    resume_id: str,
+    file_name: str,
+    supabase_url: str,
+    pdf_url: str,
+) -> Resume:
+    """Insert the resume unless a concurrent request already stored the same
+    bytes; either way return the stored row."""
+    statement = (
+        insert(Resume)
+        .values(
+            id=resume_id,
+            file_name=file_name,
+            supabase_url=supabase_url,
+            pdf_url=pdf_url,
+            created_at=_utcnow(),
+        )
+        .on_conflict_do_nothing(index_elements=["id"])
+    )
+    await _db_session.execute(statement)
+    await _db_session.commit()
+    resume = await get_resume_by_id(_db_session, resume_id)
+    if not resume:
+        raise ValueError(f"Failed to store resume {resume_id}")
+    return resume
+
+
+async def update_jd_match_resume(
+    _db_session: AsyncSession,
+    jd_match_id: str,
+    resume: Resume,
+    *,
+    commit: bool = True,
+) -> None:
+    values = {
+        "resume_id": resume.id,
+        "resume_url": resume.pdf_url,
+        "file_name": resume.file_name,
+    }
+    await _update_jd_match(
+        _db_session, jd_match_id, values, returning=False, commit=commit
+    )
+
+
 async def update_jd_info(
-    _db_session: Session,
+    _db_session: AsyncSession,
     jd_match_id: str,
     jd_info: str,
+    *,
+    returning: bool = True,
+    commit: bool = True,
 ) -> JDMatchDtl | None:
-    statement = select(JDMatchDtl).where(JDMatchDtl.id == jd_match_id)
-    results = _db_session.exec(statement)
-    jd_match_dtl = results.first()
-    if jd_match_dtl:
-        jd_match_dtl.jd = jd_info
-        jd_match_dtl.updated_at = datetime.now(UTC)
-        _db_session.add(jd_match_dtl)
-        _db_session.commit()
-        _db_session.refresh(jd_match_dtl)
-    return jd_match_dtl
+    return await _update_jd_match(
+        _db_session, jd_match_id, {"jd": jd_info}, returning=returning, commit=commit
+    )
 
 
 async def update_jd_match_status(
-    _db_session: Session,
+    _db_session: AsyncSession,
     jd_match_id: str,
     status: str,
+    *,
+    returning: bool = True,
+    commit: bool = True,
 ) -> JDMatchDtl | None:
-    statement = select(JDMatchDtl).where(JDMatchDtl.id == jd_match_id)
-    results = _db_session.exec(statement)
-    jd_match_dtl = results.first()
-    if jd_match_dtl:
-        jd_match_dtl.status = status
-        jd_match_dtl.updated_at = datetime.now(UTC)
-        _db_session.add(jd_match_dtl)
-        _db_session.commit()
-        _db_session.refresh(jd_match_dtl)
-    return jd_match_dtl
+    return await _update_jd_match(
+        _db_session,
+        jd_match_id,
+        {"status": status},
+        returning=returning,
+        commit=commit,
+    )
+
+
+async def update_jd_match_statuses(
+    _db_session: AsyncSession,
+    jd_match_ids: list[str],
+    status: str,
+    *,
+    commit: bool = True,
+) -> int:
+    """Move several records to ``status`` in one statement; returns the row count."""
+    statement = (
+        update(JDMatchDtl)
+        .where(col(JDMatchDtl.id).in_(jd_match_ids))
+        .values(status=status, updated_at=_utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    # UPDATE statements return a CursorResult, which carries the row count
+    result = cast(CursorResult[Any], await _db_session.execute(statement))
+    if commit:
+        await _db_session.commit()
+    return result.rowcount
 
 
 async def get_jd_match_by_file_id(
-    _db_session: Session,
+    _db_session: AsyncSession,
     file_id: str,
 ) -> JDMatchDtl | None:
     statement = select(JDMatchDtl).where(JDMatchDtl.file_id == file_id)
-    results = _db_session.exec(statement)
+    results = await _db_session.exec(statement)
     return results.first()
 
 
 async def get_jd_match_by_jd_match_id(
-    _db_session: Session,
+    _db_session: AsyncSession,
     jd_match_id: str,
 ) -> JDMatchDtl | None:
     statement = select(JDMatchDtl).where(JDMatchDtl.id == jd_match_id)
-    results = _db_session.exec(statement)
+    results = await _db_session.exec(statement)
     return results.first()
 
 
+async def list_jd_matches(
+    _db_session: AsyncSession,
+    *,
+    jd_match_ids: list[str] | None = None,
+    ranking_job_id: str | None = None,
+    status: str | None = None,
+    limit: int | None = None,
+) -> list[JDMatchDtl]:
+    """Records matching every given filter, oldest first."""
+    statement = select(JDMatchDtl).order_by(col(JDMatchDtl.created_at))
+    if jd_match_ids is not None:
+        statement = statement.where(
+            col(JDMatchDtl.id).in_([uuid.UUID(i) for i in jd_match_ids])
+        )
+    if ranking_job_id is not None:
+        statement = statement.where(
+            JDMatchDtl.ranking_job_id == uuid.UUID(ranking_job_id)
+        )
+    if status is not None:
+        statement = statement.where(JDMatchDtl.status == status)
+    if limit is not None:
+        statement = statement.limit(limit)
+    results = await _db_session.exec(statement)
+    return list(results.all())
+
+
 async def save_jd_match_info(
-    _db_session: Session,
+    _db_session: AsyncSession,
     jd_match_id: str,
     jd: str,
     score_data: dict[str, Any],
+    *,
+    commit: bool = True,
 ) -> None:
-    statement = select(JDMatchDtl).where(JDMatchDtl.id == jd_match_id)
-    results = _db_session.exec(statement)
-    jd_match_dtl = results.first()
+    values = {
+        "jd": jd,
+        "score": score_data["score"],
+        "matching_skills": score_data["matching_skills"],
+        "missing_skills": score_data["missing_skills"],
+        "explanation": score_data["explanation"],
+        "score_model": score_data["model"],
+        "status": JdMatchStatus.MATCHED.value,
+    }
+    await _update_jd_match(
+        _db_session, jd_match_id, values, returning=False, commit=commit, strict=True
+    )
+
+
+async def _update_jd_match(
+    _db_session: AsyncSession,
+    jd_match_id: str,
+    values: dict[str, Any],
+    *,
+    returning: bool,
+    commit: bool,
+    strict: bool = False,
+) -> JDMatchDtl | None:
+    """Apply ``values`` with a single ``UPDATE ... WHERE id = :id``.
+
+    With ``returning`` the updated row comes back in the same round trip
+    (``RETURNING``); without it nothing is read back. ``commit=False`` leaves
+    the transaction open so callers can batch several writes into one commit.
+    ``strict`` raises when no row matched.
+    """
+    statement = (
+        update(JDMatchDtl)
+        .where(col(JDMatchDtl.id) == jd_match_id)
+        .values(**values, updated_at=_utcnow())
+    )
+    jd_match_dtl = None
+    if returning:
+        statement = statement.returning(JDMatchDtl).execution_options(
+            populate_existing=True
+        )
+        result = await _db_session.execute(statement)
+        jd_match_dtl = result.scalars().first()
+        matched = jd_match_dtl is not None
+    else:
+        statement = statement.execution_options(synchronize_session=False)
+        cursor = cast(CursorResult[Any], await _db_session.execute(statement))
+        matched = cursor.rowcount > 0
 
-    if not jd_match_dtl:
+    if strict and not matched:
         raise ValueError(f"No record found for jd_match_id: {jd_match_id}")
+    if commit:
+        await _db_session.commit()
+    return jd_match_dtl
 
-    jd_match_dtl.jd = jd
-    jd_match_dtl.score = score_data["score"]
-    jd_match_dtl.matching_skills = score_data["matching_skills"]
-    jd_match_dtl.missing_skills = score_data["missing_skills"]
-    jd_match_dtl.explanation = score_data["explanation"]
-    jd_match_dtl.status = JdMatchStatus.MATCHED.value
-    jd_match_dtl.updated_at = datetime.now(UTC)
 
-    _db_session.add(jd_match_dtl)
-    _db_session.commit()
-    _db_session.refresh(jd_match_dtl)
+async def create_ranking_job_record(
+    _db_session: AsyncSession,
+    ranking_job_id: uuid.UUID,
+    jd_info: str,
+    sources: list[RankingSource],
+    *,
+    source_zip: str | None = None,
+) -> RankingJob:
+    """The job and one pending jd_match record per resume, in a single commit."""
+    ranking_job = RankingJob(
+        id=ranking_job_id,
+        jd_info=jd_info,
+        source_zip=source_zip,
+        total=len(sources),
+    )
+    _db_session.add(ranking_job)
+    # No ORM relationship ties the rows together, so insert the job first for
+    # the items' foreign key
+    await _db_session.flush()
+    _db_session.add_all(
+        JDMatchDtl(
+            file_id=source.file_id,
+            file_name=source.file_name,
+            resume_url=source.resume_url,
+            jd=jd_info,
+            ranking_job_id=ranking_job_id,
+        )
+        for source in sources
+    )
+    await _db_session.commit()
+    return ranking_job
+
+
+async def get_ranking_job(
+    _db_session: AsyncSession,
+    ranking_job_id: str,
+) -> RankingJob | None:
+    return await _db_session.get(RankingJob, uuid.UUID(ranking_job_id))
+
+
+async def update_ranking_job(
+    _db_session: AsyncSession,
+    ranking_job_id: str,
+    values: dict[str, Any],
+    *,
+    commit: bool = True,
+) -> None:
+    statement = (
+        update(RankingJob)
+        .where(col(RankingJob.id) == uuid.UUID(ranking_job_id))
+        .values(**values, updated_at=_utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    await _db_session.execute(statement)
+    if commit:
+        await _db_session.commit()
+
+
+async def record_ranking_progress(
+    _db_session: AsyncSession,
+    ranking_job_id: str,
+    *,
+    failed: bool,
+    commit: bool = True,
+) -> None:
+    """Count one finished resume; incremented in SQL so concurrent workers
+    never lose an update."""
+    values = (
+        {"failed": col(RankingJob.failed) + 1}
+        if failed
+        else {"completed": col(RankingJob.completed) + 1}
+    )
+    await update_ranking_job(_db_session, ranking_job_id, values, commit=commit)
+
+
+async def get_pending_ranking_items(
+    _db_session: AsyncSession,
+    ranking_job_id: str,
+) -> list[JDMatchDtl]:
+    """Resumes not yet scored; a retried job picks up where it left off."""
+    statement = select(JDMatchDtl).where(
+        JDMatchDtl.ranking_job_id == uuid.UUID(ranking_job_id),
+        col(JDMatchDtl.status).not_in(
+            [JdMatchStatus.MATCHED.value, JdMatchStatus.FAILED.value]
+        ),
+    )
+    results = await _db_session.exec(statement)
+    return list(results.all())
+
+
+async def get_ranked_results(
+    _db_session: AsyncSession,
+    ranking_job_id: str,
+    *,
+    offset: int,
+    limit: int,
+) -> list[JDMatchDtl]:
+    statement = (
+        select(JDMatchDtl)
+        .where(JDMatchDtl.ranking_job_id == uuid.UUID(ranking_job_id))
+        .order_by(col(JDMatchDtl.score).desc().nulls_last(), col(JDMatchDtl.created_at))
+        .offset(offset)
+        .limit(limit)
+    )
+    results = await _db_session.exec(statement)
+    return list(results.all())
@@ -1,13 +1,33 @@
 from pydantic import BaseModel
 
-from app.api.v1.dto import UIDtoModel
 
+class SpooledResume(BaseModel):
+    """A resume streamed to a local temp file; every consumer reads ``path``."""
 
-class ParseResumeJDInformation(UIDtoModel):
-    jd_match_id: str
-    candidate_resume_path: str
-    jd_path: str
-    file_name: str
+    path: str
+    filename: str
+    content_hash: str
+    size: int
+
+
+class ParsedResume(BaseModel):
+    """Text extracted locally from a resume PDF, headings normalized.
+
+    ``text`` is empty for scanned or image-only PDFs, which have to go to
+    Gemini as a file.
+    """
+
+    text: str
+    sections: list[str]
+    page_count: int
+
+
+class RankingSource(BaseModel):
+    """Where one resume of a ranking job comes from: a URL or a zip member."""
+
+    file_id: str
+    resume_url: str | None = None
+    file_name: str | None = None
 
 
 class AgentResponseJDVerification(BaseModel):
@@ -15,14 +35,14 @@ class AgentResponseJDVerification(BaseModel):
     reason: str
 
 
-class AgentResponseCandidateScore(BaseModel):
+class AgentResponseStructuredScore(BaseModel):
     score: int
     matching_skills: list[str]
     missing_skills: list[str]
-    explanation: str
 
 
-class AgentResponseStructuredScore(BaseModel):
-    score: int
-    matching_skills: list[str]
-    missing_skills: list[str]
+class CachedJdMatchResult(BaseModel):
+    jd: str
+    structured_score: AgentResponseStructuredScore
+    explanation: str
+    model: str | None = None
@@ -1,14 +1,22 @@
+import asyncio
+import uuid
 from collections.abc import AsyncGenerator
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any
 
 from browser_use_sdk import AsyncBrowserUse
 from fastapi import UploadFile
 from google import genai
-from sqlmodel import Session
+from google.genai import types
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.v1.dto.jdmatch import (
     AnalysisDeltaEvent,
     AnalysisStartEvent,
     AnalysisStopEvent,
+    BatchJdResult,
+    BatchSummaryEvent,
     ContentBlockDeltaEvent,
     ContentBlockStartEvent,
     ContentBlockStopEvent,
@@ -19,71 +27,499 @@ from app.api.v1.dto.jdmatch import (
     ResultContentBlock,
     ResultDelta,
     ResumeUploadResponse,
+    ScoreDelta,
+    SkillDelta,
     SSEEvent,
     SSEEventType,
     StatusUpdateEvent,
     StopReason,
     TextDelta,
 )
+from app.core.config import settings
 from app.core.logging.logger import get_logger
+from app.core.streaming_json import JsonFieldEvent, JsonItemEvent
+from app.integrations.db.database import async_session_factory
+from app.integrations.db.models import JDMatchDtl, Resume
+from app.integrations.llm.files import get_gemini_file_manager
 from app.integrations.supabase.storage import upload_file_to_supabase
 from app.modules.jdmatch.agents.analyze_jd_text_structure import (
     agent_analyze_jd_text_structure,
 )
 from app.modules.jdmatch.agents.extract_jd import agent_extract_jd
 from app.modules.jdmatch.agents.generate_candidate_score import (
-    agent_generate_structured_score,
+    ResumeInput,
+    ScoredExplanationPart,
+    agent_route_structured_score,
     agent_stream_explanation,
+    agent_stream_scored_explanation,
+)
+from app.modules.jdmatch.cache.jd_extraction_cache import (
+    extract_jd_once,
+    get_cached_jd_extraction,
+)
+from app.modules.jdmatch.cache.jd_verdict_cache import (
+    get_cached_jd_verdict,
+    set_cached_jd_verdict,
+)
+from app.modules.jdmatch.cache.result_cache import (
+    get_cached_result,
+    set_cached_result,
+)
+from app.modules.jdmatch.cache.resume_text_cache import (
+    get_cached_resume_text,
+    set_cached_resume_text,
 )
 from app.modules.jdmatch.constants import JdMatchStatus
+from app.modules.jdmatch.progress import (
+    acquire_analysis_lease,
+    analysis_lease_heartbeat,
+    follow_analysis_events,
+    get_analysis_status,
+    has_analysis_events,
+    is_analysis_in_flight,
+    publish_analysis_event,
+    release_analysis_lease,
+    set_analysis_status,
+)
 from app.modules.jdmatch.repo import (
     create_jd_match_record,
+    create_jd_match_records,
+    create_resume_record,
     get_jd_match_by_jd_match_id,
+    get_resume_by_id,
     save_jd_match_info,
     update_jd_match_status,
+    update_jd_match_statuses,
+)
+from app.modules.jdmatch.schemas import (
+    AgentResponseStructuredScore,
+    CachedJdMatchResult,
+    ParsedResume,
+    SpooledResume,
 )
+from app.modules.jdmatch.utils.classify_jd_text import classify_jd_text
 from app.modules.jdmatch.utils.cleanup_file import cleanup_file
+from app.modules.jdmatch.utils.convert_doc_to_pdf_if_needed import (
+    convert_doc_to_pdf_if_needed,
+)
 from app.modules.jdmatch.utils.download_resume import download_resume
+from app.modules.jdmatch.utils.extract_resume_text import extract_resume_text
 from app.modules.jdmatch.utils.init_file import init_file
 from app.modules.jdmatch.utils.init_file_identity import init_file_identity
 from app.modules.jdmatch.utils.is_jd_link_or_description import (
     is_jd_link_or_description,
 )
-from app.modules.jdmatch.utils.save_file import save_file
 
 logger = get_logger("jdmatch.service")
 
 
 async def create_jd_match(
-    _db_session: Session,
+    _db_session: AsyncSession,
     resume_file: UploadFile | None = None,
     resume_url: str | None = None,
     jd_info: str | None = None,
 ) -> ResumeUploadResponse:
     logger.info("starting create_jd_match()")
 
-    file_id = init_file_identity(resume_url or "")
-    file_content, filename, file_id = await init_file(
-        resume_file, resume_url, file_id=file_id
-    )
-
-    # Upload file to Storage
-    file_name_to_upload = f"{file_id}-{filename}"
-    resume_url = await upload_file_to_supabase(file_content, file_name_to_upload)
+    resume, file_id = await _ingest_resume(_db_session, resume_file, resume_url)
 
     # Create record in DB
     jd_record = await create_jd_match_record(
-        _db_session, file_id, filename, resume_url, jd_info
+        _db_session,
+        file_id,
+        resume.file_name,
+        resume.pdf_url,
+        jd_info,
+        resume_id=resume.id,
     )
 
     logger.info("ending create_jd_match()")
     return ResumeUploadResponse(file_id=file_id, jd_match_id=jd_record.id)
 
 
+async def create_jd_match_batch(
+    _db_session: AsyncSession,
+    jd_infos: list[str],
+    resume_file: UploadFile | None = None,
+    resume_url: str | None = None,
+) -> list[JDMatchDtl]:
+    """Store the resume once and create one jd_match record per JD."""
+    logger.info("starting create_jd_match_batch() for {count} JDs", count=len(jd_infos))
+
+    resume, file_id = await _ingest_resume(_db_session, resume_file, resume_url)
+    return await create_jd_match_records(
+        _db_session,
+        file_id,
+        resume.file_name,
+        resume.pdf_url,
+        jd_infos,
+        resume_id=resume.id,
+    )
+
+
+async def _ingest_resume(
+    _db_session: AsyncSession,
+    resume_file: UploadFile | None,
+    resume_url: str | None,
+) -> tuple[Resume, str]:
+    file_id = init_file_identity(resume_url or "")
+    spooled, file_id = await init_file(resume_file, resume_url, file_id=file_id)
+
+    return await store_spooled_resume(_db_session, spooled), file_id
+
+
+async def store_spooled_resume(
+    _db_session: AsyncSession, spooled: SpooledResume
+) -> Resume:
+    """Store a spooled resume, or reuse the stored copy of identical bytes.
+    Consumes (deletes) the spool file either way."""
+    resume, _ = await _store_spooled_resume(_db_session, spooled, keep_pdf=False)
+    return resume
+
+
+async def store_spooled_resume_keeping_pdf(
+    _db_session: AsyncSession, spooled: SpooledResume
+) -> tuple[Resume, SpooledResume | None]:
+    """Like ``store_spooled_resume``, but hands back the local copy of the
+    stored PDF (the caller cleans it up) so it can be scored without
+    downloading it again. ``None`` when there is no local copy, i.e. an
+    identical DOC/DOCX was stored before."""
+    return await _store_spooled_resume(_db_session, spooled, keep_pdf=True)
+
+
+async def _store_spooled_resume(
+    _db_session: AsyncSession, spooled: SpooledResume, *, keep_pdf: bool
+) -> tuple[Resume, SpooledResume | None]:
+    resume = await get_resume_by_id(_db_session, spooled.content_hash)
+    if not resume:
+        return await _store_resume(_db_session, spooled, keep_pdf=keep_pdf)
+
+    logger.info("Reusing stored resume {resume_id}", resume_id=resume.id)
+    if keep_pdf and spooled.path.endswith(".pdf"):
+        # A PDF is stored as-is, so the spool holds the stored bytes
+        return resume, spooled
+    cleanup_file(spooled.path)
+    return resume, None
+
+
+async def _store_resume(
+    _db_session: AsyncSession, spooled: SpooledResume, *, keep_pdf: bool
+) -> tuple[Resume, SpooledResume | None]:
+    """Upload a new resume (and its PDF conversion) under its content hash.
+    With ``keep_pdf`` the local PDF is handed back instead of deleted."""
+    resume_id = spooled.content_hash
+    pdf = spooled
+    kept: SpooledResume | None = None
+    try:
+        supabase_url = await upload_file_to_supabase(
+            spooled.path, f"{resume_id}/{spooled.filename}"
+        )
+        pdf = await convert_doc_to_pdf_if_needed(spooled)
+        pdf_url = (
+            supabase_url
+            if pdf is spooled
+            else await upload_file_to_supabase(pdf.path, f"{resume_id}/{pdf.filename}")
+        )
+        if settings.RESUME_INPUT_MODE == "text":
+            # Parse while the PDF is still local; analyses hit the text cache.
+            # Keyed by the hash of the bytes analyses download (the PDF)
+            await _parse_resume_text(pdf)
+        resume = await create_resume_record(
+            _db_session, resume_id, pdf.filename, supabase_url, pdf_url
+        )
+        kept = pdf if keep_pdf else None
+    finally:
+        for path in (spooled.path, pdf.path):
+            if not kept or path != kept.path:
+                cleanup_file(path)
+    return resume, kept
+
+
 async def jd_match_analyze(
     jd_match_id: str,
     gemini_client: genai.Client,
-    _db_session: Session,
+    _db_session: AsyncSession,
+    browser_use_client: AsyncBrowserUse | None = None,
+    last_event_id: str | None = None,
+) -> AsyncGenerator[tuple[SSEEventType, SSEEvent, str], None]:
+    """Stream an analysis to a client as ``(type, event, event_id)`` tuples.
+
+    Attaches to the analysis if it is queued or running in another
+    request/worker, or replays its event log after ``last_event_id`` when a
+    client reconnects; otherwise runs it in this request.
+    """
+    if await is_analysis_in_flight(jd_match_id) or (
+        last_event_id and await has_analysis_events(jd_match_id)
+    ):
+        stream = follow_analysis_events(jd_match_id, last_event_id)
+    else:
+        stream = run_jd_match_analysis(
+            jd_match_id, gemini_client, _db_session, browser_use_client
+        )
+    async for event in stream:
+        yield event
+
+
+async def run_jd_match_analysis(
+    jd_match_id: str,
+    gemini_client: genai.Client,
+    _db_session: AsyncSession,
+    browser_use_client: AsyncBrowserUse | None = None,
+) -> AsyncGenerator[tuple[SSEEventType, SSEEvent, str], None]:
+    """Run the analysis under a per-analysis lease, appending every event to
+    its Redis event log. Attaches instead if another runner holds the lease."""
+    if not await acquire_analysis_lease(jd_match_id):
+        logger.info(
+            "attaching to in-flight analysis {jd_match_id}", jd_match_id=jd_match_id
+        )
+        async for event in follow_analysis_events(jd_match_id):
+            yield event
+        return
+
+    try:
+        async with analysis_lease_heartbeat(jd_match_id):
+            async for event_type, event_data in _run_jd_match_analysis(
+                jd_match_id, gemini_client, _db_session, browser_use_client
+            ):
+                event_id = await publish_analysis_event(
+                    jd_match_id, event_type, event_data
+                )
+                yield (event_type, event_data, event_id)
+    finally:
+        await release_analysis_lease(jd_match_id)
+
+
+async def jd_match_batch_analyze(
+    jd_records: list[JDMatchDtl],
+    gemini_client: genai.Client,
+    browser_use_client: AsyncBrowserUse | None = None,
+) -> AsyncGenerator[tuple[SSEEventType, SSEEvent], None]:
+    """Score one resume against every JD in ``jd_records`` on a single stream.
+
+    The resume is downloaded and uploaded to Gemini once; JDs are scored with
+    at most ``BATCH_MAX_CONCURRENCY`` in flight. JD ``i`` owns content blocks
+    ``2i`` (result) and ``2i + 1`` (explanation), announced with its
+    ``jd_index``. A failed JD emits an error for its index and the batch
+    carries on; a ranked ``batch_summary`` closes the stream.
+    """
+    logger.info(
+        "starting jd_match_batch_analyze() for {count} JDs", count=len(jd_records)
+    )
+
+    yield (
+        SSEEventType.ANALYSIS_START,
+        AnalysisStartEvent(analysis_id=str(uuid.uuid4())),
+    )
+
+    try:
+        resume, _ = await download_resume(_resume_url(jd_records[0]))
+    except Exception as e:
+        logger.exception("Error downloading resume for batch")
+        async with async_session_factory() as session:
+            await update_jd_match_statuses(
+                session,
+                [str(jd_record.id) for jd_record in jd_records],
+                JdMatchStatus.FAILED.value,
+            )
+        yield (SSEEventType.ERROR, ErrorEvent(message=str(e) or "Analysis failed"))
+        yield (
+            SSEEventType.ANALYSIS_DELTA,
+            AnalysisDeltaEvent(stop_reason=StopReason.ERROR),
+        )
+        yield (SSEEventType.ANALYSIS_STOP, AnalysisStopEvent())
+        return
+
+    events: asyncio.Queue[tuple[SSEEventType, SSEEvent] | None] = asyncio.Queue()
+    semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+
+    async def score_all() -> list[BatchJdResult]:
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(
+                        _score_batch_jd(
+                            jd_index,
+                            jd_record,
+                            resume,
+                            semaphore,
+                            events,
+                            gemini_client,
+                            browser_use_client,
+                        )
+                    )
+                    for jd_index, jd_record in enumerate(jd_records)
+                ]
+        finally:
+            await events.put(None)
+        return [task.result() for task in tasks]
+
+    runner = asyncio.create_task(score_all())
+    try:
+        while (event := await events.get()) is not None:
+            yield event
+        results = await runner
+    finally:
+        if not runner.done():
+            # Client went away mid-batch: stop scoring the remaining JDs
+            runner.cancel()
+            with suppress(asyncio.CancelledError):
+                await runner
+        cleanup_file(resume.path)
+
+    results.sort(key=lambda result: (result.score is None, -(result.score or 0)))
+    yield (SSEEventType.BATCH_SUMMARY, BatchSummaryEvent(results=results))
+    yield (
+        SSEEventType.ANALYSIS_DELTA,
+        AnalysisDeltaEvent(stop_reason=StopReason.COMPLETE),
+    )
+    yield (SSEEventType.ANALYSIS_STOP, AnalysisStopEvent())
+
+    logger.info("ending jd_match_batch_analyze()")
+
+
+async def _score_batch_jd(
+    jd_index: int,
+    jd_record: JDMatchDtl,
+    resume: SpooledResume,
+    semaphore: asyncio.Semaphore,
+    events: asyncio.Queue[tuple[SSEEventType, SSEEvent] | None],
+    gemini_client: genai.Client,
+    browser_use_client: AsyncBrowserUse | None,
+) -> BatchJdResult:
+    jd_match_id = str(jd_record.id)
+    jd_data = jd_record.jd or ""
+    result_index, explanation_index = 2 * jd_index, 2 * jd_index + 1
+
+    async with semaphore:
+        try:
+            cached_result = await get_cached_result(resume.content_hash, jd_data)
+            if cached_result:
+                jd = cached_result.jd
+                structured_result = cached_result.structured_score
+                explanation = cached_result.explanation
+                model = cached_result.model
+                for event in _result_block_events(
+                    structured_result, index=result_index, jd_index=jd_index
+                ):
+                    await events.put(event)
+                for event in _explanation_block_events(
+                    explanation, index=explanation_index, jd_index=jd_index
+                ):
+                    await events.put(event)
+            else:
+                is_jd_link = is_jd_link_or_description(jd_data)
+                cached_jd = (
+                    await get_cached_jd_extraction(jd_data) if is_jd_link else None
+                )
+                if cached_jd:
+                    jd = cached_jd
+                else:
+                    status = (
+                        JdMatchStatus.EXTRACTING
+                        if is_jd_link
+                        else JdMatchStatus.ANALYZING
+                    )
+                    await events.put(
+                        (
+                            SSEEventType.STATUS_UPDATE,
+                            StatusUpdateEvent(status=status, jd_index=jd_index),
+                        )
+                    )
+                    jd = await resolve_jd(
+                        jd_data, is_jd_link, gemini_client, browser_use_client
+                    )
+
+                # Every JD shares the one parse/upload of this resume
+                resume_input = await acquire_resume_input(resume, gemini_client)
+                await events.put(
+                    (
+                        SSEEventType.STATUS_UPDATE,
+                        StatusUpdateEvent(
+                            status=JdMatchStatus.THINKING, jd_index=jd_index
+                        ),
+                    )
+                )
+                analysis = _Analysis()
+                try:
+                    async for event in _stream_analysis(
+                        jd,
+                        resume_input,
+                        gemini_client,
+                        analysis,
+                        result_index=result_index,
+                        explanation_index=explanation_index,
+                        jd_index=jd_index,
+                    ):
+                        await events.put(event)
+                finally:
+                    release_resume_input(resume_input)
+                structured_result = analysis.scored()
+                explanation, model = analysis.explanation, analysis.model
+                await set_cached_result(
+                    resume.content_hash,
+                    jd_data,
+                    CachedJdMatchResult(
+                        jd=jd,
+                        structured_score=structured_result,
+                        explanation=explanation,
+                        model=model,
+                    ),
+                )
+
+            # JDs finish concurrently, so each writes through its own session
+            async with async_session_factory() as session:
+                await save_jd_match_info(
+                    session,
+                    jd_match_id=jd_match_id,
+                    jd=jd,
+                    score_data=_score_data(structured_result, explanation, model),
+                )
+            await events.put(
+                (
+                    SSEEventType.STATUS_UPDATE,
+                    StatusUpdateEvent(status=JdMatchStatus.MATCHED, jd_index=jd_index),
+                )
+            )
+            return BatchJdResult(
+                jd_index=jd_index,
+                jd_match_id=jd_record.id,
+                status=JdMatchStatus.MATCHED,
+                score=structured_result.score,
+            )
+
+        except Exception as e:
+            logger.exception(
+                "Error scoring batch JD {jd_index} ({jd_match_id})",
+                jd_index=jd_index,
+                jd_match_id=jd_match_id,
+            )
+            error_message = str(e) if str(e) else "Analysis failed"
+            async with async_session_factory() as session:
+                await update_jd_match_status(
+                    session, jd_match_id, JdMatchStatus.FAILED.value, returning=False
+                )
+            await events.put(
+                (
+                    SSEEventType.ERROR,
+                    ErrorEvent(
+                        message=error_message,
+                        jd_index=jd_index,
+                        retryable=not isinstance(e, InvalidJdError),
+                    ),
+                )
+            )
+            return BatchJdResult(
+                jd_index=jd_index,
+                jd_match_id=jd_record.id,
+                status=JdMatchStatus.FAILED,
+                error=error_message,
+            )
+
+
+async def _run_jd_match_analysis(
+    jd_match_id: str,
+    gemini_client: genai.Client,
+    _db_session: AsyncSession,
     browser_use_client: AsyncBrowserUse | None = None,
 ) -> AsyncGenerator[tuple[SSEEventType, SSEEvent], None]:
     logger.info("starting jd_match_analyze()")
@@ -96,13 +532,7 @@ async def jd_match_analyze(
     jd_data = jd_record.jd
     if not jd_data:
         raise ValueError(f"JD info is missing for jd_match_id: {jd_match_id}")
-
-    # Download resume locally
-    file_content, filename, file_id = await download_resume(jd_record.resume_url)
-
-    # Save file locally to get path for agent
-    parse_info = save_file(file_content, jd_data, filename, file_id, jd_match_id)
-    candidate_resume_path = parse_info.candidate_resume_path
+    resume_url = _resume_url(jd_record)
 
     try:
         # analysis_start
@@ -113,96 +543,73 @@ async def jd_match_analyze(
 
         is_jd_link = is_jd_link_or_description(jd_data)
 
-        # Update status to EXTRACTING or ANALYZING in DB
-        status = JdMatchStatus.EXTRACTING if is_jd_link else JdMatchStatus.ANALYZING
-        await update_jd_match_status(_db_session, jd_match_id, status.value)
-        yield (SSEEventType.STATUS_UPDATE, StatusUpdateEvent(status=status))
-
-        # Extract or Analyze JD
-        if is_jd_link:
-            if not browser_use_client:
-                raise ValueError(
-                    "Browser use client is not available for link extraction"
-                )
-            jd = await agent_extract_jd(browser_use_client, jd_data)
-        else:
-            jd = agent_analyze_jd_text_structure(jd_data, gemini_client)
+        # An already extracted posting skips the EXTRACTING phase entirely
+        jd = await get_cached_jd_extraction(jd_data) if is_jd_link else None
+        if not jd:
+            # Intermediate statuses only go to Redis (see progress.py); Postgres
+            # gets the final write in save_jd_match_info
+            status = JdMatchStatus.EXTRACTING if is_jd_link else JdMatchStatus.ANALYZING
+            yield (SSEEventType.STATUS_UPDATE, StatusUpdateEvent(status=status))
 
-        # Update status to THINKING in DB
-        await update_jd_match_status(
-            _db_session, jd_match_id, JdMatchStatus.THINKING.value
-        )
-        yield (
-            SSEEventType.STATUS_UPDATE,
-            StatusUpdateEvent(status=JdMatchStatus.THINKING),
+        jd, resume = await _gather_analysis_inputs(
+            jd_data,
+            jd,
+            resume_url,
+            is_jd_link,
+            gemini_client,
+            browser_use_client,
         )
 
-        # Phase 1: Generate structured score (non-streaming)
-        structured_result = agent_generate_structured_score(
-            jd, candidate_resume_path, gemini_client
-        )
-
-        # Content block 0: result
-        yield (
-            SSEEventType.CONTENT_BLOCK_START,
-            ContentBlockStartEvent(index=0, content_block=ResultContentBlock()),
-        )
-        yield (
-            SSEEventType.CONTENT_BLOCK_DELTA,
-            ContentBlockDeltaEvent(
-                index=0,
-                delta=ResultDelta(
-                    score=structured_result.score,
-                    matching_skills=structured_result.matching_skills,
-                    missing_skills=structured_result.missing_skills,
-                ),
-            ),
-        )
-        yield (SSEEventType.CONTENT_BLOCK_STOP, ContentBlockStopEvent(index=0))
-
-        # Content block 1: explanation (streamed)
-        yield (
-            SSEEventType.CONTENT_BLOCK_START,
-            ContentBlockStartEvent(
-                index=1, content_block=ExplanationContentBlock()
-            ),
-        )
+        # Same resume against the same JD: replay the cached result
+        if resume.cached_result:
+            async for event in _replay_cached_analysis(
+                jd_match_id, resume.cached_result, _db_session
+            ):
+                yield event
+            return
+        resume_input = resume.prepared_input()
 
-        # Phase 2: Stream explanation text
-        full_explanation = ""
-        for chunk in agent_stream_explanation(
-            jd, candidate_resume_path, structured_result, gemini_client
-        ):
-            full_explanation += chunk
+        try:
             yield (
-                SSEEventType.CONTENT_BLOCK_DELTA,
-                ContentBlockDeltaEvent(index=1, delta=TextDelta(text=chunk)),
+                SSEEventType.STATUS_UPDATE,
+                StatusUpdateEvent(status=JdMatchStatus.THINKING),
             )
 
-        yield (SSEEventType.CONTENT_BLOCK_STOP, ContentBlockStopEvent(index=1))
-
-        # Build score_data for DB save
-        score_data = {
-            "score": structured_result.score,
-            "matching_skills": structured_result.matching_skills,
-            "missing_skills": structured_result.missing_skills,
-            "explanation": full_explanation,
-        }
+            # Result block, then the streamed explanation block; both phases
+            # share the same resume text or Gemini file
+            analysis = _Analysis()
+            async for event in _stream_analysis(
+                jd, resume_input, gemini_client, analysis
+            ):
+                yield event
+        finally:
+            release_resume_input(resume_input)
+        structured_result = analysis.scored()
 
         # Save to Database (this will also update status to MATCHED)
         await save_jd_match_info(
             _db_session,
             jd_match_id=jd_match_id,
             jd=jd,
-            score_data=score_data,
+            score_data=_score_data(
+                structured_result, analysis.explanation, analysis.model
+            ),
+        )
+        await set_cached_result(
+            resume.content_hash,
+            jd_data,
+            CachedJdMatchResult(
+                jd=jd,
+                structured_score=structured_result,
+                explanation=analysis.explanation,
+                model=analysis.model,
+            ),
         )
         yield (
             SSEEventType.STATUS_UPDATE,
             StatusUpdateEvent(status=JdMatchStatus.MATCHED),
         )
 
-        cleanup_file(candidate_resume_path)
-
         # analysis_delta + analysis_stop
         yield (
             SSEEventType.ANALYSIS_DELTA,
@@ -212,30 +619,415 @@ async def jd_match_analyze(
 
     except Exception as e:
         logger.exception("Error in jd_match_analyze")
-        await update_jd_match_status(
-            _db_session, jd_match_id, JdMatchStatus.FAILED.value
-        )
-        error_message = str(e) if str(e) else "Analysis failed"
-        yield (
-            SSEEventType.ERROR,
-            ErrorEvent(message=error_message),
+        async for event in _fail_analysis(jd_match_id, e, _db_session):
+            yield event
+
+    logger.info("ending jd_match_analyze()")
+
+
+def _resume_url(jd_record: JDMatchDtl) -> str:
+    if not jd_record.resume_url:
+        raise ValueError(f"Resume is missing for jd_match_id: {jd_record.id}")
+    return jd_record.resume_url
+
+
+@dataclass
+class _PreparedResume:
+    content_hash: str
+    # Set on a result-cache hit, in which case nothing is parsed or uploaded
+    cached_result: CachedJdMatchResult | None = None
+    resume_input: ResumeInput | None = None
+
+    def prepared_input(self) -> ResumeInput:
+        if self.resume_input is None:
+            raise ValueError("Resume could not be prepared")
+        return self.resume_input
+
+
+async def _gather_analysis_inputs(
+    jd_data: str,
+    jd: str | None,
+    resume_url: str,
+    is_jd_link: bool,
+    gemini_client: genai.Client,
+    browser_use_client: AsyncBrowserUse | None,
+) -> tuple[str, _PreparedResume]:
+    """Resolve the JD and prepare the resume concurrently; scoring needs both.
+
+    The resume branch (download -> result cache -> Gemini upload) does not
+    depend on the JD, so it runs alongside extraction/validation. A failure in
+    either branch cancels the other and the first one is re-raised as-is; any
+    others are logged.
+    """
+    resume_task: asyncio.Task[_PreparedResume] | None = None
+    try:
+        async with asyncio.TaskGroup() as tg:
+            jd_task = (
+                None
+                if jd
+                else tg.create_task(
+                    resolve_jd(jd_data, is_jd_link, gemini_client, browser_use_client)
+                )
+            )
+            resume_task = tg.create_task(
+                _prepare_resume(resume_url, jd_data, gemini_client)
+            )
+            resume = await resume_task
+            if resume.cached_result and jd_task:
+                # The cached result carries its own JD
+                jd_task.cancel()
+    except BaseException as e:
+        # The resume may have been uploaded before the JD branch failed
+        if (
+            resume_task
+            and resume_task.done()
+            and not resume_task.cancelled()
+            and resume_task.exception() is None
+        ):
+            release_resume_input(resume_task.result().resume_input)
+        if isinstance(e, ExceptionGroup):
+            for other in e.exceptions[1:]:
+                logger.opt(exception=other).error(
+                    "Another analysis input also failed: {error}", error=str(other)
+                )
+            raise e.exceptions[0] from None
+        raise
+
+    if resume.cached_result:
+        return resume.cached_result.jd, resume
+    if jd_task:
+        jd = jd_task.result()
+    if not jd:
+        raise ValueError("JD could not be resolved")
+    return jd, resume
+
+
+async def _prepare_resume(
+    resume_url: str, jd_data: str, gemini_client: genai.Client
+) -> _PreparedResume:
+    # The spool is only needed until the resume is parsed or uploaded to Gemini
+    spooled, _ = await download_resume(resume_url)
+    try:
+        cached_result = await get_cached_result(spooled.content_hash, jd_data)
+        if cached_result:
+            return _PreparedResume(spooled.content_hash, cached_result=cached_result)
+
+        resume_input = await acquire_resume_input(spooled, gemini_client)
+        return _PreparedResume(spooled.content_hash, resume_input=resume_input)
+    finally:
+        cleanup_file(spooled.path)
+
+
+async def acquire_resume_input(
+    spooled: SpooledResume, gemini_client: genai.Client
+) -> ResumeInput:
+    """What the scoring agents get for a resume: its local text in text mode,
+    the Gemini upload in file mode or when the PDF has no text layer."""
+    if settings.RESUME_INPUT_MODE == "text":
+        parsed = await _parse_resume_text(spooled)
+        if parsed.text:
+            return parsed.text
+    return await get_gemini_file_manager().acquire(
+        gemini_client, spooled.content_hash, spooled.path
+    )
+
+
+def release_resume_input(resume_input: ResumeInput | None) -> None:
+    """Give back the Gemini upload taken by ``acquire_resume_input``."""
+    if isinstance(resume_input, types.File):
+        get_gemini_file_manager().release(resume_input)
+
+
+async def _parse_resume_text(pdf: SpooledResume) -> ParsedResume:
+    parsed = await get_cached_resume_text(pdf.content_hash)
+    if not parsed:
+        parsed = await asyncio.to_thread(extract_resume_text, pdf.path)
+        await set_cached_resume_text(pdf.content_hash, parsed)
+    return parsed
+
+
+class InvalidJdError(ValueError):
+    """The JD text was judged not to be a job description."""
+
+
+async def resolve_jd(
+    jd_data: str,
+    is_jd_link: bool,
+    gemini_client: genai.Client,
+    browser_use_client: AsyncBrowserUse | None,
+) -> str:
+    """Extract a linked JD or validate a pasted one; raises InvalidJdError when
+    the text is not a job description."""
+    if not is_jd_link:
+        return await _verify_jd_text(jd_data, gemini_client)
+
+    if not browser_use_client:
+        raise ValueError("Browser use client is not available for link extraction")
+    return await extract_jd_once(
+        jd_data, lambda: agent_extract_jd(browser_use_client, jd_data)
+    )
+
+
+async def _verify_jd_text(jd_text: str, gemini_client: genai.Client) -> str:
+    """Heuristic pre-classifier -> verdict cache -> Gemini."""
+    verdict = classify_jd_text(jd_text) or await get_cached_jd_verdict(jd_text)
+    if not verdict:
+        verdict = await agent_analyze_jd_text_structure(jd_text, gemini_client)
+        await set_cached_jd_verdict(jd_text, verdict)
+
+    if not verdict.is_jd:
+        raise InvalidJdError(verdict.reason)
+    return jd_text
+
+
+def _score_data(
+    structured_result: AgentResponseStructuredScore,
+    explanation: str,
+    model: str | None,
+) -> dict[str, Any]:
+    return {
+        "score": structured_result.score,
+        "matching_skills": structured_result.matching_skills,
+        "missing_skills": structured_result.missing_skills,
+        "explanation": explanation,
+        "model": model,
+    }
+
+
+@dataclass
+class _Analysis:
+    """What ``_stream_analysis`` produced, filled in as its events go out."""
+
+    structured_score: AgentResponseStructuredScore | None = None
+    explanation: str = ""
+    model: str | None = None
+
+    def scored(self) -> AgentResponseStructuredScore:
+        if not self.structured_score:
+            raise ValueError("Analysis produced no score")
+        return self.structured_score
+
+
+async def _stream_analysis(
+    jd: str,
+    resume_input: ResumeInput,
+    gemini_client: genai.Client,
+    analysis: _Analysis,
+    *,
+    result_index: int = 0,
+    explanation_index: int = 1,
+    jd_index: int | None = None,
+) -> AsyncGenerator[tuple[SSEEventType, SSEEvent], None]:
+    """Score and explain the resume: the result block, then the explanation
+    block streamed as it is generated. ``ANALYSIS_MODE`` picks a routed score
+    plus an explanation call, or one call producing both. Only the latter
+    streams the score and each skill into the result block as they arrive,
+    ahead of the complete ``ResultDelta``; in two-call mode the score is not
+    streamed, so the result block carries just the ``ResultDelta``."""
+    parts: AsyncGenerator[ScoredExplanationPart, None]
+    if settings.ANALYSIS_MODE == "single_call":
+        analysis.model = settings.get_single_call_model()
+        parts = agent_stream_scored_explanation(
+            jd, resume_input, gemini_client, analysis.model
         )
-        yield (
-            SSEEventType.ANALYSIS_DELTA,
-            AnalysisDeltaEvent(stop_reason=StopReason.ERROR),
+    else:
+        routed = await agent_route_structured_score(jd, resume_input, gemini_client)
+        analysis.model = routed.model
+        parts = _prepend(
+            routed.structured_score,
+            agent_stream_explanation(
+                jd, resume_input, routed.structured_score, gemini_client, routed.model
+            ),
         )
-        yield (SSEEventType.ANALYSIS_STOP, AnalysisStopEvent())
-        return
 
-    logger.info("ending jd_match_analyze()")
+    yield _result_block_start(result_index, jd_index)
+    async for part in parts:
+        if isinstance(part, str):
+            analysis.explanation += part
+            yield (
+                SSEEventType.CONTENT_BLOCK_DELTA,
+                ContentBlockDeltaEvent(
+                    index=explanation_index, delta=TextDelta(text=part)
+                ),
+            )
+        elif isinstance(part, AgentResponseStructuredScore):
+            analysis.structured_score = part
+            yield _result_delta(part, result_index)
+            yield (
+                SSEEventType.CONTENT_BLOCK_STOP,
+                ContentBlockStopEvent(index=result_index),
+            )
+            yield (
+                SSEEventType.CONTENT_BLOCK_START,
+                ContentBlockStartEvent(
+                    index=explanation_index,
+                    content_block=ExplanationContentBlock(),
+                    jd_index=jd_index,
+                ),
+            )
+        else:
+            delta = _partial_result_delta(part)
+            if delta:
+                yield (
+                    SSEEventType.CONTENT_BLOCK_DELTA,
+                    ContentBlockDeltaEvent(index=result_index, delta=delta),
+                )
+
+    yield (
+        SSEEventType.CONTENT_BLOCK_STOP,
+        ContentBlockStopEvent(index=explanation_index),
+    )
+
+
+async def _prepend(
+    first: AgentResponseStructuredScore, rest: AsyncGenerator[str, None]
+) -> AsyncGenerator[AgentResponseStructuredScore | str, None]:
+    yield first
+    async for part in rest:
+        yield part
+
+
+def _result_block_events(
+    structured_result: AgentResponseStructuredScore,
+    index: int = 0,
+    jd_index: int | None = None,
+) -> list[tuple[SSEEventType, SSEEvent]]:
+    return [
+        _result_block_start(index, jd_index),
+        _result_delta(structured_result, index),
+        (SSEEventType.CONTENT_BLOCK_STOP, ContentBlockStopEvent(index=index)),
+    ]
+
+
+def _result_block_start(
+    index: int, jd_index: int | None
+) -> tuple[SSEEventType, SSEEvent]:
+    return (
+        SSEEventType.CONTENT_BLOCK_START,
+        ContentBlockStartEvent(
+            index=index, content_block=ResultContentBlock(), jd_index=jd_index
+        ),
+    )
+
+
+def _result_delta(
+    structured_result: AgentResponseStructuredScore, index: int
+) -> tuple[SSEEventType, SSEEvent]:
+    return (
+        SSEEventType.CONTENT_BLOCK_DELTA,
+        ContentBlockDeltaEvent(
+            index=index,
+            delta=ResultDelta(
+                score=structured_result.score,
+                matching_skills=structured_result.matching_skills,
+                missing_skills=structured_result.missing_skills,
+            ),
+        ),
+    )
+
+
+def _partial_result_delta(
+    event: JsonFieldEvent | JsonItemEvent,
+) -> ScoreDelta | SkillDelta | None:
+    """The score or a skill, as soon as the single-call stream closes it;
+    whole skill arrays are left to the complete ``ResultDelta``."""
+    if isinstance(event, JsonItemEvent):
+        return SkillDelta(field=event.key, skill=event.value)
+    if event.key == "score":
+        return ScoreDelta(score=event.value)
+    return None
+
+
+def _explanation_block_events(
+    explanation: str, index: int = 1, jd_index: int | None = None
+) -> list[tuple[SSEEventType, SSEEvent]]:
+    """A complete explanation as a single-delta block (cached results)."""
+    return [
+        (
+            SSEEventType.CONTENT_BLOCK_START,
+            ContentBlockStartEvent(
+                index=index, content_block=ExplanationContentBlock(), jd_index=jd_index
+            ),
+        ),
+        (
+            SSEEventType.CONTENT_BLOCK_DELTA,
+            ContentBlockDeltaEvent(index=index, delta=TextDelta(text=explanation)),
+        ),
+        (SSEEventType.CONTENT_BLOCK_STOP, ContentBlockStopEvent(index=index)),
+    ]
+
+
+async def _replay_cached_analysis(
+    jd_match_id: str,
+    cached_result: CachedJdMatchResult,
+    _db_session: AsyncSession,
+) -> AsyncGenerator[tuple[SSEEventType, SSEEvent], None]:
+    """Finish an analysis from a cached result with the same event sequence as
+    a fresh run (after its start/JD status events), without any LLM call."""
+    yield (
+        SSEEventType.STATUS_UPDATE,
+        StatusUpdateEvent(status=JdMatchStatus.THINKING),
+    )
+
+    for event in _result_block_events(cached_result.structured_score):
+        yield event
+
+    for event in _explanation_block_events(cached_result.explanation):
+        yield event
+
+    await save_jd_match_info(
+        _db_session,
+        jd_match_id=jd_match_id,
+        jd=cached_result.jd,
+        score_data=_score_data(
+            cached_result.structured_score,
+            cached_result.explanation,
+            cached_result.model,
+        ),
+    )
+    yield (
+        SSEEventType.STATUS_UPDATE,
+        StatusUpdateEvent(status=JdMatchStatus.MATCHED),
+    )
+    yield (
+        SSEEventType.ANALYSIS_DELTA,
+        AnalysisDeltaEvent(stop_reason=StopReason.COMPLETE),
+    )
+    yield (SSEEventType.ANALYSIS_STOP, AnalysisStopEvent())
+
+
+async def _fail_analysis(
+    jd_match_id: str, error: Exception, _db_session: AsyncSession
+) -> AsyncGenerator[tuple[SSEEventType, SSEEvent], None]:
+    await update_jd_match_status(
+        _db_session, jd_match_id, JdMatchStatus.FAILED.value, returning=False
+    )
+    await set_analysis_status(jd_match_id, JdMatchStatus.FAILED)
+    error_message = str(error) if str(error) else "Analysis failed"
+    yield (
+        SSEEventType.ERROR,
+        ErrorEvent(
+            message=error_message,
+            retryable=not isinstance(error, InvalidJdError),
+        ),
+    )
+    yield (
+        SSEEventType.ANALYSIS_DELTA,
+        AnalysisDeltaEvent(stop_reason=StopReason.ERROR),
+    )
+    yield (SSEEventType.ANALYSIS_STOP, AnalysisStopEvent())
 
 
 async def get_jd_match_status(
     jd_match_id: str,
-    _db_session: Session,
+    _db_session: AsyncSession,
 ) -> JdMatchStatusResponse:
     logger.info("getting status for {jd_match_id}", jd_match_id=jd_match_id)
 
+    status = await get_analysis_status(jd_match_id)
+    if status:
+        return JdMatchStatusResponse(status=status)
+
     jd_record = await get_jd_match_by_jd_match_id(_db_session, jd_match_id)
     if not jd_record:
         raise ValueError(f"No record found for jd_match_id: {jd_match_id}")
@@ -245,7 +1037,7 @@ async def get_jd_match_status(
 
 async def get_jd_match_analysis(
     jd_match_id: str,
-    _db_session: Session,
+    _db_session: AsyncSession,
 ) -> JdMatchAnalysisResponse:
     logger.info("getting analysis for {jd_match_id}", jd_match_id=jd_match_id)
 
@@ -260,4 +1052,5 @@ async def get_jd_match_analysis(
         matching_skills=jd_record.matching_skills,
         missing_skills=jd_record.missing_skills,
         explanation=jd_record.explanation,
+        score_model=jd_record.score_model,
     )
@@ -0,0 +1,52 @@
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.modules.jdmatch.constants import (
+    GREENHOUSE_JOB_PATTERN,
+    JD_URL_TRACKING_PARAMS,
+    LINKEDIN_JOB_ID_PATTERN,
+)
+
+
+def canonicalize_jd_url(jd_url: str) -> str:
+    """Reduce a JD link to a stable cache key: https, lowercase host without
+    ``www.``, no fragment, no tracking params, sorted query, and the LinkedIn /
+    Greenhouse posting forms collapsed to a single URL per job."""
+    url = jd_url.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+    parts = urlsplit(url)
+
+    host = parts.netloc.lower().removeprefix("www.")
+    path = parts.path.rstrip("/")
+    query = {
+        key: value
+        for key, value in parse_qsl(parts.query)
+        if key.lower() not in JD_URL_TRACKING_PARAMS
+        and not key.lower().startswith("utm_")
+    }
+
+    if host.endswith("linkedin.com"):
+        # /jobs/view/<slug>-<id>, /jobs/view/<id> and ?currentJobId=<id>
+        job_id = query.get("currentJobId")
+        match = re.search(LINKEDIN_JOB_ID_PATTERN, path)
+        if match:
+            job_id = match.group(1)
+        if job_id:
+            return f"https://linkedin.com/jobs/view/{job_id}"
+
+    if host in ("boards.greenhouse.io", "job-boards.greenhouse.io"):
+        # /<company>/jobs/<id> and /embed/job_app?for=<company>&token=<id>
+        match = re.search(GREENHOUSE_JOB_PATTERN, path)
+        if match:
+            return (
+                f"https://boards.greenhouse.io/{match.group(1)}/jobs/{match.group(2)}"
+            )
+        if "for" in query and "token" in query:
+            return f"https://boards.greenhouse.io/{query['for']}/jobs/{query['token']}"
+
+    if "gh_jid" in query:
+        # Greenhouse postings embedded on a company careers page
+        query = {"gh_jid": query["gh_jid"]}
+
+    return urlunsplit(("https", host, path, urlencode(sorted(query.items())), ""))
@@ -0,0 +1,27 @@
+from app.modules.jdmatch.constants import (
+    JD_CONFIDENT_MIN_HEADINGS,
+    JD_CONFIDENT_MIN_WORDS,
+    JD_SECTION_HEADINGS,
+)
+from app.modules.jdmatch.schemas import AgentResponseJDVerification
+
+
+def _section_heading(line: str) -> str | None:
+    heading = " ".join(line.strip("#*-• \t").rstrip(":").split()).lower()
+    return heading if heading in JD_SECTION_HEADINGS else None
+
+
+def classify_jd_text(text: str) -> AgentResponseJDVerification | None:
+    """Cheap local verdict for pasted JD text.
+
+    Returns a verdict only when the text is obviously a job posting: long and
+    laid out under several typical JD section headings. Anything else,
+    including very short text, returns ``None`` and is left to the LLM.
+    """
+    if len(text.split()) < JD_CONFIDENT_MIN_WORDS:
+        return None
+
+    headings = {_section_heading(line) for line in text.splitlines()} - {None}
+    if len(headings) >= JD_CONFIDENT_MIN_HEADINGS:
+        return AgentResponseJDVerification(is_jd=True, reason="")
+    return None
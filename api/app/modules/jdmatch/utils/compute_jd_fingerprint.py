@@ -0,0 +1,8 @@
+import hashlib
+
+
+def compute_jd_fingerprint(jd_info: str) -> str:
+    """Hash JD text after collapsing whitespace and case, so trivially
+    different pastes of the same JD share a fingerprint."""
+    normalized = " ".join(jd_info.split()).lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
@@ -1,40 +1,31 @@
 import os
-import tempfile
 
 from fastapi import HTTPException
 
 from app.core.logging.logger import get_logger
-from app.modules.jdmatch.utils.doc_to_pdf import doc_to_pdf
+from app.modules.jdmatch.cache.conversion_cache import get_conversion_cache
+from app.modules.jdmatch.schemas import SpooledResume
+from app.modules.jdmatch.utils.cleanup_file import cleanup_file
 
 logger = get_logger("jdmatch.utils.convert_doc_to_pdf_if_needed")
 
 
-async def convert_doc_to_pdf_if_needed(
-    file_content: bytes, filename: str
-) -> tuple[bytes, str]:
-    """Convert .doc, .docx to pdf if needed."""
-    if not filename.lower().endswith((".doc", ".docx")):
-        return file_content, filename
+async def convert_doc_to_pdf_if_needed(resume: SpooledResume) -> SpooledResume:
+    """Convert .doc, .docx to pdf if needed. The original spool file is
+    replaced by the converted one."""
+    if not resume.filename.lower().endswith((".doc", ".docx")):
+        return resume
 
-    logger.info(f"Converting {filename} to PDF")
+    logger.info(f"Converting {resume.filename} to PDF")
     try:
-        with tempfile.NamedTemporaryFile(
-            suffix=os.path.splitext(filename)[1], delete=False
-        ) as tmp:
-            tmp.write(file_content)
-            tmp_path = tmp.name
-
-        try:
-            pdf_content = await doc_to_pdf(tmp_path)
-            new_filename = os.path.splitext(filename)[0] + ".pdf"
-            return pdf_content, new_filename
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
-                logger.debug(f"Cleaned up temp file {tmp_path}")
-
+        converted = await get_conversion_cache().get_or_convert(resume)
     except Exception as e:
         logger.error(f"Conversion failed: {e!s}")
         raise HTTPException(
             status_code=500, detail=f"Failed to convert document to PDF: {e!s}"
         )
+    finally:
+        cleanup_file(resume.path)
+
+    new_filename = os.path.splitext(resume.filename)[0] + ".pdf"
+    return converted.model_copy(update={"filename": new_filename})
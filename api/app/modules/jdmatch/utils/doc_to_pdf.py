@@ -1,27 +1,46 @@
 import os
+from pathlib import Path
 
 import httpx
 
 from app.core.config import settings
 from app.core.logging.logger import get_logger
+from app.integrations.http.client import HttpUpstream, get_http_client
+from app.integrations.resilience.breakers import Dependency, get_circuit_breaker
+from app.modules.jdmatch.schemas import SpooledResume
+from app.modules.jdmatch.utils.spool_resume import spool_resume
 
 logger = get_logger("jdmatch.utils.doc_to_pdf")
 
 
-async def doc_to_pdf(file_path: str) -> bytes:
+async def doc_to_pdf(
+    file_path: str, client: httpx.AsyncClient | None = None
+) -> SpooledResume:
     """
-    Convert .doc, .docx to pdf
+    Convert .doc, .docx to pdf, streaming the result to a temp file.
+    The whole conversion is bounded by the Gotenberg circuit breaker.
     """
     url = f"{settings.DOC_TO_PDF_API_URL}/forms/libreoffice/convert"
+    http_client = client or get_http_client(HttpUpstream.doc_to_pdf)
 
-    async with httpx.AsyncClient() as client:
-        try:
-            with open(file_path, "rb") as f:
-                files = {"files": (os.path.basename(file_path), f)}
-                logger.info(f"Converting {file_path} to PDF via {url}")
-                response = await client.post(url, files=files)
-                response.raise_for_status()
-                return response.content
-        except Exception as e:
-            logger.error(f"Failed to convert doc to pdf: {e!s}")
-            raise e
+    try:
+        return await get_circuit_breaker(Dependency.doc_to_pdf).call(
+            lambda: _convert(file_path, url, http_client)
+        )
+    except Exception as e:
+        logger.error(f"Failed to convert doc to pdf: {e!s}")
+        raise e
+
+
+async def _convert(
+    file_path: str, url: str, client: httpx.AsyncClient
+) -> SpooledResume:
+    with open(file_path, "rb") as f:
+        files = {"files": (os.path.basename(file_path), f)}
+        logger.info(f"Converting {file_path} to PDF via {url}")
+        async with client.stream("POST", url, files=files) as response:
+            response.raise_for_status()
+            return await spool_resume(
+                response.aiter_bytes(settings.RESUME_CHUNK_BYTES),
+                f"{Path(file_path).stem}.pdf",
+            )
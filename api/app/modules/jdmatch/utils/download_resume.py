@@ -1,10 +1,14 @@
 import httpx
 from fastapi import HTTPException
 
+from app.core.config import settings
 from app.core.logging.logger import get_logger
+from app.integrations.http.client import HttpUpstream, get_http_client
+from app.modules.jdmatch.schemas import SpooledResume
 from app.modules.jdmatch.utils.extract_filename_from_response import (
     extract_filename_from_response,
 )
+from app.modules.jdmatch.utils.spool_resume import spool_resume
 from app.modules.jdmatch.utils.transform_download_url import (
     transform_download_url,
 )
@@ -12,40 +16,57 @@ from app.modules.jdmatch.utils.transform_download_url import (
 logger = get_logger("jdmatch.utils.download_resume")
 
 
-async def download_resume(resume_url: str) -> tuple[bytes, str, str | None]:
-    """Download resume from URL and determine filename/file_id."""
+async def download_resume(
+    resume_url: str, client: httpx.AsyncClient | None = None
+) -> tuple[SpooledResume, str | None]:
+    """Stream resume from URL to a temp file and determine filename/file_id."""
     download_url, file_id = transform_download_url(resume_url)
+    client = client or get_http_client(HttpUpstream.resume_download)
 
-    async with httpx.AsyncClient() as client:
-        try:
-            logger.info(f"Downloading from URL: {download_url}")
-            response = await client.get(download_url, follow_redirects=True)
+    try:
+        logger.info(f"Downloading from URL: {download_url}")
+        async with client.stream(
+            "GET", download_url, follow_redirects=True
+        ) as response:
             response.raise_for_status()
+            _check_response(response)
 
-            # Validate Content-Type
-            content_type = response.headers.get("content-type", "")
-            logger.debug(f"Download Content-Type: {content_type}")
-            supported_types = [
-                "application/pdf",
-                "application/octet-stream",
-                "officedocument",
-                "msword",
-            ]
-            if not any(t in content_type for t in supported_types):
-                logger.error(f"Invalid Content-Type: {content_type}")
-                raise HTTPException(
-                    status_code=400,
-                    detail="URL did not return a supported file (PDF, DOC, DOCX)",
-                )
-
-            file_content = response.content
             filename = extract_filename_from_response(response, download_url)
-            return file_content, filename, file_id
-
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Download failed: {e!s}")
-            raise HTTPException(
-                status_code=400, detail=f"Failed to download resume from URL: {e!s}"
+            resume = await spool_resume(
+                response.aiter_bytes(settings.RESUME_CHUNK_BYTES), filename
             )
+            return resume, file_id
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Download failed: {e!s}")
+        raise HTTPException(
+            status_code=400, detail=f"Failed to download resume from URL: {e!s}"
+        )
+
+
+def _check_response(response: httpx.Response) -> None:
+    """Reject a response that isn't a resume, or is too large to spool."""
+    content_type = response.headers.get("content-type", "")
+    logger.debug(f"Download Content-Type: {content_type}")
+    supported_types = [
+        "application/pdf",
+        "application/octet-stream",
+        "officedocument",
+        "msword",
+    ]
+    if not any(t in content_type for t in supported_types):
+        logger.error(f"Invalid Content-Type: {content_type}")
+        raise HTTPException(
+            status_code=400,
+            detail="URL did not return a supported file (PDF, DOC, DOCX)",
+        )
+
+    content_length = int(response.headers.get("content-length") or 0)
+    if content_length > settings.RESUME_MAX_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Resume is larger than "
+            f"{settings.RESUME_MAX_BYTES // 1024 // 1024} MB",
+        )
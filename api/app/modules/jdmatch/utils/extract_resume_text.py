@@ -0,0 +1,36 @@
+from pypdf import PdfReader
+from pypdf.errors import PyPdfError
+
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.modules.jdmatch.schemas import ParsedResume
+from app.modules.jdmatch.utils.structure_resume_text import structure_resume_text
+
+logger = get_logger("jdmatch.utils.extract_resume_text")
+
+
+def extract_resume_text(path: str) -> ParsedResume:
+    """Read the text layer of a resume PDF with pypdf (blocking; run it in a
+    thread). Scanned/image-only or unreadable PDFs come back with empty text."""
+    try:
+        reader = PdfReader(path)
+        pages = [page.extract_text() or "" for page in reader.pages]
+    except PyPdfError as e:
+        logger.warning(
+            "Could not read PDF text from {path}: {error}", path=path, error=str(e)
+        )
+        return ParsedResume(text="", sections=[], page_count=0)
+
+    text, sections = structure_resume_text(pages)
+    if len(text) < settings.RESUME_TEXT_MIN_CHARS_PER_PAGE * max(len(pages), 1):
+        logger.info(
+            "PDF {path} has too little text for {pages} pages; treating it as scanned",
+            path=path,
+            pages=len(pages),
+        )
+        return ParsedResume(text="", sections=[], page_count=len(pages))
+    return ParsedResume(
+        text=text[: settings.RESUME_TEXT_MAX_CHARS],
+        sections=sections,
+        page_count=len(pages),
+    )
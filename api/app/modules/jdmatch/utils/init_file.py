@@ -1,17 +1,20 @@
 import uuid
+from collections.abc import AsyncIterator
 
-from fastapi import HTTPException
+from fastapi import HTTPException, UploadFile
 
+from app.core.config import settings
 from app.core.logging.logger import get_logger
-from app.modules.jdmatch.utils.convert_doc_to_pdf_if_needed import (
-    convert_doc_to_pdf_if_needed,
-)
+from app.modules.jdmatch.schemas import SpooledResume
 from app.modules.jdmatch.utils.download_resume import download_resume
+from app.modules.jdmatch.utils.spool_resume import spool_resume
 
 logger = get_logger("jdmatch.utils.init_file")
 
 
-async def init_file(file, resume_url, file_id: str | None = None):
+async def init_file(
+    file, resume_url, file_id: str | None = None
+) -> tuple[SpooledResume, str]:
     logger.info(
         f"starting init_file() > file={file.filename if file else 'None'}, resume_url={resume_url}"
     )
@@ -24,15 +27,17 @@ async def init_file(file, resume_url, file_id: str | None = None):
 
     if file:
         logger.info(f"Processing uploaded file: {file.filename}")
-        file_content = await file.read()
-        filename = file.filename
+        resume = await spool_resume(_iter_upload_file(file), file.filename)
         file_id = file_id or str(uuid.uuid4())
     else:
         logger.info(f"Processing resume_url: {resume_url}")
-        file_content, filename, _file_id = await download_resume(resume_url)
+        resume, _file_id = await download_resume(resume_url)
         # Use the provided file_id if it exists, otherwise use the one from download
         file_id = file_id or _file_id or str(uuid.uuid4())
 
-    file_content, filename = await convert_doc_to_pdf_if_needed(file_content, filename)
+    return resume, file_id
 
-    return file_content, filename, file_id
+
+async def _iter_upload_file(file: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await file.read(settings.RESUME_CHUNK_BYTES):
+        yield chunk
@@ -0,0 +1,25 @@
+import zipfile
+from pathlib import PurePosixPath
+
+from fastapi import HTTPException
+
+from app.modules.jdmatch.constants import RANKING_ZIP_RESUME_SUFFIXES
+
+
+def list_zip_resumes(zip_path: str) -> list[str]:
+    """Names of the resume files (PDF/DOC/DOCX) in a zip, skipping folders,
+    hidden files and macOS resource forks."""
+    if not zipfile.is_zipfile(zip_path):
+        raise HTTPException(status_code=400, detail="Upload is not a valid zip file")
+
+    with zipfile.ZipFile(zip_path) as archive:
+        names = []
+        for info in archive.infolist():
+            path = PurePosixPath(info.filename)
+            if info.is_dir() or any(
+                part.startswith((".", "__MACOSX")) for part in path.parts
+            ):
+                continue
+            if path.suffix.lower() in RANKING_ZIP_RESUME_SUFFIXES:
+                names.append(info.filename)
+    return names
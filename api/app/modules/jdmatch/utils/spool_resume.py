@@ -0,0 +1,89 @@
+import hashlib
+import os
+import tempfile
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.logging.logger import get_logger
+from app.modules.jdmatch.schemas import SpooledResume
+
+logger = get_logger("jdmatch.utils.spool_resume")
+
+# Leading bytes of the formats we accept: PDF, DOCX (zip) and legacy DOC (OLE2)
+_MAGIC_EXTENSIONS = {
+    b"%PDF-": ".pdf",
+    b"PK\x03\x04": ".docx",
+    b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1": ".doc",
+}
+_MAGIC_LENGTH = max(len(magic) for magic in _MAGIC_EXTENSIONS)
+
+
+async def spool_resume(chunks: AsyncIterator[bytes], filename: str) -> SpooledResume:
+    """Stream a resume into a temp file, hashing it, checking its magic bytes
+    and enforcing ``RESUME_MAX_BYTES`` on the way, so memory stays flat
+    whatever the file size. The caller owns (and must clean up) the file."""
+    max_bytes = settings.RESUME_MAX_BYTES
+    digest = hashlib.sha256()
+    head = b""
+    size = 0
+
+    fd, spool_path = tempfile.mkstemp(prefix="resume-")
+    try:
+        with os.fdopen(fd, "wb") as spool:
+            async for chunk in chunks:
+                size += len(chunk)
+                _check_size(size, max_bytes)
+                if len(head) < _MAGIC_LENGTH:
+                    head += chunk[: _MAGIC_LENGTH - len(head)]
+                    if len(head) == _MAGIC_LENGTH:
+                        # Reject e.g. an HTML login page before downloading it all
+                        _detect_extension(head)
+                digest.update(chunk)
+                spool.write(chunk)
+
+        extension = _detect_extension(head)
+        # Keep a real extension on disk: Gemini and Gotenberg sniff it
+        path = f"{spool_path}{extension}"
+        Path(spool_path).replace(path)
+    except BaseException:
+        Path(spool_path).unlink(missing_ok=True)
+        raise
+
+    logger.info(
+        "Spooled {filename} ({size} bytes) to {path}",
+        filename=filename,
+        size=size,
+        path=path,
+    )
+    return SpooledResume(
+        path=path,
+        filename=_with_extension(filename, extension),
+        content_hash=digest.hexdigest(),
+        size=size,
+    )
+
+
+def _check_size(size: int, max_bytes: int) -> None:
+    if size > max_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Resume is larger than {max_bytes // 1024 // 1024} MB",
+        )
+
+
+def _detect_extension(head: bytes) -> str:
+    for magic, extension in _MAGIC_EXTENSIONS.items():
+        if head.startswith(magic):
+            return extension
+    raise HTTPException(
+        status_code=400, detail="Resume is not a supported file (PDF, DOC, DOCX)"
+    )
+
+
+def _with_extension(filename: str, extension: str) -> str:
+    if Path(filename).suffix.lower() == extension:
+        return filename
+    return f"{Path(filename).stem}{extension}"
@@ -0,0 +1,36 @@
+from app.modules.jdmatch.constants import RESUME_SECTION_HEADINGS
+
+# Headings are short lines; anything longer is body text that happens to
+# start with a heading word
+_MAX_HEADING_CHARS = 40
+
+
+def structure_resume_text(pages: list[str]) -> tuple[str, list[str]]:
+    """Compact the raw text of a resume's pages for the LLM.
+
+    Whitespace runs collapse to one space and blank lines are dropped; lines
+    that are known section headings become ``## <Section>`` markers. Returns
+    the text and the sections found, in order.
+    """
+    lines: list[str] = []
+    sections: list[str] = []
+    for page in pages:
+        for raw_line in page.splitlines():
+            line = " ".join(raw_line.split())
+            if not line:
+                continue
+            section = _section_heading(line)
+            if section:
+                if section not in sections:
+                    sections.append(section)
+                lines.append(f"\n## {section}")
+            else:
+                lines.append(line)
+
+    return "\n".join(lines).strip(), sections
+
+
+def _section_heading(line: str) -> str | None:
+    if len(line) > _MAX_HEADING_CHARS:
+        return None
+    return RESUME_SECTION_HEADINGS.get(line.rstrip(":").strip().lower())
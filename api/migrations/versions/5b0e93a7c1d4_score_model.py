@@ -0,0 +1,32 @@
+"""score model
+
+Revision ID: 5b0e93a7c1d4
+Revises: d41f7c9e2b6a
+Create Date: 2026-10-18 21:10:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b0e93a7c1d4"
+down_revision: str | Sequence[str] | None = "d41f7c9e2b6a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "jdmatchdtl",
+        sa.Column("score_model", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("jdmatchdtl", "score_model")
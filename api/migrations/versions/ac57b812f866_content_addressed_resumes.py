@@ -0,0 +1,61 @@
+"""content addressed resumes
+
+Revision ID: ac57b812f866
+Revises: 7a05941e401b
+Create Date: 2026-10-18 18:20:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "ac57b812f866"
+down_revision: str | Sequence[str] | None = "7a05941e401b"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "resume",
+        sa.Column("id", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("file_name", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("supabase_url", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("pdf_url", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.add_column(
+        "jdmatchdtl",
+        sa.Column("resume_id", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_jdmatchdtl_resume_id"), "jdmatchdtl", ["resume_id"], unique=False
+    )
+    op.create_foreign_key(
+        "fk_jdmatchdtl_resume_id_resume", "jdmatchdtl", "resume", ["resume_id"], ["id"]
+    )
+    # The same resume (e.g. one Drive link) can now be matched against many JDs
+    op.drop_index(op.f("ix_jdmatchdtl_file_id"), table_name="jdmatchdtl")
+    op.create_index(
+        op.f("ix_jdmatchdtl_file_id"), "jdmatchdtl", ["file_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_jdmatchdtl_file_id"), table_name="jdmatchdtl")
+    op.create_index(
+        op.f("ix_jdmatchdtl_file_id"), "jdmatchdtl", ["file_id"], unique=True
+    )
+    op.drop_constraint(
+        "fk_jdmatchdtl_resume_id_resume", "jdmatchdtl", type_="foreignkey"
+    )
+    op.drop_index(op.f("ix_jdmatchdtl_resume_id"), table_name="jdmatchdtl")
+    op.drop_column("jdmatchdtl", "resume_id")
+    op.drop_table("resume")
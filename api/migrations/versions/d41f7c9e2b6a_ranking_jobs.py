@@ -0,0 +1,65 @@
+"""ranking jobs
+
+Revision ID: d41f7c9e2b6a
+Revises: ac57b812f866
+Create Date: 2026-10-18 20:05:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d41f7c9e2b6a"
+down_revision: str | Sequence[str] | None = "ac57b812f866"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "rankingjob",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("jd_info", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("jd", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("status", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("source_zip", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("completed", sa.Integer(), nullable=False),
+        sa.Column("failed", sa.Integer(), nullable=False),
+        sa.Column("error", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.add_column(
+        "jdmatchdtl",
+        sa.Column("ranking_job_id", sa.Uuid(), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_jdmatchdtl_ranking_job_id"),
+        "jdmatchdtl",
+        ["ranking_job_id"],
+        unique=False,
+    )
+    op.create_foreign_key(
+        "fk_jdmatchdtl_ranking_job_id_rankingjob",
+        "jdmatchdtl",
+        "rankingjob",
+        ["ranking_job_id"],
+        ["id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        "fk_jdmatchdtl_ranking_job_id_rankingjob", "jdmatchdtl", type_="foreignkey"
+    )
+    op.drop_index(op.f("ix_jdmatchdtl_ranking_job_id"), table_name="jdmatchdtl")
+    op.drop_column("jdmatchdtl", "ranking_job_id")
+    op.drop_table("rankingjob")
@@ -4,7 +4,7 @@ import pytest
 from httpx import ASGITransport, AsyncClient
 
 from app.integrations.browser_use.agent import get_browser_use_client
-from app.integrations.db.database import get_session
+from app.integrations.db.database import get_async_session
 from app.integrations.llm.gemini import get_gemini_client
 from app.integrations.redis.store import get_redis_store
 from app.integrations.upstash.qstash import get_qstash_client, get_qstash_consumer
@@ -45,7 +45,7 @@ def mock_browser_use():
 async def client(
     mock_session, mock_redis, mock_qstash, mock_receiver, mock_gemini, mock_browser_use
 ):
-    def _get_session_override():
+    async def _get_session_override():
         yield mock_session
 
     def _get_redis_override():
@@ -63,7 +63,7 @@ async def client(
     def _get_browser_use_client_override():
         return mock_browser_use
 
-    app.dependency_overrides[get_session] = _get_session_override
+    app.dependency_overrides[get_async_session] = _get_session_override
     app.dependency_overrides[get_redis_store] = _get_redis_override
     app.dependency_overrides[get_qstash_client] = _get_qstash_client_override
     app.dependency_overrides[get_qstash_consumer] = _get_qstash_consumer_override
@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+from fakeredis import aioredis as fakeredis
+
+from app.core.config import settings
+from app.modules.jdmatch import progress
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(progress, "get_redis_store", lambda: redis)
+    return redis
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_keeps_a_quiet_run_leased(redis, monkeypatch):
+    monkeypatch.setattr(settings, "PROGRESS_LEASE_SECONDS", 1)
+    assert await progress.acquire_analysis_lease("1")
+
+    async with progress.analysis_lease_heartbeat("1"):
+        # No events for longer than the lease
+        await asyncio.sleep(1.5)
+        assert await progress.is_analysis_running("1")
+        assert not await progress.acquire_analysis_lease("1")
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_stops_with_the_run(redis, monkeypatch):
+    monkeypatch.setattr(settings, "PROGRESS_LEASE_SECONDS", 1)
+    assert await progress.acquire_analysis_lease("1")
+
+    async with progress.analysis_lease_heartbeat("1"):
+        pass
+    await asyncio.sleep(1.2)
+
+    assert not await progress.is_analysis_running("1")
@@ -0,0 +1,115 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.api.v1.dto.jdmatch import (
+    ContentBlockDeltaEvent,
+    ResultDelta,
+    ScoreDelta,
+    SkillDelta,
+    StatusUpdateEvent,
+    TextDelta,
+)
+from app.core.config import settings
+from app.modules.jdmatch import service
+from app.modules.jdmatch.agents import generate_candidate_score
+from app.modules.jdmatch.constants import JdMatchStatus
+
+_RESPONSE = {
+    "score": 72,
+    "matching_skills": ["python", "sql"],
+    "missing_skills": ["go"],
+    "explanation": 'A solid "backend" fit.\nNeeds Go.',
+}
+
+
+@pytest.fixture
+def single_call(monkeypatch):
+    """One streamed Gemini response (in small chunks) through the real agent
+    and parser; the JD, resume, database and result cache are stubbed."""
+    monkeypatch.setattr(settings, "ANALYSIS_MODE", "single_call")
+    raw = json.dumps(_RESPONSE)
+
+    async def chunks():
+        for start in range(0, len(raw), 7):
+            yield SimpleNamespace(text=raw[start : start + 7])
+
+    async def stream(_scope, open_stream):
+        async for chunk in await open_stream():
+            yield chunk
+
+    gemini = MagicMock()
+    gemini.aio.models.generate_content_stream = AsyncMock(
+        side_effect=lambda **_: chunks()
+    )
+    monkeypatch.setattr(
+        generate_candidate_score,
+        "get_gemini_governor",
+        lambda: MagicMock(stream=stream),
+    )
+    monkeypatch.setattr(
+        generate_candidate_score,
+        "get_gemini_context_cache_manager",
+        lambda: MagicMock(acquire=AsyncMock(return_value=None)),
+    )
+
+    stub = MagicMock(gemini=gemini)
+    stub.save_jd_match_info = AsyncMock()
+    stub.set_cached_result = AsyncMock()
+    for name, value in {
+        "get_jd_match_by_jd_match_id": AsyncMock(
+            return_value=MagicMock(jd="Backend engineer", resume_url="resume.pdf")
+        ),
+        "_gather_analysis_inputs": AsyncMock(
+            return_value=(
+                "Backend engineer",
+                service._PreparedResume(content_hash="hash", resume_input="resume"),
+            )
+        ),
+        "release_resume_input": MagicMock(),
+        "save_jd_match_info": stub.save_jd_match_info,
+        "set_cached_result": stub.set_cached_result,
+    }.items():
+        monkeypatch.setattr(service, name, value)
+    return stub
+
+
+@pytest.mark.asyncio
+async def test_single_call_streams_the_result_ahead_of_the_explanation(single_call):
+    events = [
+        event
+        async for _, event in service._run_jd_match_analysis(
+            "1", single_call.gemini, MagicMock()
+        )
+    ]
+
+    deltas = [
+        (event.index, event.delta)
+        for event in events
+        if isinstance(event, ContentBlockDeltaEvent)
+    ]
+    result = [delta for index, delta in deltas if index == 0]
+    assert result == [
+        ScoreDelta(score=72),
+        SkillDelta(field="matching_skills", skill="python"),
+        SkillDelta(field="matching_skills", skill="sql"),
+        SkillDelta(field="missing_skills", skill="go"),
+        ResultDelta(score=72, matching_skills=["python", "sql"], missing_skills=["go"]),
+    ]
+    text = [delta for index, delta in deltas if index == 1]
+    assert all(isinstance(delta, TextDelta) for delta in text)
+    assert "".join(delta.text for delta in text) == _RESPONSE["explanation"]
+    assert StatusUpdateEvent(status=JdMatchStatus.MATCHED) in events
+
+    single_call.gemini.aio.models.generate_content_stream.assert_awaited_once()
+    single_call.save_jd_match_info.assert_awaited_once()
+    assert single_call.save_jd_match_info.await_args.kwargs["score_data"] == {
+        "score": 72,
+        "matching_skills": ["python", "sql"],
+        "missing_skills": ["go"],
+        "explanation": _RESPONSE["explanation"],
+        "model": settings.get_single_call_model(),
+    }
+    single_call.set_cached_result.assert_awaited_once()
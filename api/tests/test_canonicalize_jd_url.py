@@ -0,0 +1,36 @@
+import pytest
+
+from app.modules.jdmatch.utils.canonicalize_jd_url import canonicalize_jd_url
+
+
+@pytest.mark.parametrize(
+    ("jd_url", "expected"),
+    [
+        (
+            "https://www.linkedin.com/jobs/view/engineer-at-acme-3912345678/?trk=abc",
+            "https://linkedin.com/jobs/view/3912345678",
+        ),
+        (
+            "linkedin.com/jobs/collections/recommended/?currentJobId=3912345678",
+            "https://linkedin.com/jobs/view/3912345678",
+        ),
+        (
+            "https://job-boards.greenhouse.io/acme/jobs/4001234?gh_src=abc",
+            "https://boards.greenhouse.io/acme/jobs/4001234",
+        ),
+        (
+            "https://boards.greenhouse.io/embed/job_app?for=acme&token=4001234",
+            "https://boards.greenhouse.io/acme/jobs/4001234",
+        ),
+        (
+            "https://careers.acme.com/roles/?gh_jid=4001234&utm_campaign=launch",
+            "https://careers.acme.com/roles?gh_jid=4001234",
+        ),
+        (
+            "https://Example.com/jobs/42/?b=2&a=1&utm_medium=email#apply",
+            "https://example.com/jobs/42?a=1&b=2",
+        ),
+    ],
+)
+def test_canonicalize_jd_url(jd_url, expected):
+    assert canonicalize_jd_url(jd_url) == expected
@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from app.core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    hedged,
+)
+
+
+class _NotFoundError(Exception):
+    status_code = 404
+
+
+def _breaker(**kwargs) -> CircuitBreaker:
+    options = {
+        "timeout_seconds": 1.0,
+        "failure_threshold": 2,
+        "reset_seconds": 0.05,
+        "is_failure": lambda e: not isinstance(e, _NotFoundError),
+    }
+    return CircuitBreaker("test", **(options | kwargs))
+
+
+async def _fail() -> int:
+    raise ConnectionError("down")
+
+
+async def _ok() -> int:
+    return 1
+
+
+@pytest.mark.asyncio
+async def test_opens_after_consecutive_failures_and_fails_fast():
+    breaker = _breaker()
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await breaker.call(_fail)
+
+    assert breaker.state == CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(_ok)
+    assert breaker.stats().rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_closes_or_reopens():
+    breaker = _breaker()
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await breaker.call(_fail)
+
+    await asyncio.sleep(0.06)
+    assert breaker.state == CircuitState.HALF_OPEN
+    with pytest.raises(ConnectionError):
+        await breaker.call(_fail)
+    # A failed probe opens the breaker again straight away
+    assert breaker.state == CircuitState.OPEN
+
+    await asyncio.sleep(0.06)
+    assert await breaker.call(_ok) == 1
+    assert breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_only_one_probe_while_half_open():
+    breaker = _breaker()
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await breaker.call(_fail)
+    await asyncio.sleep(0.06)
+
+    async def slow() -> int:
+        await asyncio.sleep(0.02)
+        return 1
+
+    results = await asyncio.gather(
+        breaker.call(slow), breaker.call(slow), return_exceptions=True
+    )
+
+    assert results[0] == 1
+    assert isinstance(results[1], CircuitOpenError)
+    assert breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_timeouts_count_and_client_errors_do_not():
+    breaker = _breaker(timeout_seconds=0.01)
+
+    async def not_found() -> int:
+        raise _NotFoundError
+
+    async def hang() -> int:
+        await asyncio.sleep(1)
+        return 1
+
+    for _ in range(3):
+        with pytest.raises(_NotFoundError):
+            await breaker.call(not_found)
+    assert breaker.state == CircuitState.CLOSED
+
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            await breaker.call(hang)
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.stats().timeouts == 2
+
+
+@pytest.mark.asyncio
+async def test_hedge_takes_the_faster_copy_and_cancels_the_other():
+    delays = [1.0, 0.01]
+    cancelled = []
+
+    async def call() -> float:
+        delay = delays.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    assert await hedged(call, delay=0.02) == 0.01
+    await asyncio.sleep(0)
+    assert cancelled == [1.0]
+
+
+@pytest.mark.asyncio
+async def test_hedge_is_not_sent_for_fast_calls():
+    calls = 0
+
+    async def call() -> int:
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await hedged(call, delay=0.05) == 1
+    assert calls == 1
@@ -0,0 +1,69 @@
+from app.modules.jdmatch.utils.classify_jd_text import classify_jd_text
+
+_JD = """
+    About the role
+    We are looking for a backend engineer to own our matching pipeline.
+
+    Responsibilities
+    - Design, build and operate Python services on FastAPI and Postgres
+    - Work with product and data teams to ship features end to end
+    - Keep latency and cost of our LLM integrations in check
+
+    Requirements
+    - 4+ years of experience building production web services
+    - Strong Python, SQL and async programming skills
+    - Familiarity with Redis, queues and cloud deployments
+
+    Benefits
+    - Remote-first team, flexible hours, learning budget and health insurance
+"""
+
+
+_RESUME = """
+    Jane Doe, Senior Backend Engineer
+
+    Experience
+    - Owned responsibilities for the billing platform and its requirements
+      gathering, working with product on benefits enrollment features
+    - Met qualifications for the on-call rotation after two years of experience
+    - Built Python services on FastAPI and Postgres serving millions of users
+
+    Skills
+    Python, SQL, Redis, async programming, cloud deployments, observability,
+    API design, mentoring, incident response, cost and latency optimisation
+"""
+
+
+def test_short_text_is_left_to_the_llm():
+    assert classify_jd_text("Software Engineer") is None
+
+
+def test_structured_posting_is_a_jd():
+    verdict = classify_jd_text(_JD)
+
+    assert verdict is not None
+    assert verdict.is_jd is True
+
+
+def test_ambiguous_text_is_left_to_the_llm():
+    text = " ".join(["Looking for someone who knows Python and likes data."] * 5)
+
+    assert classify_jd_text(text) is None
+
+
+def test_marker_words_outside_headings_are_left_to_the_llm():
+    assert classify_jd_text(_RESUME * 2) is None
+
+
+def test_headings_may_carry_markdown_and_colons():
+    text = (
+        _JD.replace("About the role", "## About the role:")
+        .replace("Responsibilities", "**Responsibilities**")
+        .replace("Requirements", "Requirements:")
+    )
+
+    assert classify_jd_text(text) == classify_jd_text(_JD)
+
+
+def test_markers_are_matched_case_and_whitespace_insensitively():
+    assert classify_jd_text(_JD.upper().replace(" ", "   ")) == classify_jd_text(_JD)
@@ -0,0 +1,50 @@
+from pypdf import PdfWriter
+
+from app.modules.jdmatch.utils.extract_resume_text import extract_resume_text
+from app.modules.jdmatch.utils.structure_resume_text import structure_resume_text
+
+
+def test_marks_known_headings_and_compacts_whitespace():
+    pages = [
+        "Jane   Doe\n\nBackend engineer\nWORK EXPERIENCE\nAcme   Corp  2020-2024",
+        "Skills:\nPython,  Go\n\nEducation\nBSc Computer Science",
+    ]
+
+    text, sections = structure_resume_text(pages)
+
+    assert sections == ["Experience", "Skills", "Education"]
+    assert text == (
+        "Jane Doe\nBackend engineer\n"
+        "\n## Experience\nAcme Corp 2020-2024\n"
+        "\n## Skills\nPython, Go\n"
+        "\n## Education\nBSc Computer Science"
+    )
+
+
+def test_long_lines_starting_with_a_heading_are_body_text():
+    text, sections = structure_resume_text(
+        ["Experience building distributed systems at scale for fintech clients"]
+    )
+
+    assert sections == []
+    assert not text.startswith("##")
+
+
+def test_pdf_without_a_text_layer_is_treated_as_scanned(tmp_path):
+    path = tmp_path / "scan.pdf"
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    with path.open("wb") as pdf:
+        writer.write(pdf)
+
+    parsed = extract_resume_text(str(path))
+
+    assert parsed.text == ""
+    assert parsed.page_count == 1
+
+
+def test_unreadable_pdf_is_treated_as_scanned(tmp_path):
+    path = tmp_path / "broken.pdf"
+    path.write_bytes(b"not a pdf")
+
+    assert extract_resume_text(str(path)).text == ""
@@ -0,0 +1,87 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from google.genai import errors, types
+
+from app.core.config import settings
+from app.integrations.llm import batches
+from app.integrations.llm.batches import wait_for_batch
+
+_RUNNING = types.BatchJob(name="batches/1", state=types.JobState.JOB_STATE_RUNNING)
+_SUCCEEDED = types.BatchJob(name="batches/1", state=types.JobState.JOB_STATE_SUCCEEDED)
+
+
+@pytest.fixture(autouse=True)
+def governor(monkeypatch):
+    """Pass polls straight through; the governor's own retries are tested in
+    test_gemini_limiter."""
+
+    async def call(scope, request):
+        return await request()
+
+    monkeypatch.setattr(
+        batches,
+        "get_gemini_governor",
+        lambda: MagicMock(call=AsyncMock(side_effect=call)),
+    )
+
+
+def _gemini(*results):
+    gemini = MagicMock()
+    gemini.aio.batches.get = AsyncMock(side_effect=results)
+    return gemini
+
+
+@pytest.mark.asyncio
+async def test_wait_reports_state_changes_until_the_batch_ends():
+    gemini = _gemini(_RUNNING, _RUNNING, _SUCCEEDED)
+    on_update = AsyncMock()
+
+    with patch("app.integrations.llm.batches.asyncio.sleep"):
+        batch_job = await wait_for_batch(gemini, "batches/1", 1, on_update)
+
+    assert batch_job is _SUCCEEDED
+    assert [call.args[0] for call in on_update.await_args_list] == [
+        _RUNNING,
+        _SUCCEEDED,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_transient_poll_failures_keep_waiting():
+    gemini = _gemini(
+        _RUNNING,
+        errors.ServerError(503, {"error": {}}),
+        TimeoutError(),
+        _SUCCEEDED,
+    )
+
+    with patch("app.integrations.llm.batches.asyncio.sleep"):
+        batch_job = await wait_for_batch(gemini, "batches/1", 1)
+
+    assert batch_job is _SUCCEEDED
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_raised():
+    gemini = _gemini(errors.ClientError(404, {"error": {}}))
+
+    with (
+        patch("app.integrations.llm.batches.asyncio.sleep"),
+        pytest.raises(errors.ClientError),
+    ):
+        await wait_for_batch(gemini, "batches/1", 1)
+
+
+@pytest.mark.asyncio
+async def test_polling_gives_up_after_too_many_failures_in_a_row(monkeypatch):
+    monkeypatch.setattr(settings, "OFFLINE_BATCH_MAX_POLL_FAILURES", 2)
+    gemini = _gemini(TimeoutError(), _RUNNING, TimeoutError(), TimeoutError())
+
+    with (
+        patch("app.integrations.llm.batches.asyncio.sleep"),
+        pytest.raises(TimeoutError),
+    ):
+        await wait_for_batch(gemini, "batches/1", 1)
+
+    assert gemini.aio.batches.get.await_count == 4
@@ -0,0 +1,124 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from google.genai import errors
+
+from app.core.circuit_breaker import CircuitOpenError
+from app.integrations.llm import caches
+from app.integrations.llm.caches import GeminiContextCacheManager
+
+_JD = "Senior Python engineer. " * 50
+
+
+def _mock_gemini():
+    gemini = MagicMock()
+    cached = MagicMock()
+    cached.name = "cachedContents/jd"
+    gemini.aio.caches.create = AsyncMock(return_value=cached)
+    gemini.aio.caches.update = AsyncMock()
+    gemini.aio.caches.delete = AsyncMock()
+    return gemini
+
+
+@pytest.mark.asyncio
+async def test_acquire_creates_once_per_prefix():
+    gemini = _mock_gemini()
+    manager = GeminiContextCacheManager(
+        ttl_seconds=60, refresh_seconds=5, min_tokens=10
+    )
+
+    first, second = await asyncio.gather(
+        manager.acquire(gemini, "model", "instructions", _JD),
+        manager.acquire(gemini, "model", "instructions", _JD),
+    )
+
+    assert first == second == "cachedContents/jd"
+    gemini.aio.caches.create.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_short_prefixes_are_not_cached():
+    gemini = _mock_gemini()
+    manager = GeminiContextCacheManager(
+        ttl_seconds=60, refresh_seconds=5, min_tokens=10_000
+    )
+
+    assert await manager.acquire(gemini, "model", "instructions", _JD) is None
+    gemini.aio.caches.create.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_entries_near_expiry_are_extended():
+    gemini = _mock_gemini()
+    manager = GeminiContextCacheManager(
+        ttl_seconds=60, refresh_seconds=60, min_tokens=10
+    )
+
+    await manager.acquire(gemini, "model", "instructions", _JD)
+    name = await manager.acquire(gemini, "model", "instructions", _JD)
+
+    assert name == "cachedContents/jd"
+    gemini.aio.caches.create.assert_awaited_once()
+    gemini.aio.caches.update.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_rejected_prefixes_fall_back_without_retrying():
+    gemini = _mock_gemini()
+    gemini.aio.caches.create.side_effect = errors.ClientError(
+        400, {"error": {"message": "too small"}}
+    )
+    manager = GeminiContextCacheManager(
+        ttl_seconds=60, refresh_seconds=5, min_tokens=10
+    )
+
+    assert await manager.acquire(gemini, "model", "instructions", _JD) is None
+    assert await manager.acquire(gemini, "model", "instructions", _JD) is None
+    gemini.aio.caches.create.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_server_errors_are_retried_by_the_governor():
+    gemini = _mock_gemini()
+    gemini.aio.caches.create.side_effect = [
+        errors.ServerError(503, {"error": {"message": "unavailable"}}),
+        gemini.aio.caches.create.return_value,
+    ]
+    manager = GeminiContextCacheManager(
+        ttl_seconds=60, refresh_seconds=5, min_tokens=10
+    )
+
+    with patch("app.integrations.llm.limiter.asyncio.sleep"):
+        name = await manager.acquire(gemini, "model", "instructions", _JD)
+
+    assert name == "cachedContents/jd"
+    assert gemini.aio.caches.create.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_prefixes_are_retried_after_an_outage(monkeypatch):
+    gemini = _mock_gemini()
+    calls = 0
+
+    async def call(scope, request):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise CircuitOpenError(f"gemini:{scope}", 30)
+        return await request()
+
+    monkeypatch.setattr(
+        caches,
+        "get_gemini_governor",
+        lambda: MagicMock(call=AsyncMock(side_effect=call)),
+    )
+    manager = GeminiContextCacheManager(
+        ttl_seconds=60, refresh_seconds=5, min_tokens=10
+    )
+
+    assert await manager.acquire(gemini, "model", "instructions", _JD) is None
+    name = await manager.acquire(gemini, "model", "instructions", _JD)
+
+    assert name == "cachedContents/jd"
+    gemini.aio.caches.create.assert_awaited_once()
@@ -0,0 +1,96 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.integrations.llm.files import GeminiFileManager
+
+
+def _mock_gemini():
+    gemini = MagicMock()
+    uploaded = MagicMock()
+    uploaded.name = "files/resume"
+    gemini.aio.files.upload = AsyncMock(return_value=uploaded)
+    gemini.aio.files.delete = AsyncMock()
+    return gemini
+
+
+@pytest.mark.asyncio
+async def test_acquire_uploads_once_per_hash():
+    gemini = _mock_gemini()
+    manager = GeminiFileManager(ttl_seconds=60)
+
+    first, second = await asyncio.gather(
+        manager.acquire(gemini, "abc", "resume.pdf"),
+        manager.acquire(gemini, "abc", "resume.pdf"),
+    )
+
+    assert first is second
+    gemini.aio.files.upload.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_expired_handles_are_deleted_and_reuploaded():
+    gemini = _mock_gemini()
+    manager = GeminiFileManager(ttl_seconds=0)
+
+    file = await manager.acquire(gemini, "abc", "resume.pdf")
+    manager.release(file)
+    await manager.acquire(gemini, "abc", "resume.pdf")
+
+    assert gemini.aio.files.upload.await_count == 2
+    gemini.aio.files.delete.assert_awaited_once_with(name="files/resume")
+
+
+@pytest.mark.asyncio
+async def test_files_in_use_are_kept_past_their_ttl():
+    gemini = _mock_gemini()
+    manager = GeminiFileManager(ttl_seconds=0)
+
+    first = await manager.acquire(gemini, "abc", "resume.pdf")
+    # Another analysis of the same resume while the first still uses the file
+    second = await manager.acquire(gemini, "abc", "resume.pdf")
+    manager.release(first)
+    await manager.purge_expired(gemini)
+
+    assert second is first
+    gemini.aio.files.upload.assert_awaited_once()
+    gemini.aio.files.delete.assert_not_awaited()
+
+    manager.release(second)
+    await manager.purge_expired(gemini)
+    gemini.aio.files.delete.assert_awaited_once_with(name="files/resume")
+
+
+@pytest.mark.asyncio
+async def test_purge_skips_a_file_acquired_during_an_earlier_delete(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("app.integrations.llm.files.time.monotonic", lambda: clock[0])
+    gemini = MagicMock()
+    uploads = [MagicMock(), MagicMock()]
+    uploads[0].name, uploads[1].name = "files/first", "files/second"
+    gemini.aio.files.upload = AsyncMock(side_effect=uploads)
+    deleting, resume = asyncio.Event(), asyncio.Event()
+
+    async def delete(name):
+        deleting.set()
+        await resume.wait()
+
+    gemini.aio.files.delete = AsyncMock(side_effect=delete)
+    manager = GeminiFileManager(ttl_seconds=10)
+    manager.release(await manager.acquire(gemini, "first", "first.pdf"))
+    second = await manager.acquire(gemini, "second", "second.pdf")
+    manager.release(second)
+
+    clock[0] = 20.0
+    purge = asyncio.create_task(manager.purge_expired(gemini))
+    await deleting.wait()
+    # An acquire that got past its own purge takes the second file while the
+    # first is still being deleted
+    clock[0] = 5.0
+    assert await manager.acquire(gemini, "second", "second.pdf") is second
+    resume.set()
+    await purge
+
+    gemini.aio.files.delete.assert_awaited_once_with(name="files/first")
+    assert manager._locks == {}
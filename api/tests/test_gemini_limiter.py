@@ -0,0 +1,109 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from google.genai import errors
+
+from app.integrations.llm.limiter import (
+    AdaptiveConcurrencyLimiter,
+    GeminiRateGovernor,
+    retry_after_seconds,
+)
+
+
+def _quota_error(retry_delay: str | None = None, headers=None) -> errors.ClientError:
+    details = [{"@type": "type.googleapis.com/google.rpc.RetryInfo"}]
+    if retry_delay:
+        details[0]["retryDelay"] = retry_delay
+    response = MagicMock(headers=headers or {})
+    return errors.ClientError(
+        429,
+        {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED", "details": details}},
+        response,
+    )
+
+
+def _governor() -> GeminiRateGovernor:
+    bucket = MagicMock()
+    bucket.acquire = AsyncMock()
+    return GeminiRateGovernor(bucket)
+
+
+def test_retry_after_prefers_header_then_retry_info():
+    assert retry_after_seconds(_quota_error("7s", {"retry-after": "3"})) == 3.0
+    assert retry_after_seconds(_quota_error("1.5s")) == 1.5
+    assert retry_after_seconds(_quota_error()) is None
+
+
+def test_aimd_grows_additively_and_halves_on_overload():
+    limiter = AdaptiveConcurrencyLimiter(
+        initial=4, minimum=1, maximum=10, latency_tolerance=3.0, cooldown_seconds=60
+    )
+    for _ in range(4):
+        limiter.on_success(1.0)
+    assert limiter.limit == 4  # +1/limit per success: about +1 per round
+
+    for _ in range(4):
+        limiter.on_success(1.0)
+    assert limiter.limit == 5
+
+    limiter.on_overload()
+    limiter.on_overload()  # same burst: ignored within the cooldown
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_slot_caps_calls_in_flight():
+    limiter = AdaptiveConcurrencyLimiter(
+        initial=2, minimum=1, maximum=2, latency_tolerance=3.0, cooldown_seconds=0
+    )
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(call() for _ in range(6)))
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_call_retries_quota_errors_after_the_requested_delay():
+    request = AsyncMock(side_effect=[_quota_error("2s"), "ok"])
+
+    with patch("app.integrations.llm.limiter.asyncio.sleep") as sleep:
+        result = await _governor().call("model", request)
+
+    assert result == "ok"
+    assert request.await_count == 2
+    assert sleep.await_args.args[0] >= 2.0
+
+
+@pytest.mark.asyncio
+async def test_call_does_not_retry_client_errors():
+    request = AsyncMock(side_effect=errors.ClientError(400, {"error": {}}))
+
+    with pytest.raises(errors.ClientError):
+        await _governor().call("model", request)
+    request.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stream_retries_only_until_the_first_chunk():
+    async def chunks():
+        yield "a"
+        yield "b"
+
+    async def failing():
+        raise _quota_error("0s")
+        yield  # pragma: no cover
+
+    open_stream = AsyncMock(side_effect=[failing(), chunks()])
+
+    with patch("app.integrations.llm.limiter.asyncio.sleep"):
+        received = [chunk async for chunk in _governor().stream("model", open_stream)]
+
+    assert received == ["a", "b"]
+    assert open_stream.await_count == 2
@@ -40,16 +40,19 @@ async def test_analyze_jd_match_streaming(client) -> None:
         yield (
             SSEEventType.ANALYSIS_START,
             AnalysisStartEvent(analysis_id="test-123"),
+            "1-0",
         )
         yield (
             SSEEventType.STATUS_UPDATE,
             StatusUpdateEvent(status=JdMatchStatus.ANALYZING),
+            "2-0",
         )
         yield (
             SSEEventType.STATUS_UPDATE,
             StatusUpdateEvent(status=JdMatchStatus.MATCHED),
+            "3-0",
         )
-        yield (SSEEventType.ANALYSIS_STOP, AnalysisStopEvent())
+        yield (SSEEventType.ANALYSIS_STOP, AnalysisStopEvent(), "4-0")
 
     with patch(
         "app.api.v1.endpoints.jdmatch.jd_match_analyze", side_effect=mock_generator
@@ -63,9 +66,78 @@ async def test_analyze_jd_match_streaming(client) -> None:
         body = response.text
         events = [b for b in body.split("\n\n") if b.strip()]
         assert len(events) == 4
+        assert events[0].startswith("id: 1-0\n")
         mock_analyze.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_analyze_jd_match_resumes_from_last_event_id(client) -> None:
+    async def mock_generator(*args, **kwargs):
+        from app.api.v1.dto.jdmatch import AnalysisStopEvent, SSEEventType
+
+        yield (SSEEventType.ANALYSIS_STOP, AnalysisStopEvent(), "4-0")
+
+    with patch(
+        "app.api.v1.endpoints.jdmatch.jd_match_analyze", side_effect=mock_generator
+    ) as mock_analyze:
+        jd_match_id = str(uuid.uuid4())
+        response = await client.post(
+            f"/api/v1/jdmatch/{jd_match_id}/analyze",
+            headers={"Last-Event-ID": "3-0"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert mock_analyze.call_args.args[-1] == "3-0"
+
+
+@pytest.mark.asyncio
+async def test_batch_analyze_jd_match_streaming(client) -> None:
+    async def mock_generator(*args, **kwargs):
+        from app.api.v1.dto.jdmatch import (
+            AnalysisStopEvent,
+            BatchJdResult,
+            BatchSummaryEvent,
+            SSEEventType,
+        )
+        from app.modules.jdmatch.constants import JdMatchStatus
+
+        results = [
+            BatchJdResult(
+                jd_index=1,
+                jd_match_id=uuid.uuid4(),
+                status=JdMatchStatus.MATCHED,
+                score=80,
+            ),
+            BatchJdResult(
+                jd_index=0,
+                jd_match_id=uuid.uuid4(),
+                status=JdMatchStatus.MATCHED,
+                score=40,
+            ),
+        ]
+        yield (SSEEventType.BATCH_SUMMARY, BatchSummaryEvent(results=results))
+        yield (SSEEventType.ANALYSIS_STOP, AnalysisStopEvent())
+
+    with (
+        patch(
+            "app.api.v1.endpoints.jdmatch.create_jd_match_batch",
+            new_callable=AsyncMock,
+        ) as mock_create,
+        patch(
+            "app.api.v1.endpoints.jdmatch.jd_match_batch_analyze",
+            side_effect=mock_generator,
+        ),
+    ):
+        files = {"resume_file": ("resume.pdf", b"content", "application/pdf")}
+        data = {"jd_infos": ["Backend Engineer", "Data Engineer"]}
+        response = await client.post("/api/v1/jdmatch/batch", files=files, data=data)
+
+        assert response.status_code == status.HTTP_200_OK
+        events = [b for b in response.text.split("\n\n") if b.strip()]
+        assert events[0].startswith("event: batch_summary\n")
+        assert mock_create.call_args.args[1] == ["Backend Engineer", "Data Engineer"]
+
+
 @pytest.mark.asyncio
 async def test_get_jd_match_status(client):
     with patch(
@@ -0,0 +1,80 @@
+from contextlib import nullcontext
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.api.v1.dto.jdmatch import (
+    AnalysisStopEvent,
+    ErrorEvent,
+    SSEEventType,
+    StatusUpdateEvent,
+)
+from app.integrations.queue.base import Job, PermanentJobError
+from app.modules.jdmatch import jobs
+from app.modules.jdmatch.constants import ANALYZE_JOB, JdMatchStatus
+
+
+@pytest.fixture
+def analysis(monkeypatch):
+    """Stub out everything ``_handle_analyze_job`` talks to; set ``events``
+    to what the analysis stream yields."""
+    stub = MagicMock(events=[])
+
+    async def run_jd_match_analysis(*_):
+        for event in stub.events:
+            yield (SSEEventType.STATUS_UPDATE, event, "0-1")
+
+    monkeypatch.setattr(jobs, "run_jd_match_analysis", run_jd_match_analysis)
+    monkeypatch.setattr(jobs, "async_session_factory", lambda: nullcontext(None))
+    monkeypatch.setattr(jobs, "get_gemini_client", MagicMock())
+    monkeypatch.setattr(jobs, "get_browser_use_client", MagicMock())
+    stub.reset_analysis_events = AsyncMock()
+    stub.set_analysis_status = AsyncMock()
+    monkeypatch.setattr(jobs, "reset_analysis_events", stub.reset_analysis_events)
+    monkeypatch.setattr(jobs, "set_analysis_status", stub.set_analysis_status)
+    return stub
+
+
+def _job() -> Job:
+    return Job(kind=ANALYZE_JOB, key="analyze:1", payload={"jd_match_id": "1"})
+
+
+@pytest.mark.asyncio
+async def test_successful_analysis_completes_the_job(analysis):
+    analysis.events = [StatusUpdateEvent(status=JdMatchStatus.MATCHED)]
+
+    await jobs._handle_analyze_job(_job(), is_final_attempt=False)
+
+    analysis.reset_analysis_events.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_retryable_failure_requeues_with_a_fresh_event_log(analysis):
+    analysis.events = [ErrorEvent(message="Gemini timed out"), AnalysisStopEvent()]
+
+    with pytest.raises(ValueError, match="Gemini timed out"):
+        await jobs._handle_analyze_job(_job(), is_final_attempt=False)
+
+    analysis.reset_analysis_events.assert_awaited_once_with("1")
+    analysis.set_analysis_status.assert_awaited_once_with("1", JdMatchStatus.QUEUED)
+
+
+@pytest.mark.asyncio
+async def test_final_retryable_failure_keeps_the_event_log(analysis):
+    analysis.events = [ErrorEvent(message="Gemini timed out")]
+
+    with pytest.raises(ValueError, match="Gemini timed out"):
+        await jobs._handle_analyze_job(_job(), is_final_attempt=True)
+
+    analysis.reset_analysis_events.assert_not_awaited()
+    analysis.set_analysis_status.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_failure_is_permanent(analysis):
+    analysis.events = [ErrorEvent(message="Not a JD", retryable=False)]
+
+    with pytest.raises(PermanentJobError, match="Not a JD"):
+        await jobs._handle_analyze_job(_job(), is_final_attempt=False)
+
+    analysis.reset_analysis_events.assert_not_awaited()
@@ -0,0 +1,168 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from fakeredis import aioredis as fakeredis
+
+from app.core.config import settings
+from app.integrations.queue.base import Job, JobState, PermanentJobError
+from app.integrations.queue.queue import JobQueue
+from app.integrations.queue.redis_backend import RedisStreamJobBackend
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def backend(redis):
+    return RedisStreamJobBackend(redis, consumer="test-worker")
+
+
+@pytest.fixture
+def queue(backend, redis):
+    return JobQueue(backend, redis, concurrency=2)
+
+
+def _job(attempt: int = 0) -> Job:
+    return Job(kind="analyze", key="analyze:1", payload={"id": 1}, attempt=attempt)
+
+
+async def _stream_jobs(redis, stream: str) -> list[Job]:
+    entries = await redis.xrange(stream)
+    return [Job.model_validate_json(fields["job"]) for _, fields in entries]
+
+
+@pytest.mark.asyncio
+async def test_enqueue_publishes_one_live_job_per_key(queue, redis):
+    assert await queue.enqueue(_job())
+    assert not await queue.enqueue(_job())
+
+    assert await _stream_jobs(redis, RedisStreamJobBackend.stream) == [_job()]
+    assert await queue.get_state("analyze:1") == JobState.QUEUED
+
+
+@pytest.mark.asyncio
+async def test_enqueue_frees_the_key_when_publishing_fails(redis):
+    backend = AsyncMock()
+    backend.publish.side_effect = ConnectionError("down")
+    queue = JobQueue(backend, redis, concurrency=1)
+
+    with pytest.raises(ConnectionError):
+        await queue.enqueue(_job())
+
+    assert await queue.get_state("analyze:1") is None
+
+
+@pytest.mark.asyncio
+async def test_process_marks_the_job_done_and_skips_redelivery(queue, redis):
+    handler = AsyncMock()
+
+    await queue.process(_job(), handler, is_final_attempt=False)
+    await queue.process(_job(), handler, is_final_attempt=False)
+
+    handler.assert_awaited_once_with(_job())
+    assert await queue.get_state("analyze:1") == JobState.DONE
+    assert not await redis.exists("jobs:lease:analyze:1")
+
+
+@pytest.mark.asyncio
+async def test_process_skips_a_job_leased_by_another_worker(queue, redis):
+    await redis.set("jobs:lease:analyze:1", "1")
+    handler = AsyncMock()
+
+    await queue.process(_job(), handler, is_final_attempt=False)
+
+    handler.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_failed_attempt_is_requeued_and_raised(queue):
+    handler = AsyncMock(side_effect=ValueError("flaky"))
+
+    with pytest.raises(ValueError, match="flaky"):
+        await queue.process(_job(), handler, is_final_attempt=False)
+
+    assert await queue.get_state("analyze:1") == JobState.QUEUED
+
+
+@pytest.mark.asyncio
+async def test_final_failure_frees_the_key(queue):
+    handler = AsyncMock(side_effect=ValueError("flaky"))
+
+    with pytest.raises(ValueError, match="flaky"):
+        await queue.process(_job(), handler, is_final_attempt=True)
+
+    assert await queue.get_state("analyze:1") is None
+
+
+@pytest.mark.asyncio
+async def test_permanent_failure_frees_the_key_without_retrying(queue):
+    handler = AsyncMock(side_effect=PermanentJobError("not a JD"))
+
+    await queue.process(_job(), handler, is_final_attempt=False)
+
+    assert await queue.get_state("analyze:1") is None
+
+
+@pytest.mark.asyncio
+async def test_worker_parks_a_failed_job_for_retry(backend, redis):
+    await backend._ensure_group()
+    await backend.publish(_job())
+    ((message_id, fields),) = await backend._next_messages(1)
+
+    await backend._handle(message_id, fields, AsyncMock(side_effect=ValueError()))
+
+    delayed = await redis.zrange(RedisStreamJobBackend.delayed, 0, -1)
+    assert [Job.model_validate_json(raw) for raw in delayed] == [_job(attempt=1)]
+    pending = await redis.xpending(
+        RedisStreamJobBackend.stream, RedisStreamJobBackend.group
+    )
+    assert pending["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_worker_dead_letters_an_exhausted_job(backend, redis):
+    await backend._ensure_group()
+    await backend.publish(_job(attempt=settings.JOB_MAX_RETRIES))
+    ((message_id, fields),) = await backend._next_messages(1)
+    process = AsyncMock(side_effect=ValueError())
+
+    await backend._handle(message_id, fields, process)
+
+    process.assert_awaited_once_with(_job(attempt=settings.JOB_MAX_RETRIES), True)
+    assert await _stream_jobs(redis, RedisStreamJobBackend.dead) == [
+        _job(attempt=settings.JOB_MAX_RETRIES)
+    ]
+    assert not await redis.zcard(RedisStreamJobBackend.delayed)
+
+
+@pytest.mark.asyncio
+async def test_due_retries_go_back_on_the_stream(backend, redis):
+    retry = _job(attempt=1).model_dump_json()
+    later = _job(attempt=2).model_dump_json()
+    await redis.zadd(
+        RedisStreamJobBackend.delayed, {retry: time.time() - 1, later: time.time() + 60}
+    )
+
+    await backend._promote_due_retries()
+
+    assert await _stream_jobs(redis, RedisStreamJobBackend.stream) == [_job(attempt=1)]
+    assert await redis.zrange(RedisStreamJobBackend.delayed, 0, -1) == [later]
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_published_jobs(backend):
+    processed = asyncio.Event()
+    process = AsyncMock(side_effect=lambda job, is_final: processed.set())
+    await backend.publish(_job())
+
+    worker = asyncio.create_task(backend.run_worker(process, concurrency=1))
+    try:
+        await asyncio.wait_for(processed.wait(), timeout=5)
+    finally:
+        worker.cancel()
+
+    process.assert_awaited_once_with(_job(), False)
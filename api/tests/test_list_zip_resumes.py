@@ -0,0 +1,33 @@
+import zipfile
+
+import pytest
+from fastapi import HTTPException
+
+from app.modules.jdmatch.utils.list_zip_resumes import list_zip_resumes
+
+
+def test_lists_resume_files_only(tmp_path):
+    zip_path = tmp_path / "resumes.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("alice.pdf", b"%PDF-1.7")
+        archive.writestr("team/bob.DOCX", b"PK\x03\x04")
+        archive.writestr("team/carol.doc", b"\xd0\xcf\x11\xe0")
+        archive.writestr("team/notes.txt", b"not a resume")
+        archive.writestr("__MACOSX/team/._bob.DOCX", b"resource fork")
+        archive.writestr(".hidden/dave.pdf", b"%PDF-1.7")
+        archive.mkdir("empty")
+
+    assert list_zip_resumes(str(zip_path)) == [
+        "alice.pdf",
+        "team/bob.DOCX",
+        "team/carol.doc",
+    ]
+
+
+def test_rejects_non_zip(tmp_path):
+    path = tmp_path / "resumes.zip"
+    path.write_bytes(b"%PDF-1.7")
+
+    with pytest.raises(HTTPException) as exc_info:
+        list_zip_resumes(str(path))
+    assert exc_info.value.status_code == 400
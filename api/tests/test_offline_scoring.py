@@ -0,0 +1,242 @@
+import uuid
+from contextlib import nullcontext
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from google.genai import types
+
+from app.core.config import settings
+from app.integrations.db.models import JDMatchDtl
+from app.modules.jdmatch import offline_scoring
+from app.modules.jdmatch.constants import JdMatchStatus
+from app.modules.jdmatch.offline_scoring import (
+    OfflineBatch,
+    _save_batch_response,
+    collect_offline_scoring,
+    score_offline,
+    submit_offline_scoring,
+)
+from app.modules.jdmatch.schemas import (
+    AgentResponseStructuredScore,
+    CachedJdMatchResult,
+    SpooledResume,
+)
+
+_SCORE = AgentResponseStructuredScore(
+    score=72, matching_skills=["python"], missing_skills=["go"]
+)
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    """Stub the database, Redis, downloads and Gemini calls around offline
+    scoring; ``statuses`` maps each record id to the last status it was set to
+    and ``saved`` to the score data saved for it."""
+    stub = MagicMock(statuses={}, saved={})
+
+    async def update_jd_match_statuses(_session, jd_match_ids, status):
+        stub.statuses.update(dict.fromkeys(jd_match_ids, JdMatchStatus(status)))
+        return len(jd_match_ids)
+
+    async def save_jd_match_info(_session, *, jd_match_id, jd, score_data):
+        stub.saved[jd_match_id] = score_data
+
+    async def download_resume(url):
+        return SpooledResume(
+            path="/tmp/resume.pdf",  # noqa: S108
+            filename="resume.pdf",
+            content_hash=url,
+            size=1,
+        ), None
+
+    stub.resolve_jd = AsyncMock(side_effect=lambda jd_info, *_: f"resolved {jd_info}")
+    stub.get_cached_result = AsyncMock(return_value=None)
+    stub.create_batch = AsyncMock(
+        side_effect=lambda *_, **__: types.BatchJob(name=f"batches/{uuid.uuid4()}")
+    )
+    stub.get_jd_match_by_jd_match_id = AsyncMock(
+        return_value=MagicMock(jd="resolved JD")
+    )
+    for name, value in {
+        "async_session_factory": lambda: nullcontext(None),
+        "update_jd_match_statuses": update_jd_match_statuses,
+        "save_jd_match_info": save_jd_match_info,
+        "update_jd_info": AsyncMock(),
+        "update_jd_match_status": AsyncMock(),
+        "set_analysis_status": AsyncMock(),
+        "download_resume": download_resume,
+        "cleanup_file": MagicMock(),
+        "acquire_resume_input": AsyncMock(return_value=MagicMock()),
+        "build_structured_score_request": MagicMock(
+            side_effect=lambda jd, resume, metadata: types.InlinedRequest(
+                metadata=metadata
+            )
+        ),
+        "resolve_jd": stub.resolve_jd,
+        "get_cached_result": stub.get_cached_result,
+        "create_batch": stub.create_batch,
+        "get_jd_match_by_jd_match_id": stub.get_jd_match_by_jd_match_id,
+    }.items():
+        monkeypatch.setattr(offline_scoring, name, value)
+    return stub
+
+
+def _jd_match(resume_url: str | None = "https://example.com/a.pdf") -> JDMatchDtl:
+    return JDMatchDtl(file_id="file", file_name="a.pdf", resume_url=resume_url, jd="JD")
+
+
+def _response(
+    jd_match_id: str, text: str | None = None, **kwargs
+) -> types.InlinedResponse:
+    return types.InlinedResponse(
+        metadata={"jd_match_id": jd_match_id},
+        response=types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(
+                    content=types.Content(
+                        parts=[types.Part(text=text or _SCORE.model_dump_json())]
+                    )
+                )
+            ]
+        ),
+        **kwargs,
+    )
+
+
+def _finished_batch(*responses: types.InlinedResponse):
+    """A ``wait_for_batch`` whose batch starts running and then succeeds."""
+
+    async def wait_for_batch(_gemini, name, _interval, on_update):
+        await on_update(
+            types.BatchJob(name=name, state=types.JobState.JOB_STATE_RUNNING)
+        )
+        return types.BatchJob(
+            name=name,
+            state=types.JobState.JOB_STATE_SUCCEEDED,
+            dest=types.BatchJobDestination(inlined_responses=list(responses)),
+        )
+
+    return wait_for_batch
+
+
+@pytest.mark.asyncio
+async def test_submit_packs_prepared_records_into_batches(offline, monkeypatch):
+    monkeypatch.setattr(settings, "OFFLINE_BATCH_MAX_REQUESTS", 2)
+    ready = [_jd_match() for _ in range(3)]
+    no_resume = _jd_match(resume_url=None)
+
+    batches = await submit_offline_scoring([*ready, no_resume], MagicMock())
+
+    offline.resolve_jd.assert_awaited_once()
+    assert [len(batch.jd_match_ids) for batch in batches] == [2, 1]
+    submitted = [jd_match_id for batch in batches for jd_match_id in batch.jd_match_ids]
+    assert sorted(submitted) == sorted(str(jd_match.id) for jd_match in ready)
+    assert offline.statuses == {str(no_resume.id): JdMatchStatus.FAILED}
+
+
+@pytest.mark.asyncio
+async def test_submit_saves_cached_results_without_a_batch(offline):
+    offline.get_cached_result.return_value = CachedJdMatchResult(
+        jd="resolved JD", structured_score=_SCORE, explanation="Good fit"
+    )
+    jd_match = _jd_match()
+
+    batches = await submit_offline_scoring([jd_match], MagicMock())
+
+    assert batches == []
+    offline.create_batch.assert_not_awaited()
+    assert offline.saved[str(jd_match.id)]["explanation"] == "Good fit"
+
+
+@pytest.mark.asyncio
+async def test_submit_fails_records_with_an_invalid_jd(offline):
+    offline.resolve_jd.side_effect = ValueError("Not a JD")
+    jd_match = _jd_match()
+
+    assert await submit_offline_scoring([jd_match], MagicMock()) == []
+    assert offline.statuses == {str(jd_match.id): JdMatchStatus.FAILED}
+
+
+@pytest.mark.asyncio
+async def test_collect_saves_each_response(offline, monkeypatch):
+    monkeypatch.setattr(
+        offline_scoring,
+        "wait_for_batch",
+        _finished_batch(
+            _response("1"),
+            _response("2", error=types.JobError(message="quota")),
+            types.InlinedResponse(),
+        ),
+    )
+
+    await collect_offline_scoring("batches/1", MagicMock(), ["1", "2"])
+
+    assert offline.saved["1"]["score"] == _SCORE.score
+    assert offline.statuses == {
+        "1": JdMatchStatus.PROCESSING,
+        "2": JdMatchStatus.FAILED,
+    }
+
+
+@pytest.mark.asyncio
+async def test_collect_fails_every_record_of_a_batch_without_responses(
+    offline, monkeypatch
+):
+    monkeypatch.setattr(offline_scoring, "wait_for_batch", _finished_batch())
+
+    await collect_offline_scoring("batches/1", MagicMock(), ["1", "2"])
+
+    assert offline.statuses == {
+        "1": JdMatchStatus.FAILED,
+        "2": JdMatchStatus.FAILED,
+    }
+
+
+@pytest.mark.asyncio
+async def test_save_batch_response_keeps_only_the_prescreen_score(offline):
+    status = await _save_batch_response("1", _response("1"))
+
+    assert status == JdMatchStatus.MATCHED
+    assert offline.saved["1"] == {
+        "score": _SCORE.score,
+        "matching_skills": _SCORE.matching_skills,
+        "missing_skills": _SCORE.missing_skills,
+        "explanation": None,
+        "model": settings.SCORE_PRESCREEN_MODEL,
+    }
+
+
+@pytest.mark.asyncio
+async def test_save_batch_response_fails_an_unparseable_response(offline):
+    status = await _save_batch_response("1", _response("1", text="not json"))
+
+    assert status == JdMatchStatus.FAILED
+    assert offline.saved == {}
+    assert offline.statuses == {"1": JdMatchStatus.FAILED}
+
+
+@pytest.mark.asyncio
+async def test_a_failing_batch_does_not_stop_the_others(offline, monkeypatch):
+    monkeypatch.setattr(
+        offline_scoring,
+        "submit_offline_scoring",
+        AsyncMock(
+            return_value=[
+                OfflineBatch(name="batches/broken", jd_match_ids=["1"]),
+                OfflineBatch(name="batches/ok", jd_match_ids=["2"]),
+            ]
+        ),
+    )
+    finished = _finished_batch(_response("2"))
+
+    async def wait_for_batch(gemini, name, interval, on_update):
+        if name == "batches/broken":
+            raise TimeoutError
+        return await finished(gemini, name, interval, on_update)
+
+    monkeypatch.setattr(offline_scoring, "wait_for_batch", wait_for_batch)
+
+    await score_offline([], MagicMock())
+
+    assert offline.statuses["1"] == JdMatchStatus.FAILED
+    assert offline.saved["2"]["score"] == _SCORE.score
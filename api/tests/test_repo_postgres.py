@@ -0,0 +1,146 @@
+"""Repo writes against a real Postgres through the asyncpg driver, which is
+stricter than sqlite (e.g. about timezone-aware values in naive columns).
+
+Skipped unless ``TEST_POSTGRES_URI`` points at a disposable database, e.g.
+``postgresql://postgres@localhost/jdmatch_test``; its tables are recreated.
+"""
+
+import os
+import uuid
+
+import pytest
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.integrations.db.models import JDMatchDtl
+from app.modules.jdmatch.constants import JdMatchStatus
+from app.modules.jdmatch.repo import (
+    create_jd_match_record,
+    create_ranking_job_record,
+    create_resume_record,
+    get_jd_match_by_jd_match_id,
+    get_pending_ranking_items,
+    get_ranking_job,
+    record_ranking_progress,
+    save_jd_match_info,
+    update_jd_match_status,
+    update_jd_match_statuses,
+    update_ranking_job,
+)
+from app.modules.jdmatch.schemas import RankingSource
+
+POSTGRES_URI = os.environ.get("TEST_POSTGRES_URI")
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URI, reason="TEST_POSTGRES_URI is not set")
+
+
+@pytest.fixture
+async def session():
+    url = make_url(POSTGRES_URI or "").set(drivername="postgresql+asyncpg")
+    engine = create_async_engine(url)
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.drop_all)
+        await connection.run_sync(SQLModel.metadata.create_all)
+    async with async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False
+    )() as session:
+        yield session
+    await engine.dispose()
+
+
+async def _jd_match(session: AsyncSession) -> JDMatchDtl:
+    return await create_jd_match_record(
+        session, "file", "resume.pdf", "https://example.com/resume.pdf", "JD"
+    )
+
+
+async def test_status_updates(session):
+    first, second = await _jd_match(session), await _jd_match(session)
+    before = first.updated_at
+
+    await update_jd_match_status(
+        session, str(first.id), JdMatchStatus.PROCESSING.value, returning=False
+    )
+    count = await update_jd_match_statuses(
+        session, [str(first.id), str(second.id)], JdMatchStatus.QUEUED.value
+    )
+
+    assert count == 2
+    stored = await get_jd_match_by_jd_match_id(session, str(first.id))
+    assert stored
+    await session.refresh(stored)
+    assert stored.status == JdMatchStatus.QUEUED.value
+    assert stored.updated_at != before
+
+
+async def test_save_jd_match_info(session):
+    jd_match = await _jd_match(session)
+
+    await save_jd_match_info(
+        session,
+        jd_match_id=str(jd_match.id),
+        jd="JD",
+        score_data={
+            "score": 72,
+            "matching_skills": ["python"],
+            "missing_skills": ["go"],
+            "explanation": "Good fit",
+            "model": "gemini",
+        },
+    )
+
+    await session.refresh(jd_match)
+    assert jd_match.status == JdMatchStatus.MATCHED.value
+    assert jd_match.score == 72
+
+
+async def test_updating_a_missing_record_fails(session):
+    with pytest.raises(ValueError, match="No record found"):
+        await save_jd_match_info(
+            session,
+            jd_match_id=str(uuid.uuid4()),
+            jd="JD",
+            score_data={
+                "score": 1,
+                "matching_skills": [],
+                "missing_skills": [],
+                "explanation": None,
+                "model": None,
+            },
+        )
+
+
+async def test_create_resume_record_keeps_the_first_copy(session):
+    first = await create_resume_record(
+        session, "sha", "resume.pdf", "uploads/sha.pdf", "uploads/sha.pdf"
+    )
+    again = await create_resume_record(
+        session, "sha", "other.pdf", "uploads/other.pdf", "uploads/other.pdf"
+    )
+
+    assert again.file_name == first.file_name == "resume.pdf"
+
+
+async def test_ranking_job_updates(session):
+    ranking_job_id = uuid.uuid4()
+    await create_ranking_job_record(
+        session,
+        ranking_job_id,
+        "JD",
+        [RankingSource(file_id="a"), RankingSource(file_id="b")],
+    )
+
+    await update_ranking_job(
+        session, str(ranking_job_id), {"status": JdMatchStatus.PROCESSING.value}
+    )
+    await record_ranking_progress(session, str(ranking_job_id), failed=False)
+    await record_ranking_progress(session, str(ranking_job_id), failed=True)
+
+    ranking_job = await get_ranking_job(session, str(ranking_job_id))
+    assert ranking_job
+    await session.refresh(ranking_job)
+    assert ranking_job.status == JdMatchStatus.PROCESSING.value
+    assert (ranking_job.total, ranking_job.completed, ranking_job.failed) == (2, 1, 1)
+    assert len(await get_pending_ranking_items(session, str(ranking_job_id))) == 2
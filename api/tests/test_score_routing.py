@@ -0,0 +1,57 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.modules.jdmatch.agents import generate_candidate_score
+from app.modules.jdmatch.agents.generate_candidate_score import (
+    agent_route_structured_score,
+)
+from app.modules.jdmatch.schemas import AgentResponseStructuredScore
+
+
+def _score(score: int) -> AgentResponseStructuredScore:
+    return AgentResponseStructuredScore(
+        score=score, matching_skills=["python"], missing_skills=[]
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prescreen_score", [12, 39, 81, 95])
+async def test_clear_scores_keep_the_prescreen_result(prescreen_score):
+    generate = AsyncMock(return_value=_score(prescreen_score))
+    with patch.object(
+        generate_candidate_score, "agent_generate_structured_score", generate
+    ):
+        routed = await agent_route_structured_score("JD", "resume", MagicMock())
+
+    assert routed.structured_score.score == prescreen_score
+    assert routed.model == settings.SCORE_PRESCREEN_MODEL
+    generate.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("prescreen_score", [40, 65, 80])
+async def test_borderline_scores_escalate(prescreen_score):
+    generate = AsyncMock(side_effect=[_score(prescreen_score), _score(72)])
+    with patch.object(
+        generate_candidate_score, "agent_generate_structured_score", generate
+    ):
+        routed = await agent_route_structured_score("JD", "resume", MagicMock())
+
+    assert routed.structured_score.score == 72
+    assert routed.model == settings.SCORE_ESCALATION_MODEL
+    assert generate.await_args_list[1].args[3] == settings.SCORE_ESCALATION_MODEL
+
+
+@pytest.mark.asyncio
+async def test_escalation_can_be_turned_off(monkeypatch):
+    monkeypatch.setattr(settings, "SCORE_ESCALATION_ENABLED", False)
+    generate = AsyncMock(return_value=_score(60))
+    with patch.object(
+        generate_candidate_score, "agent_generate_structured_score", generate
+    ):
+        routed = await agent_route_structured_score("JD", "resume", MagicMock())
+
+    assert routed.model == settings.SCORE_PRESCREEN_MODEL
+    generate.assert_awaited_once()
@@ -0,0 +1,40 @@
+import hashlib
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+from app.modules.jdmatch.utils.spool_resume import spool_resume
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+@pytest.mark.asyncio
+async def test_spools_hashes_and_names_by_magic_bytes():
+    resume = await spool_resume(_chunks(b"%PD", b"F-1.7", b" body"), "resume")
+
+    try:
+        assert resume.filename == "resume.pdf"
+        assert resume.size == 13
+        assert resume.content_hash == hashlib.sha256(b"%PDF-1.7 body").hexdigest()
+        assert Path(resume.path).read_bytes() == b"%PDF-1.7 body"
+    finally:
+        Path(resume.path).unlink()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("parts", "status_code"),
+    [
+        ((b"<!doctype html>",), 400),
+        ((b"%PDF-", b"x" * (10 * 1024 * 1024)), 413),
+    ],
+)
+async def test_rejects_unsupported_and_oversized_files(parts, status_code):
+    with pytest.raises(HTTPException) as exc_info:
+        await spool_resume(_chunks(*parts), "resume.pdf")
+
+    assert exc_info.value.status_code == status_code
@@ -0,0 +1,77 @@
+import json
+import random
+
+import pytest
+
+from app.core.streaming_json import (
+    JsonFieldEvent,
+    JsonItemEvent,
+    JsonTextEvent,
+    StreamingJsonParser,
+)
+
+_DOC = {
+    "score": 72,
+    "matching_skills": ['py "thon"', "explanation", "C:\\tools"],
+    "missing_skills": [],
+    "meta": {"nested": [1, {"a": None}], "ok": True},
+    "explanation": 'Strong fit 😀, "quoted"\nsecond line é',
+}
+
+
+def _feed_in_chunks(parser: StreamingJsonParser, text: str, seed: int) -> list:
+    rng = random.Random(seed)  # noqa: S311
+    events, i = [], 0
+    while i < len(text):
+        size = rng.randint(1, 6)
+        events += parser.feed(text[i : i + size])
+        i += size
+    return events
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_any_chunking_yields_the_same_fields(seed, ensure_ascii):
+    text = json.dumps(_DOC, indent=seed % 3 or None, ensure_ascii=ensure_ascii)
+    parser = StreamingJsonParser(text_fields={"explanation"})
+
+    events = _feed_in_chunks(parser, text, seed)
+
+    assert parser.close() == _DOC
+    fields = [e for e in events if isinstance(e, JsonFieldEvent)]
+    assert [e.key for e in fields] == list(_DOC)
+    text_events = [e for e in events if isinstance(e, JsonTextEvent)]
+    assert "".join(e.text for e in text_events) == _DOC["explanation"]
+
+
+def test_fields_and_items_are_emitted_as_soon_as_they_close():
+    parser = StreamingJsonParser()
+
+    assert parser.feed('{"score": 7') == []
+    assert parser.feed('2, "matching_skills": ["sql", "g') == [
+        JsonFieldEvent("score", 72),
+        JsonItemEvent("matching_skills", 0, "sql"),
+    ]
+    assert parser.feed('o"') == [JsonItemEvent("matching_skills", 1, "go")]
+    assert parser.feed("]}") == [JsonFieldEvent("matching_skills", ["sql", "go"])]
+    assert parser.done
+
+
+def test_text_fields_stream_before_the_string_closes():
+    parser = StreamingJsonParser(text_fields={"explanation"})
+
+    assert parser.feed('{"explanation": "Good \\') == [
+        JsonTextEvent("explanation", "Good ")
+    ]
+    assert parser.feed('"fit\\"') == [JsonTextEvent("explanation", '"fit"')]
+    assert parser.feed('"}') == [JsonFieldEvent("explanation", 'Good "fit"')]
+
+
+def test_truncated_or_invalid_streams_raise():
+    parser = StreamingJsonParser()
+    parser.feed('{"score": 72, "matching_skills": ["sql"')
+    with pytest.raises(ValueError, match="ended before"):
+        parser.close()
+
+    with pytest.raises(ValueError, match="Unexpected"):
+        StreamingJsonParser().feed('{"score" 72}')